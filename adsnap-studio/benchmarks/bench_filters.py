@@ -0,0 +1,46 @@
+"""
+Per-megapixel cost of every image filter.
+
+    python -m benchmarks.bench_filters --megapixels 1 12 --repeat 3 --chain sepia contrast vignette
+"""
+from typing import List, Optional
+import argparse
+import math
+import time
+from PIL import Image
+from utils.image_filters import apply_filters, available_filters
+
+def make_image(megapixels: float, mode: str = "RGB") -> Image.Image:
+    """Build a deterministic noise image of roughly the given size."""
+    side = int(math.sqrt(megapixels * 1_000_000))
+    return Image.effect_noise((side, side), 64).convert(mode)
+
+def bench_filters(img: Image.Image, filters: List[str], repeat: int = 3) -> float:
+    """Return the best wall time in seconds over `repeat` runs of a filter chain."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        apply_filters(img, filters)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the image filters.")
+    parser.add_argument("--megapixels", type=float, nargs="+", default=[1, 12])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--chain", nargs="+", default=["sepia", "contrast", "vignette"],
+                        help="Filter chain benchmarked as a whole after the single filters")
+    args = parser.parse_args(argv)
+
+    cases = [[name] for name in available_filters()] + [args.chain]
+    print(f"{'filter':<28}{'MP':>6}{'total ms':>12}{'ms / MP':>10}")
+    for megapixels in args.megapixels:
+        img = make_image(megapixels)
+        actual_mp = img.width * img.height / 1_000_000
+        for filters in cases:
+            seconds = bench_filters(img, filters, args.repeat)
+            label = " -> ".join(filters)
+            print(f"{label:<28}{actual_mp:>6.1f}{seconds * 1000:>12.1f}{seconds * 1000 / actual_mp:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmarks of the CPU-bound local image paths, at 1, 12 and 48 MP by default.
+
+    python -m benchmarks.bench_image_paths --save baseline.json
+    python -m benchmarks.bench_image_paths --compare baseline.json --tolerance 0.25
+
+Covers every image filter, the canvas preparation and canvas-to-mask
+conversion of the Generative Fill and Erase tabs, upload preprocessing and
+the base64 JSON body the services send. With --compare the run exits with
+status 1 when a case got slower than the baseline by more than the tolerance.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import argparse
+import io
+import json
+import math
+import sys
+import time
+import numpy as np
+from PIL import Image
+from components.canvas_background import load_canvas_background
+from services.json_body import JSONBodyStream
+from services.preprocess import clear_cache, prepare_upload
+from utils.canvas import canvas_to_mask, fit_to_canvas
+from utils.image_filters import apply_filter, available_filters
+
+Case = Tuple[str, Callable[[], Any]]
+
+def make_photo(megapixels: float) -> Image.Image:
+    """Build a deterministic image of roughly the given size that compresses like a photo."""
+    side = int(math.sqrt(megapixels * 1_000_000))
+    gradient = Image.linear_gradient("L").resize((side, side))
+    noise = Image.effect_noise((side, side), 24)
+    return Image.merge("RGB", (gradient, noise, gradient.transpose(Image.Transpose.ROTATE_90)))
+
+def _encode(img: Image.Image, format: str, **params) -> bytes:
+    buffer = io.BytesIO()
+    img.save(buffer, format=format, **params)
+    return buffer.getvalue()
+
+def _strokes(width: int, height: int) -> np.ndarray:
+    """RGBA canvas data with a white brush stroke across the middle."""
+    data = np.zeros((height, width, 4), dtype=np.uint8)
+    data[height // 3:height * 2 // 3, width // 4:width * 3 // 4] = 255
+    return data
+
+def build_cases(img: Image.Image) -> List[Case]:
+    """Return the benchmark cases for one source image."""
+    upload = _encode(img, "JPEG", quality=90)
+    canvas_img = fit_to_canvas(Image.open(io.BytesIO(upload)))
+    strokes = _strokes(*canvas_img.size)
+    # Warm the cache; the timed case is a rerun after a brush stroke
+    load_canvas_background(upload)
+
+    def prepare() -> bytes:
+        clear_cache()
+        return prepare_upload(upload, "packshot")
+
+    cases: List[Case] = [(f"filter {name}", lambda name=name: apply_filter(img, name)) for name in available_filters()]
+    cases += [
+        ("canvas fit", lambda: fit_to_canvas(Image.open(io.BytesIO(upload)))),
+        ("canvas fit cached", lambda: load_canvas_background(upload)),
+        ("canvas to mask", lambda: canvas_to_mask(strokes)),
+        ("prepare upload", prepare),
+        ("base64 body", lambda: sum(len(chunk) for chunk in JSONBodyStream({"file": upload})))
+    ]
+    return cases
+
+def best_time(fn: Callable[[], Any], repeat: int) -> float:
+    """Return the best wall time in seconds over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """Return a line for every case slower than its baseline by more than `tolerance`."""
+    regressions = []
+    for case, timings in results.items():
+        for megapixels, ms in timings.items():
+            before = baseline.get(case, {}).get(megapixels)
+            if before and ms > before * (1 + tolerance):
+                regressions.append(f"{case} @ {megapixels} MP: {before:.1f} ms -> {ms:.1f} ms (+{(ms / before - 1) * 100:.0f}%)")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the local image paths.")
+    parser.add_argument("--megapixels", type=float, nargs="+", default=[1, 12, 48])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="Run cases whose name contains one of these words")
+    parser.add_argument("--save", help="Write the timings to a JSON file")
+    parser.add_argument("--compare", help="JSON file of a previous run to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown against --compare")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'case':<24}{'MP':>6}{'total ms':>12}{'ms / MP':>10}")
+    for megapixels in args.megapixels:
+        img = make_photo(megapixels)
+        actual_mp = img.width * img.height / 1_000_000
+        for name, fn in build_cases(img):
+            if args.only and not any(word in name for word in args.only):
+                continue
+            ms = best_time(fn, args.repeat) * 1000
+            results.setdefault(name, {})[f"{megapixels:g}"] = round(ms, 3)
+            print(f"{name:<24}{actual_mp:>6.1f}{ms:>12.1f}{ms / actual_mp:>10.2f}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
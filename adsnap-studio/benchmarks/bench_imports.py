@@ -0,0 +1,132 @@
+"""
+Import cost of the app's modules and the time of a Streamlit rerun.
+
+    python -m benchmarks.bench_imports
+    python -m benchmarks.bench_imports --modules components.fill_tab --detail 15
+
+Every module is imported in a fresh interpreter with -X importtime, so the
+numbers are what a cold container pays for it, including its dependencies.
+The rerun section drives app.py with Streamlit's AppTest: the first run
+includes the imports of the script, later runs are the per-interaction
+overhead.
+"""
+from typing import Dict, List, Optional, Tuple
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# What the app loads on its first run, then what the tabs load on demand
+DEFAULT_MODULES = [
+    "streamlit",
+    "components.session",
+    "workflows.jobs",
+    "services.metrics",
+    "components.generate_tab",
+    "components.product_tab",
+    "components.fill_tab",
+    "components.erase_tab",
+    "services.blob_store",
+    "services.poller",
+    "services",
+    "services.packshot",
+    "services.async_client",
+    "utils.canvas",
+    "utils.image_filters",
+    "numpy",
+    "PIL.Image",
+    "requests",
+    "httpx",
+    "streamlit_drawable_canvas"
+]
+
+def _import_times(statement: str, after: str) -> Tuple[float, List[Tuple[float, str]]]:
+    """
+    Run `statement` in a fresh interpreter with -X importtime.
+
+    Imports are logged as they complete, so the ones made by the statement's
+    last line are the top-level entries logged after the module `after`.
+
+    Returns:
+        Total import time in ms of those imports and (ms, name) of every import
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True, cwd=os.getcwd()
+    )
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    total = 0.0
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        ms = int(cumulative) / 1000
+        entries.append((ms, name.rstrip()))
+        if not name[1:].startswith(" "):
+            total = 0.0 if name.strip() == after else total + ms
+    return total, entries
+
+def import_cost(module: str, repeat: int = 3, preload: str = "") -> Tuple[float, List[Tuple[float, str]]]:
+    """
+    Best cold import time of a module in ms.
+
+    Imports done at interpreter startup, and by importing the `preload`
+    module first when given, are not counted.
+    """
+    best = None
+    for _ in range(repeat):
+        statement = f"import {preload}\nimport {module}" if preload else f"import {module}"
+        total, entries = _import_times(statement, after=preload or "site")
+        if best is None or total < best[0]:
+            best = (total, entries)
+    return best
+
+def rerun_times(script: str, reruns: int = 10) -> Dict[str, float]:
+    """Time the first run and later reruns of a Streamlit script in ms."""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.abspath(script), default_timeout=60)
+    start = time.perf_counter()
+    app.run()
+    first = (time.perf_counter() - start) * 1000
+    samples = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        app.run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"first": first, "median": statistics.median(samples), "max": max(samples)}
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure import and rerun times of the app.")
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per module; the best is kept")
+    parser.add_argument("--detail", type=int, default=0, help="Show the N slowest nested imports of each module")
+    parser.add_argument("--script", default="app.py", help="Streamlit script timed for reruns")
+    parser.add_argument("--reruns", type=int, default=10, help="Reruns to time, 0 to skip")
+    args = parser.parse_args(argv)
+
+    print(f"{'module':<32}{'cold import ms':>16}{'after streamlit':>17}")
+    for module in args.modules:
+        try:
+            ms, entries = import_cost(module, args.repeat)
+            extra, _ = import_cost(module, args.repeat, preload="streamlit")
+        except RuntimeError as e:
+            print(f"{module:<32}{'failed':>16}  {e}")
+            continue
+        print(f"{module:<32}{ms:>16.1f}{extra:>17.1f}")
+        for nested_ms, name in sorted(entries, reverse=True)[:args.detail]:
+            print(f"    {nested_ms:>10.1f}  {name.strip()}")
+
+    if args.reruns:
+        # Keep job workers out of the timed process
+        os.environ.setdefault("BRIA_JOB_WORKERS", "0")
+        times = rerun_times(args.script, args.reruns)
+        print(f"\n{args.script}: first run {times['first']:.1f} ms, "
+              f"rerun median {times['median']:.1f} ms, max {times['max']:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Load test of generate_ad_set and the services against the mock Bria API.
+
+    python -m benchmarks.load_test --scenario ad_set packshot --concurrency 1 8 32 --requests 64 --time-scale 0.05
+
+Starts benchmarks.mock_bria in a separate process unless --url points at a
+running one, so the server never competes with the clients for the GIL. The
+result cache and single-flight are turned off because every request sends
+the same image; pass --cache to measure them instead.
+"""
+from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import io
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from PIL import Image
+
+SCENARIOS = ("ad_set", "packshot", "shadow", "lifestyle", "lifestyle_ab", "fill", "erase", "hd", "enhance")
+# Scenes of one lifestyle_ab request, sent concurrently for the same product
+AB_SCENES = ("on a marble kitchen counter", "on a beach at sunset", "on a wooden desk", "in a snowy forest")
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    ordered = sorted(values)
+    if not ordered:
+        return float("nan")
+    return ordered[min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))]
+
+def make_inputs(megapixels: float) -> Dict[str, bytes]:
+    """Build a product image and a mask of roughly the given size."""
+    side = int((megapixels * 1_000_000) ** 0.5)
+    image = Image.effect_noise((side, side), 64).convert("RGB")
+    mask = Image.new("L", (side, side), 0)
+    mask.paste(255, (side // 4, side // 4, side * 3 // 4, side * 3 // 4))
+    buffers = {}
+    for name, img in (("image", image), ("mask", mask)):
+        buffer = io.BytesIO()
+        img.save(buffer, format="PNG")
+        buffers[name] = buffer.getvalue()
+    return buffers
+
+def result_urls(result: Any) -> List[str]:
+    """Collect the image URLs of a service response."""
+    if isinstance(result, dict):
+        if "result_url" in result:
+            return [result["result_url"]]
+        if result.get("urls"):
+            return list(result["urls"])
+        result = result.get("result")
+    urls = []
+    for item in result if isinstance(result, list) else []:
+        urls.extend(item["urls"] if isinstance(item, dict) else item)
+    return urls
+
+def build_scenario(
+    name: str,
+    api_key: str,
+    inputs: Dict[str, bytes],
+    sync: bool,
+    poller: Optional[Any] = None
+) -> Callable[[], Any]:
+    """
+    Return a callable performing one request of a scenario.
+
+    With sync=False the callable also waits on `poller` until the returned
+    URLs are ready, so latencies cover the whole render.
+    """
+    from services import (
+        add_shadow,
+        create_packshot,
+        enhance_prompt,
+        erase_foreground,
+        generate_hd_image,
+        generative_fill,
+        lifestyle_shot_by_text,
+        lifestyle_shots_by_text
+    )
+    from workflows.generate_ad_set import generate_ad_set
+
+    image, mask = inputs["image"], inputs["mask"]
+
+    def lifestyle_ab() -> Dict[str, Any]:
+        combined = []
+        for record in lifestyle_shots_by_text(api_key, image, AB_SCENES, num_results=1, sync=sync):
+            if "error" in record:
+                raise RuntimeError(record["error"])
+            combined.extend(record["result"].get("result", []))
+        return {"result": combined}
+
+    scenarios = {
+        "ad_set": lambda: generate_ad_set(api_key, image=image, config={
+            "create_packshot": True, "add_shadow": True, "lifestyle_shot": True,
+            "scene_description": "on a marble kitchen counter", "num_results": 1
+        }),
+        "packshot": lambda: create_packshot(api_key, image),
+        "shadow": lambda: add_shadow(api_key, image_data=image),
+        "lifestyle": lambda: lifestyle_shot_by_text(api_key, image, "on a marble kitchen counter",
+                                                    num_results=1, sync=sync),
+        "lifestyle_ab": lifestyle_ab,
+        "fill": lambda: generative_fill(api_key, image, mask, "a potted plant", num_results=1, sync=sync),
+        "erase": lambda: erase_foreground(api_key, image_data=image),
+        "hd": lambda: generate_hd_image(api_key, "a perfume bottle on a beach", sync=sync),
+        "enhance": lambda: enhance_prompt(api_key, "a perfume bottle on a beach")
+    }
+    fn = scenarios[name]
+    if sync or poller is None or name in ("ad_set", "packshot", "shadow", "erase", "enhance"):
+        return fn
+
+    def until_ready() -> Any:
+        result = fn()
+        batch = poller.watch(result_urls(result))
+        batch.wait()
+        if batch.failed_urls():
+            raise RuntimeError(f"{len(batch.failed_urls())} results never became ready")
+        return result
+    return until_ready
+
+def run_load(fn: Callable[[], Any], concurrency: int, requests: int) -> Dict[str, Any]:
+    """
+    Call `fn` `requests` times from `concurrency` threads.
+
+    Returns:
+        Dict with throughput, latency percentiles in seconds and the error count
+    """
+    def timed() -> Optional[float]:
+        start = time.perf_counter()
+        try:
+            fn()
+        except Exception:
+            return None
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(lambda _: timed(), range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [seconds for seconds in outcomes if seconds is not None]
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50": percentile(latencies, 50),
+        "p90": percentile(latencies, 90),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies, default=float("nan")),
+        "errors": len(outcomes) - len(latencies)
+    }
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_mock_process(args: argparse.Namespace) -> subprocess.Popen:
+    """Launch benchmarks.mock_bria and wait until it answers."""
+    port = _free_port()
+    command = [
+        sys.executable, "-m", "benchmarks.mock_bria", "--port", str(port),
+        "--time-scale", str(args.time_scale), "--error-rate", str(args.error_rate),
+        "--throttle-rate", str(args.throttle_rate), "--capacity", str(args.capacity)
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 15
+    while True:
+        try:
+            urllib.request.urlopen(f"{url}/stats", timeout=1).read()
+            break
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError("Mock Bria server did not start")
+            time.sleep(0.1)
+    args.url = url
+    return process
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Load test the services against a mock Bria API.")
+    parser.add_argument("--scenario", nargs="+", choices=SCENARIOS, default=["ad_set"])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=64, help="Requests per scenario and concurrency")
+    parser.add_argument("--megapixels", type=float, default=1.0, help="Size of the product image")
+    parser.add_argument("--async-results", action="store_true", help="Send sync=false where supported")
+    parser.add_argument("--cache", action="store_true", help="Keep the result cache and single-flight on")
+    parser.add_argument("--url", help="Use a running mock server instead of starting one")
+    parser.add_argument("--time-scale", type=float, default=0.05, help="Latency multiplier of the started mock")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--capacity", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    process = None if args.url else start_mock_process(args)
+    # Read by the services at import time, so set before importing them
+    os.environ["BRIA_API_BASE_URL"] = args.url
+    if not args.cache:
+        os.environ["BRIA_CACHE"] = "0"
+        os.environ["BRIA_SINGLE_FLIGHT"] = "0"
+    from services.client import configure
+    from services.poller import ReadinessPoller
+
+    try:
+        configure(pool_maxsize=max(args.concurrency) * 4)
+        inputs = make_inputs(args.megapixels)
+        poller = ReadinessPoller(max_workers=max(args.concurrency) * 2, initial_delay=0.1, max_delay=1.0)
+        print(f"Mock API: {args.url}")
+        print(f"{'scenario':<12}{'conc':>6}{'req/s':>10}{'p50 s':>9}{'p90 s':>9}{'p99 s':>9}{'max s':>9}{'errors':>8}")
+        for name in args.scenario:
+            fn = build_scenario(name, "load-test", inputs, sync=not args.async_results, poller=poller)
+            for concurrency in args.concurrency:
+                report = run_load(fn, concurrency, args.requests)
+                print(f"{name:<12}{concurrency:>6}{report['throughput']:>10.2f}{report['p50']:>9.3f}"
+                      f"{report['p90']:>9.3f}{report['p99']:>9.3f}{report['max']:>9.3f}{report['errors']:>8}")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Local stand-in for the Bria API, for load tests that must not hit the paid service.
+
+    python -m benchmarks.mock_bria --port 8900 --time-scale 0.1 --error-rate 0.02
+    BRIA_API_BASE_URL=http://127.0.0.1:8900 streamlit run app.py
+
+Every endpoint used by the services is implemented with a log-normal latency
+distribution, random 500s, random or capacity-driven 429s and the async
+behaviour of the real API: with "sync": false the call answers quickly with
+result URLs that return 404 until the image is "rendered".
+
+Per-endpoint settings can be overridden with a JSON file:
+
+    {"/v1/gen_fill": {"median": 8, "sigma": 0.5, "error_rate": 0.05}}
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import io
+import json
+import random
+import threading
+import time
+import uuid
+from PIL import Image
+
+# Approximate production latencies in seconds
+DEFAULT_PROFILES: Dict[str, Dict[str, float]] = {
+    "/v1/product/packshot": {"median": 3.0},
+    "/v1/product/shadow": {"median": 3.0},
+    "/v1/product/lifestyle_shot_by_text": {"median": 12.0},
+    "/v1/product/lifestyle_shot_by_image": {"median": 12.0},
+    "/v1/gen_fill": {"median": 8.0},
+    "/v1/erase_foreground": {"median": 3.0},
+    "/v1/text-to-image/hd/": {"median": 10.0},
+    "/v1/prompt_enhancer": {"median": 1.5}
+}
+
+# Endpoints that need an input image, as "file" or "image_url"
+IMAGE_ENDPOINTS = (
+    "/v1/product/packshot",
+    "/v1/product/shadow",
+    "/v1/product/lifestyle_shot_by_text",
+    "/v1/product/lifestyle_shot_by_image",
+    "/v1/gen_fill",
+    "/v1/erase_foreground"
+)
+
+class EndpointProfile:
+    """
+    Simulated behaviour of one endpoint.
+
+    Args:
+        median: Median processing time in seconds
+        sigma: Spread of the log-normal latency distribution
+        error_rate: Share of requests answered with a 500
+        throttle_rate: Share of requests answered with a 429
+        accept: Seconds an async ("sync": false) request takes to be accepted
+    """
+
+    def __init__(self, median: float, sigma: float = 0.35, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, accept: float = 0.3):
+        self.median = median
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.accept = accept
+
+    def latency(self, scale: float) -> float:
+        return random.lognormvariate(0.0, self.sigma) * self.median * scale
+
+def _render_png(size: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (size, size), (200, 200, 200)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+class MockBria(ThreadingHTTPServer):
+    """
+    HTTP server holding the simulation state.
+
+    Args:
+        address: (host, port) to listen on; port 0 picks a free one
+        profiles: Endpoint path (or path prefix) to profile
+        time_scale: Multiplier applied to every latency
+        capacity: Requests processed at once before 429s are sent, 0 for no cap
+        image_size: Side in pixels of the PNG served for result URLs
+    """
+
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, address: Tuple[str, int], profiles: Dict[str, EndpointProfile],
+                 time_scale: float = 1.0, capacity: int = 0, image_size: int = 512):
+        super().__init__(address, _Handler)
+        self.profiles = profiles
+        self.time_scale = time_scale
+        self.capacity = capacity
+        self.image = _render_png(image_size)
+        self.results: Dict[str, float] = {}
+        self.stats: Dict[str, int] = {"requests": 0, "errors": 0, "throttled": 0, "polls": 0}
+        self._active = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def profile(self, path: str) -> Optional[EndpointProfile]:
+        matches = [prefix for prefix in self.profiles if path == prefix or (prefix.endswith("/") and path.startswith(prefix))]
+        return self.profiles[max(matches, key=len)] if matches else None
+
+    def enter(self, throttle: bool = False) -> bool:
+        """Take a processing slot; False when the request is throttled or the server is at capacity."""
+        with self._lock:
+            self.stats["requests"] += 1
+            if throttle or (self.capacity and self._active >= self.capacity):
+                self.stats["throttled"] += 1
+                return False
+            self._active += 1
+            return True
+
+    def leave(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def new_result(self, ready_in: float) -> str:
+        token = uuid.uuid4().hex
+        with self._lock:
+            self.results[token] = time.monotonic() + ready_in
+        return f"{self.base_url}/results/{token}.png"
+
+def _result_body(path: str, urls: List[str], data: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a response the way the real endpoint does."""
+    if path == "/v1/prompt_enhancer":
+        return {"prompt variations": f"{data.get('prompt', '')}, studio lighting, highly detailed"}
+    if path.startswith("/v1/product/lifestyle_shot"):
+        return {"result": [[url] for url in urls]}
+    if path.startswith("/v1/text-to-image/hd/"):
+        return {"result": [{"urls": [url], "seed": random.randrange(2 ** 31)} for url in urls]}
+    if path == "/v1/gen_fill":
+        return {"urls": urls}
+    return {"result_url": urls[0]}
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: MockBria
+
+    def _send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        profile = self.server.profile(self.path)
+        if profile is None:
+            self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+            return
+        if not self.headers.get("api_token"):
+            self._send_json(401, {"error": "Missing api_token header"})
+            return
+        try:
+            data = json.loads(body)
+        except ValueError:
+            self._send_json(400, {"error": "Body is not valid JSON"})
+            return
+        if self.path in IMAGE_ENDPOINTS and not (data.get("file") or data.get("image_url")):
+            self._send_json(400, {"error": "Either file or image_url is required"})
+            return
+
+        if not self.server.enter(random.random() < profile.throttle_rate):
+            self._send_json(429, {"error": "Too many requests"}, {"Retry-After": "1"})
+            return
+        try:
+            scale = self.server.time_scale
+            latency = profile.latency(scale)
+            sync = data.get("sync", True)
+            time.sleep(latency if sync else profile.accept * scale)
+            if random.random() < profile.error_rate:
+                self.server.count("errors")
+                self._send_json(500, {"error": "Simulated server error"})
+                return
+            num_results = max(1, int(data.get("num_results", 1)))
+            urls = [self.server.new_result(0 if sync else latency) for _ in range(num_results)]
+            self._send_json(200, _result_body(self.path, urls, data))
+        finally:
+            self.server.leave()
+
+    def _serve_result(self, head: bool) -> None:
+        token = self.path.rsplit("/", 1)[-1].split(".")[0]
+        self.server.count("polls")
+        ready_at = self.server.results.get(token)
+        if ready_at is None or time.monotonic() < ready_at:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(self.server.image)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(self.server.image)
+
+    def do_GET(self):
+        if self.path.startswith("/results/"):
+            self._serve_result(head=False)
+        elif self.path == "/stats":
+            with self.server._lock:
+                self._send_json(200, dict(self.server.stats))
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_HEAD(self):
+        self._serve_result(head=True)
+
+    def log_message(self, format, *args):
+        pass
+
+def build_profiles(
+    overrides: Optional[Dict[str, Dict[str, float]]] = None,
+    **defaults: float
+) -> Dict[str, EndpointProfile]:
+    """Combine the built-in latencies, settings for all endpoints and per-endpoint overrides."""
+    profiles = {}
+    for path, settings in DEFAULT_PROFILES.items():
+        merged = {**settings, **defaults, **(overrides or {}).get(path, {})}
+        profiles[path] = EndpointProfile(**merged)
+    return profiles
+
+def start_mock_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    profiles: Optional[Dict[str, EndpointProfile]] = None,
+    **kwargs
+) -> MockBria:
+    """Run a mock server on a background thread and return it; see MockBria for kwargs."""
+    server = MockBria((host, port), profiles or build_profiles(), **kwargs)
+    threading.Thread(target=server.serve_forever, name="mock-bria", daemon=True).start()
+    return server
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a mock Bria API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Multiplier for every latency")
+    parser.add_argument("--sigma", type=float, default=0.35, help="Spread of the latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--capacity", type=int, default=0, help="Concurrent requests before 429s, 0 for no cap")
+    parser.add_argument("--image-size", type=int, default=512, help="Side of the result images in pixels")
+    parser.add_argument("--profiles", help="JSON file with per-endpoint overrides")
+    args = parser.parse_args(argv)
+
+    overrides = None
+    if args.profiles:
+        with open(args.profiles, encoding="utf-8") as f:
+            overrides = json.load(f)
+    profiles = build_profiles(overrides, sigma=args.sigma, error_rate=args.error_rate,
+                              throttle_rate=args.throttle_rate)
+    server = MockBria((args.host, args.port), profiles, time_scale=args.time_scale,
+                      capacity=args.capacity, image_size=args.image_size)
+    print(f"Mock Bria API on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
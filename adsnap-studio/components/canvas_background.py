@@ -0,0 +1,16 @@
+import io
+import streamlit as st
+from PIL import Image
+from utils.canvas import MAX_CANVAS_WIDTH, fit_to_canvas
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def load_canvas_background(image_bytes: bytes, max_width: int = MAX_CANVAS_WIDTH) -> Image.Image:
+    """
+    Decode an upload and fit it to the drawing canvas.
+
+    Every brush stroke reruns the script, so the result is cached by the
+    upload bytes and canvas width instead of decoding and resizing the full
+    original again on each stroke.
+    """
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        return fit_to_canvas(img, max_width)
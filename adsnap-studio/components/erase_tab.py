@@ -0,0 +1,67 @@
+import streamlit as st
+from components.session import download_image, render_download, render_export, render_job_status, submit_job
+
+def render():
+    """Render the erase elements tab."""
+    st.header("🎨 Erase Elements")
+    st.markdown("Upload an image and select the area you want to erase.")
+    
+    uploaded_file = st.file_uploader("Upload Image", type=["png", "jpg", "jpeg"], key="erase_upload")
+    if uploaded_file:
+        # The canvas stack is only needed once there is an image to draw on
+        from streamlit_drawable_canvas import st_canvas
+        from components.canvas_background import load_canvas_background
+
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Display original image
+            st.image(uploaded_file, caption="Original Image", use_column_width=True)
+            
+            # Canvas-sized RGB copy of the upload, cached across brush strokes
+            img = load_canvas_background(uploaded_file.getvalue())
+            canvas_width, canvas_height = img.size
+            
+            # Add drawing canvas using Streamlit's drawing canvas component
+            stroke_width = st.slider("Brush width", 1, 50, 20, key="erase_brush_width")
+            stroke_color = st.color_picker("Brush color", "#fff", key="erase_brush_color")
+            
+            # Create canvas with background image
+            canvas_result = st_canvas(
+                fill_color="rgba(255, 255, 255, 0.0)",  # Transparent fill
+                stroke_width=stroke_width,
+                stroke_color=stroke_color,
+                background_color="",  # Transparent background
+                background_image=img,  # Pass PIL Image directly
+                drawing_mode="freedraw",
+                height=canvas_height,
+                width=canvas_width,
+                key="erase_canvas",
+            )
+            
+            # Options for erasing
+            st.subheader("Erase Options")
+            content_moderation = st.checkbox("Enable Content Moderation", False, key="erase_content_mod")
+            
+            if st.button("🎨 Erase Selected Area", key="erase_btn"):
+                if not canvas_result.image_data is None:
+                    # Convert uploaded image to bytes
+                    image_bytes = uploaded_file.getvalue()
+                    
+                    submit_job(
+                        "erase_foreground",
+                        "erase",
+                        image_data=image_bytes,
+                        content_moderation=content_moderation
+                    )
+                else:
+                    st.warning("Please draw on the image to select the area to erase.")
+        
+        with col2:
+            render_job_status("erase")
+            if st.session_state.edited_image:
+                st.image(st.session_state.edited_image, caption="Result", use_column_width=True)
+                image_data = download_image(st.session_state.edited_image)
+                if image_data:
+                    render_download(image_data, "erased_image", key="erase_download")
+                render_export("erase")
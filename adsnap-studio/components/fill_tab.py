@@ -0,0 +1,100 @@
+import streamlit as st
+from components.session import download_image, render_download, render_export, render_job_status, submit_job
+
+def render():
+    """Render the generative fill tab."""
+    st.header("🎨 Generative Fill")
+    st.markdown("Draw a mask on the image and describe what you want to generate in that area.")
+    
+    uploaded_file = st.file_uploader("Upload Image", type=["png", "jpg", "jpeg"], key="fill_upload")
+    if uploaded_file:
+        # The canvas stack is only needed once there is an image to draw on
+        from streamlit_drawable_canvas import st_canvas
+        from components.canvas_background import load_canvas_background
+        from utils.canvas import canvas_to_mask
+
+        # Create columns for original image and canvas
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Display original image
+            st.image(uploaded_file, caption="Original Image", use_column_width=True)
+            
+            # Canvas-sized RGB copy of the upload, cached across brush strokes
+            img = load_canvas_background(uploaded_file.getvalue())
+            canvas_width, canvas_height = img.size
+            
+            # Add drawing canvas using Streamlit's drawing canvas component
+            stroke_width = st.slider("Brush width", 1, 50, 20)
+            stroke_color = st.color_picker("Brush color", "#fff")
+            drawing_mode = "freedraw"
+            
+            # Create canvas with background image
+            canvas_result = st_canvas(
+                fill_color="rgba(255, 255, 255, 0.0)",  # Transparent fill
+                stroke_width=stroke_width,
+                stroke_color=stroke_color,
+                drawing_mode=drawing_mode,
+                background_color="",  # Transparent background
+                background_image=img,  # Always RGB
+                height=canvas_height,
+                width=canvas_width,
+                key="canvas",
+            )
+            
+            # Options for generation
+            st.subheader("Generation Options")
+            prompt = st.text_area("Describe what to generate in the masked area")
+            negative_prompt = st.text_area("Describe what to avoid (optional)")
+            
+            col_a, col_b = st.columns(2)
+            with col_a:
+                num_results = st.slider("Number of variations", 1, 4, 1)
+                sync_mode = st.checkbox("Synchronous Mode", False,
+                    help="Wait for results instead of getting URLs immediately",
+                    key="gen_fill_sync_mode")
+            
+            with col_b:
+                seed = st.number_input("Seed (optional)", min_value=0, value=0,
+                    help="Use same seed to reproduce results")
+                content_moderation = st.checkbox("Enable Content Moderation", False,
+                    key="gen_fill_content_mod")
+            
+            if st.button("🎨 Generate", type="primary"):
+                if not prompt:
+                    st.error("Please enter a prompt describing what to generate.")
+                    return
+                
+                if canvas_result.image_data is None:
+                    st.error("Please draw a mask on the image first.")
+                    return
+                
+                # Convert canvas result to a PNG mask
+                mask_bytes = canvas_to_mask(canvas_result.image_data)
+                
+                # Convert uploaded image to bytes
+                image_bytes = uploaded_file.getvalue()
+                
+                submit_job(
+                    "generative_fill",
+                    "fill",
+                    image_data=image_bytes,
+                    mask_data=mask_bytes,
+                    prompt=prompt,
+                    negative_prompt=negative_prompt if negative_prompt else None,
+                    num_results=num_results,
+                    sync=sync_mode,
+                    seed=seed if seed != 0 else None,
+                    content_moderation=content_moderation
+                )
+        
+        with col2:
+            render_job_status("fill")
+            if st.session_state.edited_image:
+                st.image(st.session_state.edited_image, caption="Generated Result", use_column_width=True)
+                image_data = download_image(st.session_state.edited_image)
+                if image_data:
+                    render_download(image_data, "generated_fill")
+                render_export("fill")
+            elif st.session_state.pending_urls:
+                st.info("Generation in progress. Results will appear here as soon as they're ready.")
@@ -0,0 +1,84 @@
+import streamlit as st
+from components.session import render_job_status, submit_job
+
+def render():
+    """Render the image generation tab."""
+    st.header("Generate Images")
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        # Prompt input
+        prompt = st.text_area("Enter your prompt", 
+                            value="",
+                            height=100,
+                            key="prompt_input")
+        
+        # Store original prompt in session state when it changes
+        if "original_prompt" not in st.session_state:
+            st.session_state.original_prompt = prompt
+        elif prompt != st.session_state.original_prompt:
+            st.session_state.original_prompt = prompt
+            st.session_state.enhanced_prompt = None  # Reset enhanced prompt when original changes
+        
+        # Enhanced prompt display
+        if st.session_state.get('enhanced_prompt'):
+            st.markdown("**Enhanced Prompt:**")
+            st.markdown(f"*{st.session_state.enhanced_prompt}*")
+        
+        # Enhance Prompt button
+        if st.button("✨ Enhance Prompt", key="enhance_button"):
+            if not prompt:
+                st.warning("Please enter a prompt to enhance.")
+            else:
+                from services.prompt_cache import cached_enhancement
+
+                # Known prompts are answered from the cache without a job round trip
+                enhanced = cached_enhancement(prompt)
+                if enhanced is not None:
+                    st.session_state.enhanced_prompt = enhanced
+                    st.session_state.job_messages["generate"] = ("success", "Prompt enhanced!")
+                    st.rerun()
+                submit_job("enhance_prompt", "generate", prompt=prompt)
+                        
+        # Debug information
+        st.write("Debug - Session State:", {
+            "original_prompt": st.session_state.get("original_prompt"),
+            "enhanced_prompt": st.session_state.get("enhanced_prompt")
+        })
+    
+    with col2:
+        num_images = st.slider("Number of images", 1, 4, 1)
+        aspect_ratio = st.selectbox("Aspect ratio", ["1:1", "16:9", "9:16", "4:3", "3:4"])
+        enhance_img = st.checkbox("Enhance image quality", value=True)
+        
+        # Style options
+        st.subheader("Style Options")
+        style = st.selectbox("Image Style", [
+            "Realistic", "Artistic", "Cartoon", "Sketch", 
+            "Watercolor", "Oil Painting", "Digital Art"
+        ])
+        
+        # Add style to prompt
+        if style and style != "Realistic":
+            prompt = f"{prompt}, in {style.lower()} style"
+    
+    # Generate button
+    if st.button("🎨 Generate Images", type="primary"):
+        if not st.session_state.api_key:
+            st.error("Please enter your API key in the sidebar.")
+            return
+            
+        submit_job(
+            "generate_hd_image",
+            "generate",
+            prompt=st.session_state.enhanced_prompt or prompt,
+            num_results=num_images,
+            aspect_ratio=aspect_ratio,  # Already in correct format (e.g. "1:1")
+            sync=True,  # Wait for results
+            enhance_image=enhance_img,
+            medium="art" if style != "Realistic" else "photography",
+            prompt_enhancement=False,  # We're already using our own prompt enhancement
+            content_moderation=True  # Enable content moderation by default
+        )
+
+    render_job_status("generate")
@@ -1,17 +1,36 @@
 import streamlit as st
-import requests
 from PIL import Image
 import io
 
 def download_image(url):
-    """Download image from URL and return as bytes."""
-    response = requests.get(url)
-    if response.status_code == 200:
-        return response.content
-    return None
+    """Return the bytes of a result image, downloading it only the first time."""
+    from services.blob_store import get_blob_store
+
+    try:
+        return get_blob_store().get_bytes(url)
+    except Exception:
+        return None
+
+def download_images(urls):
+    """Return the bytes of several result images, downloading them concurrently (None for failures)."""
+    from services.blob_store import get_blob_store
+
+    return get_blob_store().get_many(list(urls))
+
+def apply_image_filter(image, filter_type):
+    """Apply various filters to the image."""
+    from utils.image_filters import apply_filter
+
+    try:
+        img = Image.open(io.BytesIO(image)) if isinstance(image, bytes) else Image.open(image)
+        return apply_filter(img, filter_type)
+    except Exception as e:
+        st.error(f"Error applying filter: {str(e)}")
+        return None
 
 def render_image_preview(result):
     """Render the image preview with download options."""
+    from services.staging import IMAGE_EXTENSIONS, image_content_type
     
     if not result or "images" not in result:
         st.error("No images to display")
@@ -21,27 +40,25 @@ def render_image_preview(result):
     
     # Create columns for multiple images
     cols = st.columns(len(result["images"]))
+    urls = [image_data.get("url") for image_data in result["images"]]
+    # All images are fetched at once; the buttons serve the bytes as downloaded
+    valid_urls = [url for url in urls if url]
+    contents = dict(zip(valid_urls, download_images(valid_urls)))
     
-    for idx, (col, image_data) in enumerate(zip(cols, result["images"])):
+    for idx, (col, url) in enumerate(zip(cols, urls)):
         with col:
-            if "url" in image_data:
-                image_bytes = download_image(image_data["url"])
+            if url:
+                image_bytes = contents.get(url)
                 if image_bytes:
                     st.image(image_bytes, caption=f"Generated Image {idx + 1}")
                     
-                    # Convert to PIL Image for saving
-                    image = Image.open(io.BytesIO(image_bytes))
-                    
                     # Save button
-                    img_byte_arr = io.BytesIO()
-                    image.save(img_byte_arr, format=image.format or 'PNG')
-                    img_byte_arr = img_byte_arr.getvalue()
-                    
+                    mime = image_content_type(image_bytes)
                     st.download_button(
                         label=f"💾 Download Image {idx + 1}",
-                        data=img_byte_arr,
-                        file_name=f"adsnap_generated_{idx + 1}.png",
-                        mime="image/png"
+                        data=image_bytes,
+                        file_name=f"adsnap_generated_{idx + 1}.{IMAGE_EXTENSIONS.get(mime, 'png')}",
+                        mime=mime
                     )
             else:
                 st.error(f"Invalid image data for image {idx + 1}")
@@ -0,0 +1,242 @@
+import streamlit as st
+from components.session import download_image, render_download, render_export, render_job_status, submit_job
+
+def render():
+    """Render the product photography tab."""
+    st.header("Product Photography")
+    
+    uploaded_file = st.file_uploader("Upload Product Image", type=["png", "jpg", "jpeg"], key="product_upload")
+    if uploaded_file:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.image(uploaded_file, caption="Original Image", use_column_width=True)
+            
+            # Product editing options
+            edit_option = st.selectbox("Select Edit Option", [
+                "Create Packshot",
+                "Add Shadow",
+                "Lifestyle Shot"
+            ])
+            
+            if edit_option == "Create Packshot":
+                col_a, col_b = st.columns(2)
+                with col_a:
+                    bg_color = st.color_picker("Background Color", "#FFFFFF")
+                    sku = st.text_input("SKU (optional)", "")
+                with col_b:
+                    force_rmbg = st.checkbox("Force Background Removal", False)
+                    content_moderation = st.checkbox("Enable Content Moderation", False)
+                
+                if st.button("Create Packshot"):
+                    try:
+                        # First remove background if needed
+                        if force_rmbg:
+                            with st.spinner("Removing background..."):
+                                from services.background_service import remove_background
+                                bg_result = remove_background(
+                                    st.session_state.api_key,
+                                    uploaded_file.getvalue(),
+                                    content_moderation=content_moderation
+                                )
+                            if bg_result and "result_url" in bg_result:
+                                # Download the background-removed image
+                                image_data = download_image(bg_result["result_url"])
+                                if not image_data:
+                                    st.error("Failed to download background-removed image")
+                                    return
+                            else:
+                                st.error("Background removal failed")
+                                return
+                        else:
+                            image_data = uploaded_file.getvalue()
+                        
+                        # Now queue the packshot
+                        submit_job(
+                            "create_packshot",
+                            "product",
+                            image_data=image_data,
+                            background_color=bg_color,
+                            sku=sku if sku else None,
+                            force_rmbg=force_rmbg,
+                            content_moderation=content_moderation
+                        )
+                    except Exception as e:
+                        st.error(f"Error creating packshot: {str(e)}")
+            
+            elif edit_option == "Add Shadow":
+                col_a, col_b = st.columns(2)
+                with col_a:
+                    shadow_type = st.selectbox("Shadow Type", ["Natural", "Drop"])
+                    bg_color = st.color_picker("Background Color (optional)", "#FFFFFF")
+                    use_transparent_bg = st.checkbox("Use Transparent Background", True)
+                    shadow_color = st.color_picker("Shadow Color", "#000000")
+                    sku = st.text_input("SKU (optional)", "")
+                    
+                    # Shadow offset
+                    st.subheader("Shadow Offset")
+                    offset_x = st.slider("X Offset", -50, 50, 0)
+                    offset_y = st.slider("Y Offset", -50, 50, 15)
+                
+                with col_b:
+                    shadow_intensity = st.slider("Shadow Intensity", 0, 100, 60)
+                    shadow_blur = st.slider("Shadow Blur", 0, 50, 15 if shadow_type.lower() == "regular" else 20)
+                    
+                    # Float shadow specific controls
+                    if shadow_type == "Float":
+                        st.subheader("Float Shadow Settings")
+                        shadow_width = st.slider("Shadow Width", -100, 100, 0)
+                        shadow_height = st.slider("Shadow Height", -100, 100, 70)
+                    
+                    force_rmbg = st.checkbox("Force Background Removal", False)
+                    content_moderation = st.checkbox("Enable Content Moderation", False)
+                
+                if st.button("Add Shadow"):
+                    submit_job(
+                        "add_shadow",
+                        "product",
+                        image_data=uploaded_file.getvalue(),
+                        shadow_type=shadow_type.lower(),
+                        background_color=None if use_transparent_bg else bg_color,
+                        shadow_color=shadow_color,
+                        shadow_offset=[offset_x, offset_y],
+                        shadow_intensity=shadow_intensity,
+                        shadow_blur=shadow_blur,
+                        shadow_width=shadow_width if shadow_type == "Float" else None,
+                        shadow_height=shadow_height if shadow_type == "Float" else 70,
+                        sku=sku if sku else None,
+                        force_rmbg=force_rmbg,
+                        content_moderation=content_moderation
+                    )
+            
+            elif edit_option == "Lifestyle Shot":
+                shot_type = st.radio("Shot Type", ["Text Prompt", "Reference Image"])
+                
+                # Common settings for both types
+                col1, col2 = st.columns(2)
+                with col1:
+                    placement_type = st.selectbox("Placement Type", [
+                        "Original", "Automatic", "Manual Placement",
+                        "Manual Padding", "Custom Coordinates"
+                    ])
+                    num_results = st.slider("Number of Results", 1, 8, 4)
+                    sync_mode = st.checkbox("Synchronous Mode", False,
+                        help="Wait for results instead of getting URLs immediately")
+                    original_quality = st.checkbox("Original Quality", False,
+                        help="Maintain original image quality")
+                    
+                    if placement_type == "Manual Placement":
+                        positions = st.multiselect("Select Positions", [
+                            "Upper Left", "Upper Right", "Bottom Left", "Bottom Right",
+                            "Right Center", "Left Center", "Upper Center",
+                            "Bottom Center", "Center Vertical", "Center Horizontal"
+                        ], ["Upper Left"])
+                    
+                    elif placement_type == "Manual Padding":
+                        st.subheader("Padding Values (pixels)")
+                        pad_left = st.number_input("Left Padding", 0, 1000, 0)
+                        pad_right = st.number_input("Right Padding", 0, 1000, 0)
+                        pad_top = st.number_input("Top Padding", 0, 1000, 0)
+                        pad_bottom = st.number_input("Bottom Padding", 0, 1000, 0)
+                    
+                    elif placement_type in ["Automatic", "Manual Placement", "Custom Coordinates"]:
+                        st.subheader("Shot Size")
+                        shot_width = st.number_input("Width", 100, 2000, 1000)
+                        shot_height = st.number_input("Height", 100, 2000, 1000)
+                
+                with col2:
+                    if placement_type == "Custom Coordinates":
+                        st.subheader("Product Position")
+                        fg_width = st.number_input("Product Width", 50, 1000, 500)
+                        fg_height = st.number_input("Product Height", 50, 1000, 500)
+                        fg_x = st.number_input("X Position", -500, 1500, 0)
+                        fg_y = st.number_input("Y Position", -500, 1500, 0)
+                    
+                    sku = st.text_input("SKU (optional)")
+                    force_rmbg = st.checkbox("Force Background Removal", False)
+                    content_moderation = st.checkbox("Enable Content Moderation", False)
+                    
+                    if shot_type == "Text Prompt":
+                        fast_mode = st.checkbox("Fast Mode", True,
+                            help="Balance between speed and quality")
+                        optimize_desc = st.checkbox("Optimize Description", True,
+                            help="Enhance scene description using AI")
+                        if not fast_mode:
+                            exclude_elements = st.text_area("Exclude Elements (optional)",
+                                help="Elements to exclude from the generated scene")
+                    else:  # Reference Image
+                        enhance_ref = st.checkbox("Enhance Reference Image", True,
+                            help="Improve lighting, shadows, and texture")
+                        ref_influence = st.slider("Reference Influence", 0.0, 1.0, 1.0,
+                            help="Control similarity to reference image")
+                
+                if shot_type == "Text Prompt":
+                    prompt = st.text_area("Describe the environment")
+                    if st.button("Generate Lifestyle Shot") and prompt:
+                        # Convert placement selections to API format
+                        if placement_type == "Manual Placement":
+                            manual_placements = [p.lower().replace(" ", "_") for p in positions]
+                        else:
+                            manual_placements = ["upper_left"]
+                        
+                        submit_job(
+                            "lifestyle_shot_by_text",
+                            "product",
+                            image_data=uploaded_file.getvalue(),
+                            scene_description=prompt,
+                            placement_type=placement_type.lower().replace(" ", "_"),
+                            num_results=num_results,
+                            sync=sync_mode,
+                            fast=fast_mode,
+                            optimize_description=optimize_desc,
+                            shot_size=[shot_width, shot_height] if placement_type != "Original" else [1000, 1000],
+                            original_quality=original_quality,
+                            exclude_elements=exclude_elements if not fast_mode else None,
+                            manual_placement_selection=manual_placements,
+                            padding_values=[pad_left, pad_right, pad_top, pad_bottom] if placement_type == "Manual Padding" else [0, 0, 0, 0],
+                            foreground_image_size=[fg_width, fg_height] if placement_type == "Custom Coordinates" else None,
+                            foreground_image_location=[fg_x, fg_y] if placement_type == "Custom Coordinates" else None,
+                            force_rmbg=force_rmbg,
+                            content_moderation=content_moderation,
+                            sku=sku if sku else None
+                        )
+                else:
+                    ref_image = st.file_uploader("Upload Reference Image", type=["png", "jpg", "jpeg"], key="ref_upload")
+                    if st.button("Generate Lifestyle Shot") and ref_image:
+                        # Convert placement selections to API format
+                        if placement_type == "Manual Placement":
+                            manual_placements = [p.lower().replace(" ", "_") for p in positions]
+                        else:
+                            manual_placements = ["upper_left"]
+                        
+                        submit_job(
+                            "lifestyle_shot_by_image",
+                            "product",
+                            image_data=uploaded_file.getvalue(),
+                            reference_image=ref_image.getvalue(),
+                            placement_type=placement_type.lower().replace(" ", "_"),
+                            num_results=num_results,
+                            sync=sync_mode,
+                            shot_size=[shot_width, shot_height] if placement_type != "Original" else [1000, 1000],
+                            original_quality=original_quality,
+                            manual_placement_selection=manual_placements,
+                            padding_values=[pad_left, pad_right, pad_top, pad_bottom] if placement_type == "Manual Padding" else [0, 0, 0, 0],
+                            foreground_image_size=[fg_width, fg_height] if placement_type == "Custom Coordinates" else None,
+                            foreground_image_location=[fg_x, fg_y] if placement_type == "Custom Coordinates" else None,
+                            force_rmbg=force_rmbg,
+                            content_moderation=content_moderation,
+                            sku=sku if sku else None,
+                            enhance_ref_image=enhance_ref,
+                            ref_image_influence=ref_influence
+                        )
+        
+        with col2:
+            render_job_status("product")
+            if st.session_state.edited_image:
+                st.image(st.session_state.edited_image, caption="Edited Image", use_column_width=True)
+                image_data = download_image(st.session_state.edited_image)
+                if image_data:
+                    render_download(image_data, "edited_product")
+                render_export("product")
+            elif st.session_state.pending_urls:
+                st.info("Images are being generated and will appear here as soon as they're ready.")
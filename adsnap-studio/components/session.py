@@ -0,0 +1,229 @@
+"""
+Session state and background job helpers shared by the app's tabs.
+
+Kept free of heavy imports: the blob store and the poller (and with them
+requests) are only imported once there is a result to show or to watch.
+"""
+import os
+import streamlit as st
+from workflows.jobs import DONE, FAILED, get_job_queue
+
+JOB_LABELS = {
+    "generate_hd_image": "Image generation",
+    "create_packshot": "Packshot",
+    "add_shadow": "Shadow",
+    "lifestyle_shot_by_text": "Lifestyle shot",
+    "lifestyle_shot_by_image": "Lifestyle shot",
+    "generative_fill": "Generative fill",
+    "erase_foreground": "Erase",
+    "enhance_prompt": "Prompt enhancement"
+}
+
+def initialize_session_state():
+    """Initialize session state variables."""
+    if 'api_key' not in st.session_state:
+        st.session_state.api_key = os.getenv('BRIA_API_KEY')
+    if 'generated_images' not in st.session_state:
+        st.session_state.generated_images = []
+    if 'current_image' not in st.session_state:
+        st.session_state.current_image = None
+    if 'pending_urls' not in st.session_state:
+        st.session_state.pending_urls = []
+    if 'edited_image' not in st.session_state:
+        st.session_state.edited_image = None
+    if 'original_prompt' not in st.session_state:
+        st.session_state.original_prompt = ""
+    if 'enhanced_prompt' not in st.session_state:
+        st.session_state.enhanced_prompt = None
+    if 'active_jobs' not in st.session_state:
+        # Pick up jobs submitted before a page reload or a dropped connection
+        st.session_state.active_jobs = [j for j in st.query_params.get("jobs", "").split(",") if j]
+    if 'job_states' not in st.session_state:
+        st.session_state.job_states = {}
+    if 'job_messages' not in st.session_state:
+        st.session_state.job_messages = {}
+    if 'exports' not in st.session_state:
+        st.session_state.exports = {}
+
+def download_image(url):
+    """Return the bytes of a result image, downloading it only the first time."""
+    from services.blob_store import get_blob_store
+
+    try:
+        return get_blob_store().get_bytes(url)
+    except Exception as e:
+        st.error(f"Error downloading image: {str(e)}")
+        return None
+
+def render_download(image_data, file_stem, key=None):
+    """Offer result image bytes for download, named and typed after their actual format."""
+    from services.staging import IMAGE_EXTENSIONS, image_content_type
+
+    mime = image_content_type(image_data)
+    st.download_button(
+        "⬇️ Download Result",
+        image_data,
+        f"{file_stem}.{IMAGE_EXTENSIONS.get(mime, 'bin')}",
+        mime,
+        key=key
+    )
+
+def prefetch_images(urls):
+    """Start downloading result images into the blob store in the background."""
+    from services.blob_store import get_blob_store
+
+    get_blob_store().prefetch(urls)
+
+def render_export(tab):
+    """Offer the current result images as one ZIP archive with a manifest."""
+    urls = tuple(url for url in st.session_state.generated_images if url)
+    if not urls:
+        return
+
+    requested = st.button("📦 Export as ZIP", key=f"{tab}_export")
+    exported_urls, token = st.session_state.exports.get(tab, ((), None))
+    from workflows.export import INLINE_EXPORT_MAX_BYTES, create_export, export_path, export_url, url_images
+
+    if requested and (exported_urls != urls or token is None or export_path(token) is None):
+        with st.spinner("Building archive..."):
+            token = create_export(url_images(urls), manifest={"tab": tab})
+        st.session_state.exports[tab] = (urls, token)
+    elif exported_urls != urls:
+        return
+    if token is None:
+        return
+
+    url = export_url(token)
+    if url:
+        # Streamed by the export server; nothing is held in the session
+        st.link_button("⬇️ Download ZIP", url)
+        return
+    path = export_path(token)
+    if path is None:
+        return
+    size = os.path.getsize(path)
+    if size > INLINE_EXPORT_MAX_BYTES:
+        st.warning(f"The archive is {size / 2 ** 20:.0f} MB, too large to download through the app. "
+                   "Set BRIA_EXPORT_PORT to stream it, or copy it from " + path)
+    elif requested:
+        # A download button keeps its data in memory and re-reads it on every
+        # rerun, so it is only shown in the run the export was asked for
+        with open(path, "rb") as f:
+            st.download_button("⬇️ Download ZIP", f, "adsnap_export.zip", "application/zip", key=f"{tab}_export_download")
+    else:
+        st.caption("Archive ready. Click Export as ZIP to download it.")
+
+def watch_generated_images(urls):
+    """Hand async-mode result URLs to the background readiness poller."""
+    from services.poller import get_poller
+
+    # Each image is downloaded as soon as it is ready, concurrently with the others
+    st.session_state.poll_batch = get_poller().watch(urls, on_ready=lambda url: prefetch_images([url]))
+    st.session_state.pending_urls = list(urls)
+
+def check_generated_images():
+    """Move images the background poller has found ready into session state."""
+    batch = st.session_state.get('poll_batch')
+    if batch is None:
+        return False
+
+    ready_images = batch.ready_urls()
+    st.session_state.pending_urls = batch.pending_urls()
+    if batch.done:
+        st.session_state.poll_batch = None
+        if not ready_images:
+            st.warning("⚠️ Generation timed out. Please try again.")
+
+    # If we found any ready images, update the display
+    if ready_images:
+        st.session_state.edited_image = ready_images[0]  # Display the first ready image
+        st.session_state.generated_images = ready_images  # The current result set, exported as a whole
+        return True
+
+    return False
+
+def extract_result_urls(result):
+    """Collect the image URLs from the different Bria response shapes."""
+    from services.staging import result_urls
+
+    return result_urls(result)
+
+def _sync_job_params():
+    """Keep the ids of running jobs in the URL so a reload can resume them."""
+    if st.session_state.active_jobs:
+        st.query_params["jobs"] = ",".join(st.session_state.active_jobs)
+    elif "jobs" in st.query_params:
+        del st.query_params["jobs"]
+
+def submit_job(kind, tab, **params):
+    """Queue a Bria call; its result is applied by check_jobs on a later rerun."""
+    meta = {"tab": tab, "sync": params.get("sync", True), "num_results": params.get("num_results", 1)}
+    try:
+        job_id = get_job_queue().submit(kind, st.session_state.api_key, meta=meta, **params)
+    except Exception as e:
+        st.error(f"Error queuing request: {str(e)}")
+        return None
+    st.session_state.active_jobs.append(job_id)
+    _sync_job_params()
+    return job_id
+
+def check_jobs():
+    """Apply the results of finished jobs to session state."""
+    queue = get_job_queue()
+    states = {}
+    for job_id in list(st.session_state.active_jobs):
+        status = queue.status(job_id)
+        if status is None or status["status"] not in (DONE, FAILED):
+            if status is not None:
+                states[job_id] = status
+            else:
+                st.session_state.active_jobs.remove(job_id)
+            continue
+
+        st.session_state.active_jobs.remove(job_id)
+        meta = status["meta"] or {}
+        messages = st.session_state.job_messages
+        if status["status"] == FAILED:
+            messages[meta.get("tab")] = ("error", status["error"])
+            continue
+
+        result = queue.result(job_id)
+        label = JOB_LABELS.get(status["kind"], status["kind"])
+        if status["kind"] == "enhance_prompt":
+            if result:
+                st.session_state.enhanced_prompt = result
+                messages[meta.get("tab")] = ("success", "Prompt enhanced!")
+            continue
+
+        urls = extract_result_urls(result)[:meta.get("num_results") or 1]
+        if not urls:
+            messages[meta.get("tab")] = ("error", "No result URL in the API response. Please try again.")
+        elif not meta.get("sync", True):
+            watch_generated_images(urls)
+        else:
+            prefetch_images(urls)
+            st.session_state.edited_image = urls[0]
+            st.session_state.generated_images = urls
+            messages[meta.get("tab")] = ("success", f"✨ {label} complete!")
+
+    st.session_state.job_states = states
+    _sync_job_params()
+
+def render_job_status(tab):
+    """Show the queued and running jobs of a tab, and the outcome of the last one."""
+    level, message = st.session_state.job_messages.pop(tab, (None, None))
+    if level == "success":
+        st.success(message)
+    elif level == "error":
+        st.error(f"Error: {message}")
+        if "422" in message:
+            st.warning("Content moderation failed. Please ensure the content is appropriate.")
+
+    for status in st.session_state.job_states.values():
+        if (status["meta"] or {}).get("tab") != tab:
+            continue
+        label = JOB_LABELS.get(status["kind"], status["kind"])
+        if status["status"] == "queued":
+            st.info(f"⏳ {label} queued...")
+        else:
+            st.info(f"🎨 {label} in progress...")
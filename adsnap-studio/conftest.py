@@ -0,0 +1,2 @@
+# pytest puts this directory on sys.path, so the tests can import services,
+# workflows and utils whether they are run from here or from the repo root.
@@ -1,18 +1,71 @@
-from .lifestyle_shot import lifestyle_shot_by_text, lifestyle_shot_by_image
-from .shadow import add_shadow
-from .packshot import create_packshot
-from .prompt_enhancement import enhance_prompt
-from .generative_fill import generative_fill
-from .hd_image_generation import generate_hd_image
-from .erase_foreground import erase_foreground
+import importlib
+import sys
+import types
+
+# Service functions are imported on first use so that importing one
+# submodule (e.g. services.cache) does not pull in requests, httpx and every
+# other service; the Streamlit script pays for them only once it needs them.
+_EXPORTS = {
+    'lifestyle_shot_by_text': 'lifestyle_shot',
+    'lifestyle_shot_by_image': 'lifestyle_shot',
+    'lifestyle_shot_by_text_async': 'lifestyle_shot',
+    'lifestyle_shot_by_image_async': 'lifestyle_shot',
+    'lifestyle_shots_by_text': 'lifestyle_shot',
+    'lifestyle_shots_by_text_async': 'lifestyle_shot',
+    'add_shadow': 'shadow',
+    'add_shadow_async': 'shadow',
+    'create_packshot': 'packshot',
+    'create_packshot_async': 'packshot',
+    'enhance_prompt': 'prompt_enhancement',
+    'enhance_prompt_async': 'prompt_enhancement',
+    'prefetch_enhancements': 'prompt_enhancement',
+    'generative_fill': 'generative_fill',
+    'generative_fill_async': 'generative_fill',
+    'generate_hd_image': 'hd_image_generation',
+    'generate_hd_image_async': 'hd_image_generation',
+    'erase_foreground': 'erase_foreground',
+    'erase_foreground_async': 'erase_foreground'
+}
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
+
+class _ServicesPackage(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing services.generative_fill or services.erase_foreground binds
+        # the submodule to the package; keep those names on the functions
+        if name in _EXPORTS and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
+
+sys.modules[__name__].__class__ = _ServicesPackage
 
 __all__ = [
     'lifestyle_shot_by_text',
     'lifestyle_shot_by_image',
+    'lifestyle_shots_by_text',
     'add_shadow',
     'create_packshot',
     'enhance_prompt',
+    'prefetch_enhancements',
     'generative_fill',
     'generate_hd_image',
-    'erase_foreground'
-] 
\ No newline at end of file
+    'erase_foreground',
+    'lifestyle_shot_by_text_async',
+    'lifestyle_shot_by_image_async',
+    'lifestyle_shots_by_text_async',
+    'add_shadow_async',
+    'create_packshot_async',
+    'enhance_prompt_async',
+    'generative_fill_async',
+    'generate_hd_image_async',
+    'erase_foreground_async'
+]
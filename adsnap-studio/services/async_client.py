@@ -0,0 +1,264 @@
+from typing import Dict, Any, Optional, Tuple
+import asyncio
+import os
+import weakref
+from .client import BASE_URL, Timeout, get_timeout
+from .cache import get_result_cache, is_cacheable, make_cache_key
+from .json_body import JSONBodyStream
+from .metrics import RequestTiming, TimedBody, increment, observe
+from .rate_limit import DEFAULT_THROTTLE_RETRIES, THROTTLE_STATUSES, Governor, get_governor, parse_retry_after
+from .retry import RetryPolicy, count, get_retry_policy, hedge_delay, record_latency
+from .single_flight import get_single_flight
+
+# Optional and slow to import, so loaded together with the first client
+httpx = None
+
+def _import_httpx():
+    global httpx
+    if httpx is None:
+        try:
+            import httpx as module
+        except ImportError:  # pragma: no cover - optional dependency
+            raise ImportError("httpx is required for the async services: pip install httpx") from None
+        httpx = module
+    return httpx
+
+DEFAULT_MAX_CONNECTIONS = int(os.getenv("BRIA_ASYNC_MAX_CONNECTIONS", "200"))
+DEFAULT_MAX_KEEPALIVE = int(os.getenv("BRIA_ASYNC_MAX_KEEPALIVE", "50"))
+
+# httpx clients are bound to the event loop that created them, so the shared
+# pool is kept per loop and dropped together with it.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+def _to_httpx_timeout(timeout: Timeout):
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+def get_async_client():
+    """Return the shared httpx.AsyncClient for the running event loop."""
+    _import_httpx()
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=BASE_URL,
+            timeout=_to_httpx_timeout(get_timeout()),
+            limits=httpx.Limits(
+                max_connections=DEFAULT_MAX_CONNECTIONS,
+                max_keepalive_connections=DEFAULT_MAX_KEEPALIVE
+            ),
+            headers={
+                'Accept': 'application/json',
+                'Content-Type': 'application/json'
+            }
+        )
+        _clients[loop] = client
+    return client
+
+async def aclose() -> None:
+    """Close the shared async client of the running event loop."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+async def _apost_once(
+    client,
+    path: str,
+    api_key: str,
+    data: Dict[str, Any],
+    governor: Governor,
+    kwargs: Dict[str, Any],
+    hedge: bool = False,
+    sent: Optional[asyncio.Event] = None
+) -> Tuple[Any, RequestTiming]:
+    """Make one HTTP attempt, timing each of its phases; `sent` is set once the governor lets it out."""
+    timing = RequestTiming(path, hedge)
+    try:
+        async with governor.aslot(path):
+            timing.mark("wait")
+            if sent is not None:
+                sent.set()
+            body = TimedBody(JSONBodyStream(data), timing)
+            request = client.build_request(
+                "POST",
+                path,
+                content=body.achunks(),
+                headers={'api_token': api_key, 'Content-Length': str(len(body))},
+                **kwargs
+            )
+            response = await client.send(request, stream=True)
+            timing.mark("server")
+            try:
+                content = await response.aread()
+            finally:
+                await response.aclose()
+            timing.mark("download")
+    except httpx.HTTPError as e:
+        timing.error = type(e).__name__
+        observe(timing)
+        raise
+
+    timing.status = response.status_code
+    timing.bytes_received = len(content)
+    if response.is_success:
+        record_latency(path, timing.total - timing.phases["wait"])
+    return response, timing
+
+async def _apost_hedged(
+    client,
+    path: str,
+    api_key: str,
+    data: Dict[str, Any],
+    governor: Governor,
+    kwargs: Dict[str, Any],
+    policy: RetryPolicy
+):
+    """
+    Awaitable counterpart of :func:`services.client._post_hedged`; the loser is cancelled.
+
+    As in the sync client, the hedge delay starts once the original request
+    is sent, not while it waits for a governor slot.
+    """
+    sent = asyncio.Event()
+    primary = asyncio.ensure_future(_apost_once(client, path, api_key, data, governor, kwargs, sent=sent))
+    sending = asyncio.ensure_future(sent.wait())
+    tasks = {primary, sending}
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        sending.cancel()
+        tasks.discard(sending)
+        done, _ = await asyncio.wait(tasks, timeout=hedge_delay(path, policy))
+        if done:
+            return primary.result()
+
+        count(path, "hedges")
+        hedge = asyncio.ensure_future(_apost_once(client, path, api_key, data, governor, kwargs, True))
+        tasks.add(hedge)
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    status = task.result()[0].status_code
+                    if status not in policy.retry_statuses and status not in THROTTLE_STATUSES:
+                        if task is hedge:
+                            count(path, "hedge_wins")
+                        return task.result()
+
+        # Neither answer is usable; hand one to the retry loop
+        return primary.result() if primary.exception() is None else hedge.result()
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+def _is_retryable_error(error: Exception, policy: RetryPolicy) -> bool:
+    if not isinstance(error, httpx.TransportError):
+        return False
+    if isinstance(error, (httpx.ConnectTimeout, httpx.PoolTimeout)):
+        return True  # Never reached the server
+    if isinstance(error, httpx.TimeoutException):
+        # A read timeout may mean the request was processed (and billed)
+        return policy.retry_on_timeout
+    return True
+
+async def _asend_json(path: str, api_key: str, data: Dict[str, Any], timeout: Optional[Timeout]) -> Dict[str, Any]:
+    """Send one logical request, with throttling, retries and hedging."""
+    client = get_async_client()
+    governor = get_governor(api_key)
+    policy = get_retry_policy(path)
+    count(path, "requests")
+
+    kwargs = {}
+    if timeout is not None:
+        kwargs['timeout'] = _to_httpx_timeout(timeout)
+
+    attempt = throttled = 0
+    while True:
+        attempt += 1
+        try:
+            if policy.hedging:
+                response, timing = await _apost_hedged(client, path, api_key, data, governor, kwargs, policy)
+            else:
+                response, timing = await _apost_once(client, path, api_key, data, governor, kwargs)
+        except httpx.HTTPError as e:
+            if not _is_retryable_error(e, policy) or attempt >= policy.max_attempts:
+                raise
+            delay = policy.delay(attempt)
+            print(f"Request to {path} failed ({str(e)}), retrying in {delay:.1f}s")
+        else:
+            throttle = governor.record(response.status_code, parse_retry_after(response.headers.get('Retry-After')))
+            if throttle is not None:
+                if throttled >= DEFAULT_THROTTLE_RETRIES:
+                    break
+                throttled += 1
+                attempt -= 1
+                observe(timing)
+                count(path, "retries")
+                # The governor holds the next attempt back for the pause
+                print(f"Throttled by {path} ({response.status_code}), retrying in {throttle:.1f}s")
+                continue
+            if response.status_code not in policy.retry_statuses or attempt >= policy.max_attempts:
+                break
+            observe(timing)
+            delay = policy.delay(attempt)
+            print(f"Request to {path} returned {response.status_code}, retrying in {delay:.1f}s")
+        count(path, "retries")
+        await asyncio.sleep(delay)
+    try:
+        response.raise_for_status()
+        result = response.json()
+        timing.mark("decode")
+    finally:
+        observe(timing)
+    return result
+
+async def apost_json(
+    path: str,
+    api_key: str,
+    data: Dict[str, Any],
+    timeout: Optional[Timeout] = None,
+    cache: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Awaitable counterpart of :func:`services.client.post_json`.
+
+    All API keys share one connection pool; the key is sent per request.
+    Single-flight de-duplication, throttling, retries and hedging behave as
+    in the sync client.
+
+    Args:
+        path: Endpoint path, e.g. "/v1/product/packshot"
+        api_key: Bria AI API key
+        data: JSON request body; bytes values are sent as base64 strings
+        timeout: Optional override of the default timeout
+        cache: Whether to read and store the response in the result cache;
+            by default only reproducible requests are (see is_cacheable),
+            True also caches seedless generations
+
+    Returns:
+        Dict containing the API response
+    """
+    use_cache = cache is not False and is_cacheable(path, data, opt_in=bool(cache))
+    result_cache = get_result_cache() if use_cache else None
+    cache_key = make_cache_key(path, data, api_key)
+    if result_cache is not None:
+        cached = await asyncio.to_thread(result_cache.get_json, cache_key)
+        if cached is not None:
+            increment("cache_hits", path=path)
+            return cached
+
+    async def call() -> Dict[str, Any]:
+        result = await _asend_json(path, api_key, data, timeout)
+        if result_cache is not None:
+            await asyncio.to_thread(result_cache.put_json, cache_key, result)
+        return result
+
+    flight = get_single_flight()
+    if flight is None:
+        return await call()
+    return await flight.ado(cache_key, call)
+
+__all__ = ['get_async_client', 'aclose', 'apost_json']
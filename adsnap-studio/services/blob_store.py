@@ -0,0 +1,172 @@
+from typing import Dict, Iterable, List, Optional
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import hashlib
+import os
+import threading
+from .cache import DiskCache, DEFAULT_CACHE_DIR
+from .client import get_download_session, get_timeout
+
+DEFAULT_BLOB_MAX_BYTES = int(os.getenv("BRIA_BLOB_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+DEFAULT_BLOB_TTL = float(os.getenv("BRIA_BLOB_TTL", str(7 * 24 * 60 * 60)))
+DEFAULT_BLOB_MEMORY_BYTES = int(os.getenv("BRIA_BLOB_MEMORY_BYTES", str(64 * 1024 * 1024)))
+DEFAULT_DOWNLOAD_WORKERS = int(os.getenv("BRIA_DOWNLOAD_WORKERS", "8"))
+CHUNK_SIZE = 256 * 1024
+
+class BlobStore:
+    """
+    Local copy of result images, keyed by URL.
+
+    Each URL is downloaded once, streamed straight to disk, and then served
+    from a small in-memory LRU or the on-disk store on later reruns. The
+    images of a multi-image result are fetched concurrently on a shared pool.
+
+    Args:
+        root: Directory of the on-disk store
+        max_bytes: Size budget of the on-disk store
+        ttl: Seconds a downloaded image is kept
+        memory_bytes: Size budget of the in-memory LRU
+        download_workers: Concurrent downloads of prefetch and fetch_many
+    """
+
+    def __init__(
+        self,
+        root: str,
+        max_bytes: int = DEFAULT_BLOB_MAX_BYTES,
+        ttl: Optional[float] = DEFAULT_BLOB_TTL,
+        memory_bytes: int = DEFAULT_BLOB_MEMORY_BYTES,
+        download_workers: int = DEFAULT_DOWNLOAD_WORKERS
+    ):
+        self.disk = DiskCache(root, max_bytes=max_bytes, ttl=ttl)
+        self.memory_bytes = memory_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_size = 0
+        self._lock = threading.Lock()
+        self._url_locks: Dict[str, threading.Lock] = {}
+        self.download_workers = download_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if len(data) > self.memory_bytes:
+            return
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return
+            self._memory[key] = data
+            self._memory_size += len(data)
+            while self._memory_size > self.memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_size -= len(evicted)
+
+    def _url_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._url_locks.setdefault(key, threading.Lock())
+
+    def fetch(self, url: str) -> str:
+        """
+        Make sure a URL is stored on disk and return its local path.
+
+        Concurrent callers for the same URL share a single download.
+
+        Raises:
+            requests.HTTPError if the download fails
+        """
+        key = self.key_for(url)
+        path = self.disk.lookup(key)
+        if path is not None:
+            return path
+
+        with self._url_lock(key):
+            path = self.disk.lookup(key)
+            if path is not None:
+                return path
+
+            temp_path = self.disk.temp_path(key)
+            try:
+                with get_download_session().get(url, stream=True, timeout=get_timeout()) as response:
+                    response.raise_for_status()
+                    with open(temp_path, "wb") as f:
+                        for chunk in response.iter_content(CHUNK_SIZE):
+                            f.write(chunk)
+                return self.disk.commit(key, temp_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                with self._lock:
+                    self._url_locks.pop(key, None)
+
+    def get_bytes(self, url: str) -> bytes:
+        """Return the bytes of a URL, downloading it on first use."""
+        key = self.key_for(url)
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data
+
+        try:
+            with open(self.fetch(url), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            # Evicted between lookup and read; download it again
+            with open(self.fetch(url), "rb") as f:
+                data = f.read()
+        self._remember(key, data)
+        return data
+
+    def get_path(self, url: str) -> str:
+        """Return a local file path for a URL, downloading it on first use."""
+        return self.fetch(url)
+
+    def prefetch(self, urls: Iterable[str]) -> List[Future]:
+        """
+        Start downloading URLs in the background and return their futures.
+
+        Each future resolves to the local path, or raises the download
+        error. URLs already on disk resolve immediately.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.download_workers,
+                                                    thread_name_prefix="bria-download")
+            executor = self._executor
+        return [executor.submit(self.fetch, url) for url in urls]
+
+    def fetch_many(self, urls: List[str]) -> List[Optional[str]]:
+        """Download URLs concurrently and return their local paths, None for failures."""
+        paths = []
+        for future in self.prefetch(urls):
+            try:
+                paths.append(future.result())
+            except Exception:
+                paths.append(None)
+        return paths
+
+    def get_many(self, urls: List[str]) -> List[Optional[bytes]]:
+        """Return the bytes of every URL, downloading the missing ones concurrently; None for failures."""
+        contents = []
+        for url, path in zip(urls, self.fetch_many(urls)):
+            try:
+                contents.append(self.get_bytes(url) if path else None)
+            except Exception:
+                contents.append(None)
+        return contents
+
+_blob_store: Optional[BlobStore] = None
+_blob_store_lock = threading.Lock()
+
+def get_blob_store() -> BlobStore:
+    """Return the process-wide blob store shared by all tabs and sessions."""
+    global _blob_store
+    if _blob_store is None:
+        with _blob_store_lock:
+            if _blob_store is None:
+                _blob_store = BlobStore(os.path.join(DEFAULT_CACHE_DIR, "blobs"))
+    return _blob_store
+
+__all__ = ['BlobStore', 'get_blob_store']
@@ -0,0 +1,215 @@
+from typing import Dict, Any, Iterator, Optional
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+DEFAULT_CACHE_DIR = os.getenv(
+    "BRIA_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "adsnap")
+)
+DEFAULT_CACHE_MAX_BYTES = int(os.getenv("BRIA_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+DEFAULT_CACHE_TTL = float(os.getenv("BRIA_CACHE_TTL", str(24 * 60 * 60)))
+CACHE_ENABLED = os.getenv("BRIA_CACHE", "1").lower() not in ("0", "false", "no", "off")
+# Endpoints that return a new image per call unless given a seed
+SEEDED_PATHS = ("/v1/text-to-image/", "/v1/gen_fill")
+
+class DiskCache:
+    """
+    Key/value store of blob files with an SQLite index.
+
+    Entries expire after `ttl` seconds and the least recently used ones are
+    evicted once the blobs exceed `max_bytes`. Safe to share between threads
+    and processes pointing at the same directory.
+
+    Args:
+        root: Directory holding the index and blob files
+        max_bytes: Size budget for all blobs
+        ttl: Seconds an entry stays valid (None keeps entries until evicted)
+    """
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES, ttl: Optional[float] = DEFAULT_CACHE_TTL):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, "blobs"), exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " size INTEGER NOT NULL,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(os.path.join(self.root, "index.sqlite"), timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def path_for(self, key: str) -> str:
+        """Return the blob file path of a key (which may not exist yet)."""
+        return os.path.join(self.root, "blobs", key[:2], key)
+
+    def _is_expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Return the blob path of a live entry and mark it as recently used."""
+        now = time.time()
+        with self._lock, self._connect() as db:
+            row = db.execute("SELECT created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            path = self.path_for(key)
+            if self._is_expired(row[0], now) or not os.path.exists(path):
+                db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._remove_file(path)
+                return None
+            db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        return path
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the bytes stored under a key, or None on a miss."""
+        path = self.lookup(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def temp_path(self, key: str) -> str:
+        """Return a unique scratch path next to the blob, for streaming writes."""
+        os.makedirs(os.path.dirname(self.path_for(key)), exist_ok=True)
+        return f"{self.path_for(key)}.{uuid.uuid4().hex}.tmp"
+
+    def commit(self, key: str, temp_path: str) -> str:
+        """Move a fully written scratch file into place and index it."""
+        path = self.path_for(key)
+        os.replace(temp_path, path)
+        size = os.path.getsize(path)
+        now = time.time()
+        with self._lock, self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO entries (key, size, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, size, now, now)
+            )
+            self._evict(db, now)
+        return path
+
+    def put(self, key: str, data: bytes) -> str:
+        """Store bytes under a key and return the blob path."""
+        temp_path = self.temp_path(key)
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        return self.commit(key, temp_path)
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._connect() as db:
+            db.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._remove_file(self.path_for(key))
+
+    def _evict(self, db: sqlite3.Connection, now: float) -> None:
+        if self.ttl is not None:
+            for (key,) in db.execute("SELECT key FROM entries WHERE created < ?", (now - self.ttl,)).fetchall():
+                db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._remove_file(self.path_for(key))
+
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in db.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+            db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._remove_file(self.path_for(key))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def _normalize(value: Any) -> Any:
+    """Replace raw bytes with their digest so payloads hash the same however images are passed."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"sha256": hashlib.sha256(value).hexdigest()}
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+def make_cache_key(path: str, data: Dict[str, Any], api_key: Optional[str] = None) -> str:
+    """
+    Hash an endpoint and its request payload (images included) into a cache key.
+
+    With `api_key`, a digest of the key is mixed in so requests made with
+    different keys never share a response, an error or a bill.
+    """
+    digest = hashlib.sha256(path.encode("utf-8"))
+    digest.update(json.dumps(_normalize(data), sort_keys=True, separators=(",", ":")).encode("utf-8"))
+    if api_key is not None:
+        digest.update(hashlib.sha256(api_key.encode("utf-8")).digest())
+    return digest.hexdigest()
+
+def is_cacheable(path: str, data: Dict[str, Any], opt_in: bool = False) -> bool:
+    """
+    Whether a response may be stored in and served from the result cache.
+
+    Async-mode responses (sync false) only hold placeholder URLs that may
+    never render, so they are never cached. Seedless generation requests
+    ask for a new image every time and are only cached when `opt_in` is set.
+    """
+    if data.get("sync") is False:
+        return False
+    if path.startswith(SEEDED_PATHS) and data.get("seed") is None:
+        return opt_in
+    return True
+
+class ResultCache(DiskCache):
+    """DiskCache of JSON API responses keyed by :func:`make_cache_key`."""
+
+    def get_json(self, key: str) -> Optional[Dict[str, Any]]:
+        data = self.get(key)
+        if data is None:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            self.delete(key)
+            return None
+
+    def put_json(self, key: str, value: Dict[str, Any]) -> None:
+        self.put(key, json.dumps(value).encode("utf-8"))
+
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Return the shared service result cache, or None when BRIA_CACHE is off."""
+    global _result_cache
+    if not CACHE_ENABLED:
+        return None
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                _result_cache = ResultCache(os.path.join(DEFAULT_CACHE_DIR, "results"))
+    return _result_cache
+
+__all__ = ['DiskCache', 'ResultCache', 'is_cacheable', 'make_cache_key', 'get_result_cache']
@@ -0,0 +1,343 @@
+from typing import Callable, Dict, Any, Optional, Tuple, Union
+import os
+import queue
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from .cache import get_result_cache, is_cacheable, make_cache_key
+from .json_body import JSONBodyStream
+from .metrics import RequestTiming, TimedBody, increment, observe
+from .rate_limit import DEFAULT_THROTTLE_RETRIES, THROTTLE_STATUSES, Governor, get_governor, parse_retry_after
+from .retry import RetryPolicy, count, get_retry_policy, hedge_delay, record_latency
+from .single_flight import get_single_flight
+
+# Point BRIA_API_BASE_URL at benchmarks/mock_bria.py to run without the paid API
+BASE_URL = os.getenv("BRIA_API_BASE_URL", "https://engine.prod.bria-api.com").rstrip("/")
+
+# (connect, read) timeout in seconds; every call gets one so a hung request
+# can never block a Streamlit worker indefinitely.
+DEFAULT_TIMEOUT: Tuple[float, float] = (
+    float(os.getenv("BRIA_CONNECT_TIMEOUT", "5")),
+    float(os.getenv("BRIA_READ_TIMEOUT", "120"))
+)
+DEFAULT_POOL_CONNECTIONS = int(os.getenv("BRIA_POOL_CONNECTIONS", "4"))
+DEFAULT_POOL_MAXSIZE = int(os.getenv("BRIA_POOL_MAXSIZE", "16"))
+
+Timeout = Union[float, Tuple[float, float]]
+
+_config = {
+    'timeout': DEFAULT_TIMEOUT,
+    'pool_connections': DEFAULT_POOL_CONNECTIONS,
+    'pool_maxsize': DEFAULT_POOL_MAXSIZE
+}
+_sessions: Dict[str, requests.Session] = {}
+_download_session: Optional[requests.Session] = None
+_lock = threading.Lock()
+
+def configure(
+    timeout: Optional[Timeout] = None,
+    pool_connections: Optional[int] = None,
+    pool_maxsize: Optional[int] = None
+) -> None:
+    """
+    Change client settings for all services.
+
+    Pool sizes only apply to sessions created afterwards, so existing
+    sessions are closed and rebuilt lazily on the next request.
+
+    Args:
+        timeout: Default timeout in seconds, or a (connect, read) tuple
+        pool_connections: Number of host pools kept per session
+        pool_maxsize: Maximum keep-alive connections per host pool
+    """
+    if timeout is not None:
+        _config['timeout'] = timeout
+    if pool_connections is not None or pool_maxsize is not None:
+        if pool_connections is not None:
+            _config['pool_connections'] = pool_connections
+        if pool_maxsize is not None:
+            _config['pool_maxsize'] = pool_maxsize
+        close_sessions()
+
+def get_timeout() -> Timeout:
+    """Return the default timeout applied to every request."""
+    return _config['timeout']
+
+def get_session(api_key: str) -> requests.Session:
+    """Return the keep-alive session for an API key, creating it on first use."""
+    session = _sessions.get(api_key)
+    if session is not None:
+        return session
+
+    with _lock:
+        session = _sessions.get(api_key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=_config['pool_connections'],
+                pool_maxsize=_config['pool_maxsize']
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update({
+                'api_token': api_key,
+                'Accept': 'application/json',
+                'Content-Type': 'application/json'
+            })
+            _sessions[api_key] = session
+        return session
+
+def get_download_session() -> requests.Session:
+    """Return the keep-alive session used to fetch result images (no API token attached)."""
+    global _download_session
+    if _download_session is not None:
+        return _download_session
+
+    with _lock:
+        if _download_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=_config['pool_connections'],
+                pool_maxsize=_config['pool_maxsize']
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _download_session = session
+        return _download_session
+
+def close_sessions() -> None:
+    """Close every pooled session."""
+    global _download_session
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+        if _download_session is not None:
+            sessions.append(_download_session)
+            _download_session = None
+    for session in sessions:
+        session.close()
+
+def _post_once(
+    session: requests.Session,
+    path: str,
+    data: Dict[str, Any],
+    timeout: Timeout,
+    governor: Governor,
+    hedge: bool = False,
+    on_sent: Optional[Callable[[], None]] = None
+) -> Tuple[requests.Response, RequestTiming]:
+    """
+    Make one HTTP attempt, timing each of its phases.
+
+    `on_sent` is called once the governor lets the request go out.
+    """
+    timing = RequestTiming(path, hedge)
+    try:
+        with governor.slot(path):
+            timing.mark("wait")
+            if on_sent is not None:
+                on_sent()
+            # The body is a one-shot stream, so every attempt builds its own
+            body = TimedBody(JSONBodyStream(data), timing)
+            response = session.post(f"{BASE_URL}{path}", data=body, timeout=timeout, stream=True)
+            timing.mark("server")
+            content = response.content
+            timing.mark("download")
+    except requests.RequestException as e:
+        timing.error = type(e).__name__
+        observe(timing)
+        raise
+
+    timing.status = response.status_code
+    timing.bytes_received = len(content)
+    if response.ok:
+        record_latency(path, timing.total - timing.phases["wait"])
+    return response, timing
+
+def _post_hedged(
+    session: requests.Session,
+    path: str,
+    data: Dict[str, Any],
+    timeout: Timeout,
+    governor: Governor,
+    policy: RetryPolicy
+) -> Tuple[requests.Response, RequestTiming]:
+    """
+    Send a request and, if it is slower than usual, a duplicate; keep the first good answer.
+
+    The hedge delay counts from the moment the governor lets the original
+    request out, so time spent queued for a slot or in a throttle pause never
+    triggers a hedge. Each attempt gets its own thread, so neither waits
+    for a free worker either.
+    """
+    sent = threading.Event()
+    settled = threading.Event()
+    lock = threading.Lock()
+    outcomes: "queue.Queue[Tuple[bool, Any, Optional[BaseException]]]" = queue.Queue()
+
+    def discard(result: Any) -> None:
+        if result is not None:
+            result[0].close()
+            observe(result[1])
+
+    def attempt(hedge: bool) -> None:
+        try:
+            outcome = (hedge, _post_once(session, path, data, timeout, governor, hedge, None if hedge else sent.set), None)
+        except Exception as e:
+            outcome = (hedge, None, e)
+        finally:
+            sent.set()
+        with lock:
+            if not settled.is_set():
+                outcomes.put(outcome)
+                return
+        # The loser cannot be interrupted; drop its response when it lands
+        discard(outcome[1])
+
+    def settle(winner: Tuple[bool, Any, Optional[BaseException]], losers=()) -> Tuple[requests.Response, RequestTiming]:
+        with lock:
+            settled.set()
+        for _, result, _ in losers:
+            discard(result)
+        _, result, error = winner
+        if error is not None:
+            raise error
+        return result
+
+    def usable(outcome: Tuple[bool, Any, Optional[BaseException]]) -> bool:
+        _, result, error = outcome
+        if error is not None:
+            return False
+        status = result[0].status_code
+        return status not in policy.retry_statuses and status not in THROTTLE_STATUSES
+
+    threading.Thread(target=attempt, args=(False,), name="bria-request", daemon=True).start()
+    sent.wait()
+    try:
+        return settle(outcomes.get(timeout=hedge_delay(path, policy)))
+    except queue.Empty:
+        pass
+
+    count(path, "hedges")
+    threading.Thread(target=attempt, args=(True,), name="bria-hedge", daemon=True).start()
+    first = outcomes.get()
+    if usable(first):
+        if first[0]:
+            count(path, "hedge_wins")
+        return settle(first)
+    second = outcomes.get()
+    if usable(second):
+        if second[0]:
+            count(path, "hedge_wins")
+        return settle(second, [first])
+
+    # Neither answer is usable; hand one to the retry loop
+    primary, hedge = (first, second) if not first[0] else (second, first)
+    if primary[2] is None:
+        return settle(primary, [hedge])
+    return settle(hedge, [primary])
+
+def _send_json(path: str, api_key: str, data: Dict[str, Any], timeout: Optional[Timeout]) -> Dict[str, Any]:
+    """Send one logical request, with throttling, retries and hedging."""
+    session = get_session(api_key)
+    governor = get_governor(api_key)
+    policy = get_retry_policy(path)
+    timeout = timeout or get_timeout()
+    count(path, "requests")
+
+    attempt = throttled = 0
+    while True:
+        attempt += 1
+        try:
+            if policy.hedging:
+                response, timing = _post_hedged(session, path, data, timeout, governor, policy)
+            else:
+                response, timing = _post_once(session, path, data, timeout, governor)
+        except requests.RequestException as e:
+            # A read timeout may mean the request was processed (and billed)
+            retryable = isinstance(e, requests.ConnectionError) or (
+                policy.retry_on_timeout and isinstance(e, requests.Timeout)
+            )
+            if not retryable or attempt >= policy.max_attempts:
+                raise
+            delay = policy.delay(attempt)
+            print(f"Request to {path} failed ({str(e)}), retrying in {delay:.1f}s")
+        else:
+            throttle = governor.record(response.status_code, parse_retry_after(response.headers.get('Retry-After')))
+            if throttle is not None:
+                if throttled >= DEFAULT_THROTTLE_RETRIES:
+                    break
+                throttled += 1
+                attempt -= 1
+                observe(timing)
+                count(path, "retries")
+                # The governor holds the next attempt back for the pause
+                print(f"Throttled by {path} ({response.status_code}), retrying in {throttle:.1f}s")
+                continue
+            if response.status_code not in policy.retry_statuses or attempt >= policy.max_attempts:
+                break
+            observe(timing)
+            delay = policy.delay(attempt)
+            print(f"Request to {path} returned {response.status_code}, retrying in {delay:.1f}s")
+        count(path, "retries")
+        time.sleep(delay)
+    try:
+        response.raise_for_status()
+        result = response.json()
+        timing.mark("decode")
+    finally:
+        observe(timing)
+    return result
+
+def post_json(
+    path: str,
+    api_key: str,
+    data: Dict[str, Any],
+    timeout: Optional[Timeout] = None,
+    cache: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    POST a JSON payload to a Bria endpoint over the pooled session.
+
+    Identical reproducible requests (same API key, endpoint, image bytes and
+    parameters) are served from the local result cache, and identical calls
+    made concurrently (by other threads or processes) share one upstream
+    request. Requests go through the API key's governor (rate limit,
+    in-flight caps) and 429/503 responses are retried after the backoff or
+    Retry-After delay they impose. Other failures are retried, and slow
+    requests hedged, according to the endpoint's RetryPolicy.
+
+    Args:
+        path: Endpoint path, e.g. "/v1/product/packshot"
+        api_key: Bria AI API key
+        data: JSON request body; bytes values are sent as base64 strings
+        timeout: Optional override of the default timeout
+        cache: Whether to read and store the response in the result cache;
+            by default only reproducible requests are (see is_cacheable),
+            True also caches seedless generations
+
+    Returns:
+        Dict containing the API response
+    """
+    use_cache = cache is not False and is_cacheable(path, data, opt_in=bool(cache))
+    result_cache = get_result_cache() if use_cache else None
+    cache_key = make_cache_key(path, data, api_key)
+    if result_cache is not None:
+        cached = result_cache.get_json(cache_key)
+        if cached is not None:
+            increment("cache_hits", path=path)
+            return cached
+
+    def call() -> Dict[str, Any]:
+        result = _send_json(path, api_key, data, timeout)
+        if result_cache is not None:
+            result_cache.put_json(cache_key, result)
+        return result
+
+    flight = get_single_flight()
+    if flight is None:
+        return call()
+    return flight.do(cache_key, call)
+
+__all__ = ['configure', 'get_timeout', 'get_session', 'get_download_session', 'close_sessions', 'post_json']
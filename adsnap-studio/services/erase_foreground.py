@@ -1,6 +1,30 @@
 from typing import Dict, Any, Optional
-import requests
-import base64
+from .client import post_json
+from .async_client import apost_json
+from .preprocess import prepare_upload
+
+ERASE_FOREGROUND_PATH = "/v1/erase_foreground"
+
+def _build_erase_foreground_payload(
+    image_data: bytes = None,
+    image_url: str = None,
+    content_moderation: bool = False
+) -> Dict[str, Any]:
+    """Build the request body shared by the sync and async variants."""
+    # Prepare request data
+    data = {
+        'content_moderation': content_moderation
+    }
+
+    # Add image data; bytes are base64-encoded while the body is sent
+    if image_url:
+        data['image_url'] = image_url
+    elif image_data:
+        data['file'] = prepare_upload(image_data, "erase_foreground")
+    else:
+        raise ValueError("Either image_data or image_url must be provided")
+
+    return data
 
 def erase_foreground(
     api_key: str,
@@ -10,48 +34,36 @@ def erase_foreground(
 ) -> Dict[str, Any]:
     """
     Erase the foreground from an image and generate the area behind it.
-    
+
     Args:
         api_key: Bria AI API key
         image_data: Image data in bytes (optional if image_url provided)
         image_url: URL of the image (optional if image_data provided)
         content_moderation: Whether to enable content moderation
     """
-    url = "https://engine.prod.bria-api.com/v1/erase_foreground"
-    
-    headers = {
-        'api_token': api_key,
-        'Accept': 'application/json',
-        'Content-Type': 'application/json'
-    }
-    
-    # Prepare request data
-    data = {
-        'content_moderation': content_moderation
-    }
-    
-    # Add image data
-    if image_url:
-        data['image_url'] = image_url
-    elif image_data:
-        data['file'] = base64.b64encode(image_data).decode('utf-8')
-    else:
-        raise ValueError("Either image_data or image_url must be provided")
-    
+    data = _build_erase_foreground_payload(
+        image_data=image_data,
+        image_url=image_url,
+        content_moderation=content_moderation
+    )
+
+    try:
+        return post_json(ERASE_FOREGROUND_PATH, api_key, data)
+    except Exception as e:
+        raise Exception(f"Erase foreground failed: {str(e)}")
+
+async def erase_foreground_async(api_key: str, image_data: bytes = None, **kwargs) -> Dict[str, Any]:
+    """
+    Awaitable variant of :func:`erase_foreground`.
+
+    Accepts the same keyword arguments and shares one async connection pool.
+    """
+    data = _build_erase_foreground_payload(image_data, **kwargs)
+
     try:
-        print(f"Making request to: {url}")
-        print(f"Headers: {headers}")
-        print(f"Data: {data}")
-        
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text}")
-        
-        return response.json()
+        return await apost_json(ERASE_FOREGROUND_PATH, api_key, data)
     except Exception as e:
         raise Exception(f"Erase foreground failed: {str(e)}")
 
 # Export the function
-__all__ = ['erase_foreground'] 
\ No newline at end of file
+__all__ = ['erase_foreground', 'erase_foreground_async']
@@ -1,6 +1,43 @@
 from typing import Dict, Any, Optional
-import requests
-import base64
+from .client import post_json
+from .async_client import apost_json
+from .preprocess import prepare_image_and_mask
+
+GEN_FILL_PATH = "/v1/gen_fill"
+
+def _build_generative_fill_payload(
+    image_data: bytes,
+    mask_data: bytes,
+    prompt: str,
+    negative_prompt: Optional[str] = None,
+    num_results: int = 4,
+    sync: bool = False,
+    seed: Optional[int] = None,
+    content_moderation: bool = False,
+    mask_type: str = "manual"
+) -> Dict[str, Any]:
+    """Build the request body shared by the sync and async variants."""
+    # Downscale the image and keep the mask at the same dimensions
+    image_data, mask_data = prepare_image_and_mask(image_data, mask_data)
+
+    # Prepare request data; image bytes are base64-encoded while the body is sent
+    data = {
+        'file': image_data,
+        'mask_file': mask_data,
+        'mask_type': mask_type,
+        'prompt': prompt,
+        'num_results': num_results,
+        'sync': sync,
+        'content_moderation': content_moderation
+    }
+
+    # Add optional parameters
+    if negative_prompt:
+        data['negative_prompt'] = negative_prompt
+    if seed is not None:
+        data['seed'] = seed
+
+    return data
 
 def generative_fill(
     api_key: str,
@@ -16,7 +53,7 @@ def generative_fill(
 ) -> Dict[str, Any]:
     """
     Generate content in a masked area of an image using a text prompt.
-    
+
     Args:
         api_key: Bria AI API key
         image_data: Image data in bytes
@@ -29,46 +66,38 @@ def generative_fill(
         content_moderation: Whether to enable content moderation
         mask_type: Type of mask ('manual' or 'automatic')
     """
-    url = "https://engine.prod.bria-api.com/v1/gen_fill"
-    
-    headers = {
-        'api_token': api_key,
-        'Accept': 'application/json',
-        'Content-Type': 'application/json'
-    }
-    
-    # Convert image and mask to base64
-    image_base64 = base64.b64encode(image_data).decode('utf-8')
-    mask_base64 = base64.b64encode(mask_data).decode('utf-8')
-    
-    # Prepare request data
-    data = {
-        'file': image_base64,
-        'mask_file': mask_base64,
-        'mask_type': mask_type,
-        'prompt': prompt,
-        'num_results': num_results,
-        'sync': sync,
-        'content_moderation': content_moderation
-    }
-    
-    # Add optional parameters
-    if negative_prompt:
-        data['negative_prompt'] = negative_prompt
-    if seed is not None:
-        data['seed'] = seed
-    
+    data = _build_generative_fill_payload(
+        image_data,
+        mask_data,
+        prompt,
+        negative_prompt=negative_prompt,
+        num_results=num_results,
+        sync=sync,
+        seed=seed,
+        content_moderation=content_moderation,
+        mask_type=mask_type
+    )
+
+    try:
+        return post_json(GEN_FILL_PATH, api_key, data)
+    except Exception as e:
+        raise Exception(f"Generative fill failed: {str(e)}")
+
+async def generative_fill_async(
+    api_key: str,
+    image_data: bytes,
+    mask_data: bytes,
+    prompt: str,
+    **kwargs
+) -> Dict[str, Any]:
+    """
+    Awaitable variant of :func:`generative_fill`.
+
+    Accepts the same keyword arguments and shares one async connection pool.
+    """
+    data = _build_generative_fill_payload(image_data, mask_data, prompt, **kwargs)
+
     try:
-        print(f"Making request to: {url}")
-        print(f"Headers: {headers}")
-        print(f"Data: {data}")
-        
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text}")
-        
-        return response.json()
+        return await apost_json(GEN_FILL_PATH, api_key, data)
     except Exception as e:
-        raise Exception(f"Generative fill failed: {str(e)}") 
\ No newline at end of file
+        raise Exception(f"Generative fill failed: {str(e)}")
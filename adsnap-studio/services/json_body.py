@@ -0,0 +1,69 @@
+from typing import Any, AsyncIterator, Dict, Iterator, List, Union
+import binascii
+import json
+
+# Raw bytes encoded per chunk; a multiple of 3 so chunks concatenate into
+# valid base64 without padding in the middle.
+RAW_CHUNK_SIZE = 3 * 16 * 1024
+
+BinaryLike = (bytes, bytearray, memoryview)
+
+class JSONBodyStream:
+    """
+    JSON request body that base64-encodes binary fields while it is sent.
+
+    Payload values that are bytes are written as base64 JSON strings chunk by
+    chunk, so neither the base64 text nor the full JSON document ever exists
+    in memory. The total length is known upfront, so requests and httpx send
+    it with a Content-Length header rather than chunked encoding.
+
+    Iterate it once per request; build a new one to resend the payload.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self._parts: List[Union[bytes, memoryview]] = []
+        self._length = 0
+
+        self._add(b"{")
+        for index, (key, value) in enumerate(data.items()):
+            if index:
+                self._add(b", ")
+            self._add(json.dumps(str(key)).encode("utf-8") + b": ")
+            if isinstance(value, BinaryLike):
+                raw = memoryview(value).cast("B")
+                self._add(b'"')
+                self._parts.append(raw)
+                self._length += 4 * ((len(raw) + 2) // 3)
+                self._add(b'"')
+            else:
+                self._add(json.dumps(value).encode("utf-8"))
+        self._add(b"}")
+
+    def _add(self, fragment: bytes) -> None:
+        if self._parts and isinstance(self._parts[-1], bytes):
+            self._parts[-1] += fragment
+        else:
+            self._parts.append(fragment)
+        self._length += len(fragment)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[bytes]:
+        for part in self._parts:
+            if isinstance(part, bytes):
+                yield part
+                continue
+            for start in range(0, len(part), RAW_CHUNK_SIZE):
+                yield binascii.b2a_base64(part[start:start + RAW_CHUNK_SIZE], newline=False)
+
+    async def achunks(self) -> AsyncIterator[bytes]:
+        """Async iterator over the body, as httpx.AsyncClient requires for streaming."""
+        for chunk in self:
+            yield chunk
+
+def payload_size(data: Dict[str, Any]) -> int:
+    """Return the number of bytes the JSON body of a payload takes on the wire."""
+    return len(JSONBodyStream(data))
+
+__all__ = ['JSONBodyStream', 'payload_size']
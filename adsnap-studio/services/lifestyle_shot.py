@@ -1,10 +1,163 @@
-from typing import Dict, Any, Optional, List
-import requests
-import base64
+from typing import Dict, Any, AsyncIterator, Iterator, Optional, List, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+import time
+from .client import post_json
+from .async_client import apost_json
+from .preprocess import prepare_image, prepare_upload
+
+LIFESTYLE_TEXT_PATH = "/v1/product/lifestyle_shot_by_text"
+LIFESTYLE_IMAGE_PATH = "/v1/product/lifestyle_shot_by_image"
+
+def _add_placement_fields(
+    data: Dict[str, Any],
+    placement_type: str,
+    shot_size: List[int],
+    manual_placement_selection: List[str],
+    padding_values: List[int],
+    foreground_image_size: Optional[List[int]],
+    foreground_image_location: Optional[List[int]],
+    sku: Optional[str]
+) -> None:
+    """Add the placement-dependent parameters common to both lifestyle endpoints."""
+    if placement_type in ['automatic', 'manual_placement', 'custom_coordinates']:
+        data['shot_size'] = shot_size
+
+    if placement_type == 'manual_placement':
+        data['manual_placement_selection'] = manual_placement_selection
+
+    if placement_type == 'manual_padding':
+        data['padding_values'] = padding_values
+
+    if placement_type == 'custom_coordinates':
+        if foreground_image_size:
+            data['foreground_image_size'] = foreground_image_size
+        if foreground_image_location:
+            data['foreground_image_location'] = foreground_image_location
+
+    if sku:
+        data['sku'] = sku
+
+def _prepare_product_image(image_data: bytes, original_quality: bool) -> bytes:
+    """Normalize the product image, keeping its resolution when original quality is requested."""
+    if original_quality:
+        return prepare_image(image_data)[0]
+    return prepare_upload(image_data, "lifestyle")
+
+def _add_product_image(
+    data: Dict[str, Any],
+    image_data: Optional[bytes],
+    image_url: Optional[str],
+    original_quality: bool
+) -> None:
+    """Add the product image by URL, or as bytes base64-encoded while the body is sent."""
+    if image_url:
+        data['image_url'] = image_url
+    elif image_data:
+        data['file'] = _prepare_product_image(image_data, original_quality)
+    else:
+        raise ValueError("Either image_data or image_url must be provided")
+
+def _build_lifestyle_text_payload(
+    image_data: Optional[bytes],
+    scene_description: str,
+    placement_type: str = "original",
+    num_results: int = 4,
+    sync: bool = False,
+    fast: bool = True,
+    optimize_description: bool = True,
+    original_quality: bool = False,
+    exclude_elements: Optional[str] = None,
+    shot_size: List[int] = [1000, 1000],
+    manual_placement_selection: List[str] = ["upper_left"],
+    padding_values: List[int] = [0, 0, 0, 0],
+    foreground_image_size: Optional[List[int]] = None,
+    foreground_image_location: Optional[List[int]] = None,
+    force_rmbg: bool = False,
+    content_moderation: bool = False,
+    sku: Optional[str] = None,
+    image_url: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build the request body shared by the sync and async text variants."""
+    # Prepare request data
+    data = {
+        'scene_description': scene_description,
+        'placement_type': placement_type,
+        'num_results': num_results,
+        'sync': sync,
+        'fast': fast,
+        'optimize_description': optimize_description,
+        'original_quality': original_quality,
+        'force_rmbg': force_rmbg,
+        'content_moderation': content_moderation
+    }
+    _add_product_image(data, image_data, image_url, original_quality)
+
+    # Add optional parameters
+    if exclude_elements and not fast:
+        data['exclude_elements'] = exclude_elements
+
+    _add_placement_fields(
+        data,
+        placement_type,
+        shot_size,
+        manual_placement_selection,
+        padding_values,
+        foreground_image_size,
+        foreground_image_location,
+        sku
+    )
+    return data
+
+def _build_lifestyle_image_payload(
+    image_data: Optional[bytes],
+    reference_image: bytes,
+    placement_type: str = "original",
+    num_results: int = 4,
+    sync: bool = False,
+    original_quality: bool = False,
+    shot_size: List[int] = [1000, 1000],
+    manual_placement_selection: List[str] = ["upper_left"],
+    padding_values: List[int] = [0, 0, 0, 0],
+    foreground_image_size: Optional[List[int]] = None,
+    foreground_image_location: Optional[List[int]] = None,
+    force_rmbg: bool = False,
+    content_moderation: bool = False,
+    sku: Optional[str] = None,
+    enhance_ref_image: bool = True,
+    ref_image_influence: float = 1.0,
+    image_url: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build the request body shared by the sync and async reference-image variants."""
+    # Prepare request data
+    data = {
+        'ref_image_file': prepare_upload(reference_image, "reference"),
+        'placement_type': placement_type,
+        'num_results': num_results,
+        'sync': sync,
+        'original_quality': original_quality,
+        'force_rmbg': force_rmbg,
+        'content_moderation': content_moderation,
+        'enhance_ref_image': enhance_ref_image,
+        'ref_image_influence': ref_image_influence
+    }
+    _add_product_image(data, image_data, image_url, original_quality)
+
+    _add_placement_fields(
+        data,
+        placement_type,
+        shot_size,
+        manual_placement_selection,
+        padding_values,
+        foreground_image_size,
+        foreground_image_location,
+        sku
+    )
+    return data
 
 def lifestyle_shot_by_text(
     api_key: str,
-    image_data: bytes,
+    image_data: Optional[bytes],
     scene_description: str,
     placement_type: str = "original",
     num_results: int = 4,
@@ -20,14 +173,15 @@ def lifestyle_shot_by_text(
     foreground_image_location: Optional[List[int]] = None,
     force_rmbg: bool = False,
     content_moderation: bool = False,
-    sku: Optional[str] = None
+    sku: Optional[str] = None,
+    image_url: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Generate a lifestyle shot using text description.
-    
+
     Args:
         api_key: Bria AI API key
-        image_data: Image data in bytes
+        image_data: Image data in bytes (may be None if image_url provided)
         scene_description: Text description of the new scene
         placement_type: How to position the product ("original", "automatic", "manual_placement", "manual_padding", "custom_coordinates")
         num_results: Number of results to generate
@@ -44,72 +198,37 @@ def lifestyle_shot_by_text(
         force_rmbg: Whether to force background removal
         content_moderation: Whether to enable content moderation
         sku: Optional SKU identifier
+        image_url: URL of the product image, sent instead of image_data
     """
-    url = "https://engine.prod.bria-api.com/v1/product/lifestyle_shot_by_text"
-    
-    headers = {
-        'api_token': api_key,
-        'Accept': 'application/json',
-        'Content-Type': 'application/json'
-    }
-    
-    # Convert image to base64
-    image_base64 = base64.b64encode(image_data).decode('utf-8')
-    
-    # Prepare request data
-    data = {
-        'file': image_base64,
-        'scene_description': scene_description,
-        'placement_type': placement_type,
-        'num_results': num_results,
-        'sync': sync,
-        'fast': fast,
-        'optimize_description': optimize_description,
-        'original_quality': original_quality,
-        'force_rmbg': force_rmbg,
-        'content_moderation': content_moderation
-    }
-    
-    # Add optional parameters
-    if exclude_elements and not fast:
-        data['exclude_elements'] = exclude_elements
-    
-    if placement_type in ['automatic', 'manual_placement', 'custom_coordinates']:
-        data['shot_size'] = shot_size
-    
-    if placement_type == 'manual_placement':
-        data['manual_placement_selection'] = manual_placement_selection
-    
-    if placement_type == 'manual_padding':
-        data['padding_values'] = padding_values
-    
-    if placement_type == 'custom_coordinates':
-        if foreground_image_size:
-            data['foreground_image_size'] = foreground_image_size
-        if foreground_image_location:
-            data['foreground_image_location'] = foreground_image_location
-    
-    if sku:
-        data['sku'] = sku
-    
+    data = _build_lifestyle_text_payload(
+        image_data,
+        scene_description,
+        placement_type=placement_type,
+        num_results=num_results,
+        sync=sync,
+        fast=fast,
+        optimize_description=optimize_description,
+        original_quality=original_quality,
+        exclude_elements=exclude_elements,
+        shot_size=shot_size,
+        manual_placement_selection=manual_placement_selection,
+        padding_values=padding_values,
+        foreground_image_size=foreground_image_size,
+        foreground_image_location=foreground_image_location,
+        force_rmbg=force_rmbg,
+        content_moderation=content_moderation,
+        sku=sku,
+        image_url=image_url
+    )
+
     try:
-        print(f"Making request to: {url}")
-        print(f"Headers: {headers}")
-        print(f"Data: {data}")
-        
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text}")
-        
-        return response.json()
+        return post_json(LIFESTYLE_TEXT_PATH, api_key, data)
     except Exception as e:
         raise Exception(f"Lifestyle shot generation failed: {str(e)}")
 
 def lifestyle_shot_by_image(
     api_key: str,
-    image_data: bytes,
+    image_data: Optional[bytes],
     reference_image: bytes,
     placement_type: str = "original",
     num_results: int = 4,
@@ -124,67 +243,161 @@ def lifestyle_shot_by_image(
     content_moderation: bool = False,
     sku: Optional[str] = None,
     enhance_ref_image: bool = True,
-    ref_image_influence: float = 1.0
+    ref_image_influence: float = 1.0,
+    image_url: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Generate a lifestyle shot using a reference image.
+
+    The product image can be given as image_url instead of image_data.
     """
-    url = "https://engine.prod.bria-api.com/v1/product/lifestyle_shot_by_image"
-    
-    headers = {
-        'api_token': api_key,
-        'Accept': 'application/json',
-        'Content-Type': 'application/json'
-    }
-    
-    # Convert images to base64
-    image_base64 = base64.b64encode(image_data).decode('utf-8')
-    reference_base64 = base64.b64encode(reference_image).decode('utf-8')
-    
-    # Prepare request data
-    data = {
-        'file': image_base64,
-        'ref_image_file': reference_base64,
-        'placement_type': placement_type,
-        'num_results': num_results,
-        'sync': sync,
-        'original_quality': original_quality,
-        'force_rmbg': force_rmbg,
-        'content_moderation': content_moderation,
-        'enhance_ref_image': enhance_ref_image,
-        'ref_image_influence': ref_image_influence
-    }
-    
-    # Add optional parameters
-    if placement_type in ['automatic', 'manual_placement', 'custom_coordinates']:
-        data['shot_size'] = shot_size
-    
-    if placement_type == 'manual_placement':
-        data['manual_placement_selection'] = manual_placement_selection
-    
-    if placement_type == 'manual_padding':
-        data['padding_values'] = padding_values
-    
-    if placement_type == 'custom_coordinates':
-        if foreground_image_size:
-            data['foreground_image_size'] = foreground_image_size
-        if foreground_image_location:
-            data['foreground_image_location'] = foreground_image_location
-    
-    if sku:
-        data['sku'] = sku
-    
+    data = _build_lifestyle_image_payload(
+        image_data,
+        reference_image,
+        placement_type=placement_type,
+        num_results=num_results,
+        sync=sync,
+        original_quality=original_quality,
+        shot_size=shot_size,
+        manual_placement_selection=manual_placement_selection,
+        padding_values=padding_values,
+        foreground_image_size=foreground_image_size,
+        foreground_image_location=foreground_image_location,
+        force_rmbg=force_rmbg,
+        content_moderation=content_moderation,
+        sku=sku,
+        enhance_ref_image=enhance_ref_image,
+        ref_image_influence=ref_image_influence,
+        image_url=image_url
+    )
+
+    try:
+        return post_json(LIFESTYLE_IMAGE_PATH, api_key, data)
+    except Exception as e:
+        raise Exception(f"Lifestyle shot generation failed: {str(e)}")
+
+async def lifestyle_shot_by_text_async(
+    api_key: str,
+    image_data: Optional[bytes],
+    scene_description: str,
+    **kwargs
+) -> Dict[str, Any]:
+    """
+    Awaitable variant of :func:`lifestyle_shot_by_text`.
+
+    Accepts the same keyword arguments and shares one async connection pool.
+    """
+    data = _build_lifestyle_text_payload(image_data, scene_description, **kwargs)
+
+    try:
+        return await apost_json(LIFESTYLE_TEXT_PATH, api_key, data)
+    except Exception as e:
+        raise Exception(f"Lifestyle shot generation failed: {str(e)}")
+
+async def lifestyle_shot_by_image_async(
+    api_key: str,
+    image_data: Optional[bytes],
+    reference_image: bytes,
+    **kwargs
+) -> Dict[str, Any]:
+    """
+    Awaitable variant of :func:`lifestyle_shot_by_image`.
+
+    Accepts the same keyword arguments and shares one async connection pool.
+    """
+    data = _build_lifestyle_image_payload(image_data, reference_image, **kwargs)
+
     try:
-        print(f"Making request to: {url}")
-        print(f"Headers: {headers}")
-        print(f"Data: {data}")
-        
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text}")
-        
-        return response.json()
+        return await apost_json(LIFESTYLE_IMAGE_PATH, api_key, data)
     except Exception as e:
-        raise Exception(f"Lifestyle shot generation failed: {str(e)}") 
\ No newline at end of file
+        raise Exception(f"Lifestyle shot generation failed: {str(e)}")
+
+def _scene_payloads(image_data: Optional[bytes], scene_descriptions: Sequence[str], **kwargs) -> List[Dict[str, Any]]:
+    """Build one request body per scene, normalizing the product image only once."""
+    if not scene_descriptions:
+        return []
+    base = _build_lifestyle_text_payload(image_data, scene_descriptions[0], **kwargs)
+    return [dict(base, scene_description=scene) for scene in scene_descriptions]
+
+def _scene_record(index: int, scene: str, start: float, result: Any = None, error: Optional[Exception] = None) -> Dict[str, Any]:
+    record = {"index": index, "scene_description": scene, "seconds": round(time.perf_counter() - start, 3)}
+    if error is not None:
+        record["error"] = f"Lifestyle shot generation failed: {str(error)}"
+    else:
+        record["result"] = result
+    return record
+
+def lifestyle_shots_by_text(
+    api_key: str,
+    image_data: Optional[bytes],
+    scene_descriptions: Sequence[str],
+    max_workers: Optional[int] = None,
+    **kwargs
+) -> Iterator[Dict[str, Any]]:
+    """
+    Generate lifestyle shots of one product for many scene descriptions.
+
+    The product image is normalized once and the requests run concurrently,
+    still throttled by the rate and concurrency limits of the API key.
+    Results are yielded as each scene finishes, not in input order; a failed
+    scene is reported in its record instead of stopping the others.
+
+    Args:
+        api_key: Bria AI API key
+        image_data: Product image bytes (may be None with an image_url keyword)
+        scene_descriptions: One scene per variant
+        max_workers: Requests in flight (defaults to one per scene)
+        **kwargs: Any other argument of :func:`lifestyle_shot_by_text`
+
+    Yields:
+        Dicts with the scene "index", its "scene_description", "seconds"
+        and either the API "result" or an "error" message
+    """
+    payloads = _scene_payloads(image_data, scene_descriptions, **kwargs)
+    if not payloads:
+        return
+    start = time.perf_counter()
+
+    def run(index: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return _scene_record(index, data["scene_description"], start, post_json(LIFESTYLE_TEXT_PATH, api_key, data))
+        except Exception as e:
+            return _scene_record(index, data["scene_description"], start, error=e)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers or len(payloads), thread_name_prefix="bria-scene")
+    try:
+        futures = [executor.submit(run, index, data) for index, data in enumerate(payloads)]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # A consumer that stops early does not wait for the queued scenes
+        executor.shutdown(wait=False, cancel_futures=True)
+
+async def lifestyle_shots_by_text_async(
+    api_key: str,
+    image_data: Optional[bytes],
+    scene_descriptions: Sequence[str],
+    **kwargs
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Async generator variant of :func:`lifestyle_shots_by_text`.
+
+    Every scene is a task on the shared async connection pool; the ones
+    still running are cancelled if the consumer stops early.
+    """
+    payloads = _scene_payloads(image_data, scene_descriptions, **kwargs)
+    start = time.perf_counter()
+
+    async def run(index: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return _scene_record(index, data["scene_description"], start, await apost_json(LIFESTYLE_TEXT_PATH, api_key, data))
+        except Exception as e:
+            return _scene_record(index, data["scene_description"], start, error=e)
+
+    tasks = [asyncio.ensure_future(run(index, data)) for index, data in enumerate(payloads)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,244 @@
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from .retry import get_request_stats
+
+# Phases of one HTTP attempt, in order:
+#   wait      governor queueing (rate limit, in-flight caps, throttle pauses)
+#   connect   pool checkout, connection/TLS setup and request headers
+#   encode    base64-encoding image fields while the body streams
+#   upload    sending the body, excluding encode time
+#   server    from the end of the upload to the response headers
+#   download  reading the response body
+#   decode    parsing the JSON response
+PHASES = ("wait", "connect", "encode", "upload", "server", "download", "decode")
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+logger = logging.getLogger("adsnap.requests")
+
+def _configure_log() -> None:
+    target = os.getenv("BRIA_METRICS_LOG")
+    if not target:
+        return
+    handler = logging.StreamHandler() if target == "-" else logging.FileHandler(target)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_configure_log()
+
+class RequestTiming:
+    """
+    Phase timings, sizes and outcome of one HTTP attempt.
+
+    Phases are measured as laps: each :meth:`mark` closes the phase that
+    started at the previous mark.
+    """
+
+    def __init__(self, path: str, hedge: bool = False):
+        self.path = path
+        self.hedge = hedge
+        self.phases: Dict[str, float] = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.status: Optional[int] = None
+        self.error: Optional[str] = None
+        self.started = time.perf_counter()
+        self._last = self.started
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @property
+    def total(self) -> float:
+        return self._last - self.started
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ts": round(time.time(), 3),
+            "path": self.path,
+            "status": self.status,
+            "error": self.error,
+            "hedge": self.hedge,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "total": round(self.total, 4),
+            "phases": {phase: round(self.phases[phase], 4) for phase in PHASES if phase in self.phases}
+        }
+
+class TimedBody:
+    """
+    Wraps a request body to time its encoding and upload.
+
+    Keeps the body's length so it is still sent with Content-Length.
+    """
+
+    def __init__(self, body, timing: RequestTiming):
+        self.body = body
+        self.timing = timing
+
+    def __len__(self) -> int:
+        return len(self.body)
+
+    def _timed(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        self.timing.mark("connect")
+        encode = 0.0
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                break
+            encode += time.perf_counter() - start
+            self.timing.bytes_sent += len(chunk)
+            yield chunk
+        self.timing.mark("upload")
+        self.timing.add("upload", -encode)
+        self.timing.add("encode", encode)
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self._timed(iter(self.body))
+
+    async def achunks(self) -> AsyncIterator[bytes]:
+        for chunk in self:
+            yield chunk
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+_phase_histograms: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+_duration_histograms: Dict[str, Histogram] = defaultdict(Histogram)
+_counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = defaultdict(float)
+_lock = threading.Lock()
+
+def increment(name: str, value: float = 1.0, **labels: str) -> None:
+    """Add to a counter, e.g. increment("cache_hits", path=path)."""
+    with _lock:
+        _counters[(name, tuple(sorted(labels.items())))] += value
+
+def observe(timing: RequestTiming) -> None:
+    """Record a finished attempt in the metrics and the JSON request log."""
+    status = str(timing.status) if timing.status is not None else "error"
+    with _lock:
+        for phase, seconds in timing.phases.items():
+            _phase_histograms[(timing.path, phase)].observe(max(0.0, seconds))
+        _duration_histograms[timing.path].observe(timing.total)
+        _counters[("requests", (("path", timing.path), ("status", status)))] += 1
+        _counters[("request_bytes", (("path", timing.path),))] += timing.bytes_sent
+        _counters[("response_bytes", (("path", timing.path),))] += timing.bytes_received
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(timing.to_dict()))
+
+def _labels(pairs) -> str:
+    return ",".join(f'{key}="{value}"' for key, value in pairs)
+
+def _histogram_lines(name: str, labels: str, histogram: Histogram) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    cumulative += histogram.counts[-1]
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+    lines.append(f"{name}_count{{{labels}}} {cumulative}")
+    return lines
+
+def render_prometheus() -> str:
+    """Return every metric in the Prometheus text exposition format."""
+    lines = [
+        "# HELP bria_request_phase_seconds Time spent in each phase of a Bria request attempt",
+        "# TYPE bria_request_phase_seconds histogram"
+    ]
+    with _lock:
+        for (path, phase), histogram in sorted(_phase_histograms.items()):
+            lines += _histogram_lines("bria_request_phase_seconds", _labels([("path", path), ("phase", phase)]), histogram)
+        lines += [
+            "# HELP bria_request_duration_seconds Duration of a Bria request attempt",
+            "# TYPE bria_request_duration_seconds histogram"
+        ]
+        for path, histogram in sorted(_duration_histograms.items()):
+            lines += _histogram_lines("bria_request_duration_seconds", _labels([("path", path)]), histogram)
+
+        counters: Dict[str, List[str]] = defaultdict(list)
+        for (name, labels), value in sorted(_counters.items()):
+            counters[name].append(f"bria_{name}_total{{{_labels(labels)}}} {value:g}")
+
+    for path, stats in sorted(get_request_stats().items()):
+        for name in ("retries", "hedges", "hedge_wins"):
+            counters[name].append(f'bria_{name}_total{{path="{path}"}} {stats[name]}')
+
+    for name, samples in counters.items():
+        lines.append(f"# TYPE bria_{name}_total counter")
+        lines += samples
+    return "\n".join(lines) + "\n"
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+_server: Optional[ThreadingHTTPServer] = None
+
+def start_metrics_server(port: Optional[int] = None, host: str = "0.0.0.0") -> Optional[ThreadingHTTPServer]:
+    """
+    Serve /metrics on `port` from a background thread, once per process.
+
+    Without a port, BRIA_METRICS_PORT is used; no server is started when
+    neither is set.
+    """
+    global _server
+    port = port if port is not None else int(os.getenv("BRIA_METRICS_PORT", "0"))
+    if not port:
+        return None
+    with _lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError as e:
+                print(f"Metrics server not started on port {port}: {str(e)}")
+                return None
+            threading.Thread(target=_server.serve_forever, name="bria-metrics", daemon=True).start()
+    return _server
+
+__all__ = [
+    'PHASES',
+    'RequestTiming',
+    'TimedBody',
+    'increment',
+    'observe',
+    'render_prometheus',
+    'start_metrics_server'
+]
@@ -1,63 +1,87 @@
 from typing import Dict, Any
-import requests
-import base64
+from .client import post_json
+from .async_client import apost_json
+from .preprocess import prepare_upload
+
+PACKSHOT_PATH = "/v1/product/packshot"
+
+def _build_packshot_payload(
+    image_data: bytes = None,
+    background_color: str = "#FFFFFF",
+    sku: str = None,
+    force_rmbg: bool = False,
+    content_moderation: bool = False,
+    image_url: str = None
+) -> Dict[str, Any]:
+    """Build the request body shared by the sync and async variants."""
+    # Prepare request data
+    data = {
+        'background_color': background_color,
+        'force_rmbg': force_rmbg,
+        'content_moderation': content_moderation
+    }
+
+    # Add image data; bytes are base64-encoded while the body is sent
+    if image_url:
+        data['image_url'] = image_url
+    elif image_data:
+        data['file'] = prepare_upload(image_data, "packshot")
+    else:
+        raise ValueError("Either image_data or image_url must be provided")
+
+    # Add optional SKU if provided
+    if sku:
+        data['sku'] = sku
+
+    return data
 
 def create_packshot(
     api_key: str,
-    image_data: bytes,
+    image_data: bytes = None,
     background_color: str = "#FFFFFF",
     sku: str = None,
     force_rmbg: bool = False,
-    content_moderation: bool = False
+    content_moderation: bool = False,
+    image_url: str = None
 ) -> Dict[str, Any]:
     """
     Create a professional packshot from a product image.
-    
+
     Args:
         api_key: Bria AI API key
-        image_data: Image data in bytes
+        image_data: Image data in bytes (optional if image_url provided)
         background_color: Background color in hex format or 'transparent'
         sku: Optional SKU identifier for the product
         force_rmbg: Whether to force background removal even if alpha channel exists
         content_moderation: Whether to enable content moderation
-    
+        image_url: URL of the image (optional if image_data provided)
+
     Returns:
         Dict containing the API response
     """
-    url = "https://engine.prod.bria-api.com/v1/product/packshot"
-    
-    headers = {
-        'api_token': api_key,
-        'Accept': 'application/json',
-        'Content-Type': 'application/json'
-    }
-    
-    # Convert image data to base64
-    image_base64 = base64.b64encode(image_data).decode('utf-8')
-    
-    # Prepare request data
-    data = {
-        'file': image_base64,
-        'background_color': background_color,
-        'force_rmbg': force_rmbg,
-        'content_moderation': content_moderation
-    }
-    
-    # Add optional SKU if provided
-    if sku:
-        data['sku'] = sku
-    
+    data = _build_packshot_payload(
+        image_data,
+        background_color=background_color,
+        sku=sku,
+        force_rmbg=force_rmbg,
+        content_moderation=content_moderation,
+        image_url=image_url
+    )
+
+    try:
+        return post_json(PACKSHOT_PATH, api_key, data)
+    except Exception as e:
+        raise Exception(f"Packshot creation failed: {str(e)}")
+
+async def create_packshot_async(api_key: str, image_data: bytes = None, **kwargs) -> Dict[str, Any]:
+    """
+    Awaitable variant of :func:`create_packshot`.
+
+    Accepts the same keyword arguments and shares one async connection pool.
+    """
+    data = _build_packshot_payload(image_data, **kwargs)
+
     try:
-        print(f"Making request to: {url}")
-        print(f"Headers: {headers}")
-        print(f"Data keys: {list(data.keys())}")
-        
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text}")
-        
-        return response.json()
+        return await apost_json(PACKSHOT_PATH, api_key, data)
     except Exception as e:
-        raise Exception(f"Packshot creation failed: {str(e)}") 
\ No newline at end of file
+        raise Exception(f"Packshot creation failed: {str(e)}")
@@ -0,0 +1,158 @@
+from typing import Callable, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from .client import get_download_session
+
+DEFAULT_POLL_WORKERS = int(os.getenv("BRIA_POLL_WORKERS", "16"))
+DEFAULT_POLL_TIMEOUT = float(os.getenv("BRIA_POLL_TIMEOUT", "600"))
+
+class PollBatch:
+    """
+    Handle on a group of result URLs being watched by a :class:`ReadinessPoller`.
+
+    All methods are thread-safe; the poller fills it in from its own threads.
+    """
+
+    def __init__(self, urls: List[str], on_ready: Optional[Callable[[str], None]] = None):
+        self.urls = list(urls)
+        self.on_ready = on_ready
+        self._ready: List[str] = []
+        self._failed: List[str] = []
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def _finish(self, url: str, ready: bool) -> None:
+        with self._lock:
+            (self._ready if ready else self._failed).append(url)
+            if len(self._ready) + len(self._failed) == len(self.urls):
+                self._done.set()
+        if ready and self.on_ready is not None:
+            self.on_ready(url)
+
+    def ready_urls(self) -> List[str]:
+        """Ready URLs, in the order they were requested."""
+        with self._lock:
+            return [url for url in self.urls if url in self._ready]
+
+    def failed_urls(self) -> List[str]:
+        with self._lock:
+            return list(self._failed)
+
+    def pending_urls(self) -> List[str]:
+        with self._lock:
+            finished = set(self._ready) | set(self._failed)
+        return [url for url in self.urls if url not in finished]
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every URL is ready or has given up; returns False on timeout."""
+        return self._done.wait(timeout)
+
+class ReadinessPoller:
+    """
+    Background prober for results that Bria renders asynchronously.
+
+    URLs are probed concurrently with HEAD requests on a small thread pool.
+    Each URL backs off exponentially with jitter between probes and is given
+    up on after `timeout` seconds. Nothing runs on the caller's thread.
+
+    Args:
+        max_workers: Concurrent probes
+        initial_delay: Seconds before the first probe of a URL
+        max_delay: Upper bound of the delay between probes
+        factor: Backoff multiplier
+        jitter: Random +/- fraction applied to every delay
+        timeout: Seconds after which a URL is reported as failed
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_POLL_WORKERS,
+        initial_delay: float = 1.0,
+        max_delay: float = 15.0,
+        factor: float = 1.7,
+        jitter: float = 0.3,
+        timeout: float = DEFAULT_POLL_TIMEOUT
+    ):
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.jitter = jitter
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bria-poll")
+        self._queue: list = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="bria-poll-scheduler", daemon=True)
+        self._thread.start()
+
+    def _jittered(self, delay: float) -> float:
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _schedule(self, when: float, url: str, batch: PollBatch, delay: float, deadline: float) -> None:
+        with self._condition:
+            heapq.heappush(self._queue, (when, next(self._counter), url, batch, delay, deadline))
+            self._condition.notify()
+
+    def watch(self, urls: List[str], on_ready: Optional[Callable[[str], None]] = None) -> PollBatch:
+        """
+        Start watching URLs and return a handle on their progress.
+
+        Args:
+            urls: Result URLs returned by an async-mode request
+            on_ready: Optional callback invoked from a poller thread per ready URL
+        """
+        batch = PollBatch(urls, on_ready)
+        now = time.monotonic()
+        for url in batch.urls:
+            self._schedule(now + self._jittered(self.initial_delay), url, batch, self.initial_delay, now + self.timeout)
+        return batch
+
+    def _probe(self, url: str, batch: PollBatch, delay: float, deadline: float) -> None:
+        try:
+            response = get_download_session().head(url, timeout=10, allow_redirects=True)
+            ready = response.status_code == 200
+        except Exception:
+            ready = False
+
+        if ready:
+            batch._finish(url, True)
+            return
+
+        now = time.monotonic()
+        if now >= deadline:
+            batch._finish(url, False)
+            return
+        delay = min(self.max_delay, delay * self.factor)
+        self._schedule(now + self._jittered(delay), url, batch, delay, deadline)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue or self._queue[0][0] > time.monotonic():
+                    timeout = self._queue[0][0] - time.monotonic() if self._queue else None
+                    self._condition.wait(timeout)
+                _, _, url, batch, delay, deadline = heapq.heappop(self._queue)
+            self._executor.submit(self._probe, url, batch, delay, deadline)
+
+_poller: Optional[ReadinessPoller] = None
+_poller_lock = threading.Lock()
+
+def get_poller() -> ReadinessPoller:
+    """Return the process-wide poller shared by every session."""
+    global _poller
+    if _poller is None:
+        with _poller_lock:
+            if _poller is None:
+                _poller = ReadinessPoller()
+    return _poller
+
+__all__ = ['PollBatch', 'ReadinessPoller', 'get_poller']
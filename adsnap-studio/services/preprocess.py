@@ -0,0 +1,149 @@
+from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import io
+import os
+import threading
+from PIL import Image, ImageOps
+
+PREPROCESS_ENABLED = os.getenv("BRIA_PREPROCESS", "1").lower() not in ("0", "false", "no", "off")
+JPEG_QUALITY = int(os.getenv("BRIA_UPLOAD_JPEG_QUALITY", "90"))
+
+# Longest side worth uploading per endpoint; results are ~1000-2000 px so
+# larger inputs only cost upload and encode time.
+MAX_SIDE: Dict[str, int] = {
+    "packshot": 2000,
+    "shadow": 2000,
+    "lifestyle": 2000,
+    "reference": 1024,
+    "gen_fill": 2000,
+    "erase_foreground": 2000
+}
+_override = os.getenv("BRIA_MAX_UPLOAD_SIDE")
+if _override:
+    MAX_SIDE = {endpoint: int(_override) for endpoint in MAX_SIDE}
+
+EXIF_ORIENTATION = 0x0112
+# img.info keys that carry metadata we don't want to upload (PNG stores XMP
+# under the Adobe key)
+METADATA_KEYS = ("exif", "icc_profile", "xmp", "XML:com.adobe.xmp", "comment")
+
+_cache: "OrderedDict[Tuple[str, Optional[int], Optional[Tuple[int, int]]], Tuple[bytes, Tuple[int, int]]]" = OrderedDict()
+_cache_lock = threading.Lock()
+_CACHE_SIZE = 32
+
+def _encode(img: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        img.convert("RGBA").save(buffer, format="PNG")
+    elif img.mode in ("L", "1"):
+        img.convert("L").save(buffer, format="PNG")
+    else:
+        img.convert("RGB").save(buffer, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+def _has_metadata(img: Image.Image) -> bool:
+    return bool(img.getexif()) or any(key in img.info for key in METADATA_KEYS)
+
+def _strip_jpeg(img: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    # Reuse the original quantization tables and subsampling so only the
+    # metadata is lost
+    img.save(buffer, format="JPEG", quality="keep")
+    return buffer.getvalue()
+
+def _process(
+    image_data: bytes,
+    max_side: Optional[int],
+    size: Optional[Tuple[int, int]]
+) -> Tuple[bytes, Tuple[int, int]]:
+    with Image.open(io.BytesIO(image_data)) as img:
+        orientation = img.getexif().get(EXIF_ORIENTATION, 1)
+        target = size
+        if target is None and max_side and max(img.size) > max_side:
+            scale = max_side / max(img.size)
+            target = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+
+        if (target is None or target == img.size) and orientation == 1:
+            if not _has_metadata(img):
+                # Nothing to gain from a decode/re-encode round trip
+                return image_data, img.size
+            if img.format == "JPEG" and img.mode in ("RGB", "L"):
+                return _strip_jpeg(img), img.size
+
+        if target is not None and target != img.size and size is None:
+            # Let the JPEG decoder do most of the downscaling
+            img.draft(img.mode, target)
+
+        img = ImageOps.exif_transpose(img)
+        if size is not None:
+            img = img.resize(size, Image.NEAREST if img.mode in ("L", "1") else Image.LANCZOS)
+        elif max_side and max(img.size) > max_side:
+            img.thumbnail((max_side, max_side), Image.LANCZOS)
+        return _encode(img), img.size
+
+def prepare_image(
+    image_data: bytes,
+    max_side: Optional[int] = None,
+    size: Optional[Tuple[int, int]] = None
+) -> Tuple[bytes, Tuple[int, int]]:
+    """
+    Normalize an image before it is uploaded.
+
+    Applies the EXIF orientation, downscales so the longest side is at most
+    `max_side` (or resizes to an exact `size`), drops metadata and re-encodes
+    as JPEG, or PNG when there is transparency. Images that need none of
+    this are returned untouched; in-limit JPEGs that only carry metadata
+    keep their original quality settings. Results are memoized for repeated uploads.
+
+    Args:
+        image_data: Original image bytes
+        max_side: Longest side allowed, None to keep the resolution
+        size: Exact (width, height) to resize to, used to match masks to images
+
+    Returns:
+        Tuple of the bytes to upload and their (width, height)
+    """
+    if not PREPROCESS_ENABLED:
+        return image_data, (0, 0)
+
+    key = (hashlib.sha1(image_data).hexdigest(), max_side, size)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    try:
+        result = _process(image_data, max_side, size)
+    except (OSError, ValueError) as e:
+        # Not something PIL can read; let the API decide
+        print(f"Skipping image preprocessing: {str(e)}")
+        return image_data, (0, 0)
+
+    if result[0] is image_data:
+        return result
+
+    with _cache_lock:
+        _cache[key] = result
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+def clear_cache() -> None:
+    """Forget the memoized uploads, e.g. to time preprocessing from cold."""
+    with _cache_lock:
+        _cache.clear()
+
+def prepare_upload(image_data: bytes, endpoint: str) -> bytes:
+    """Return the bytes to upload for an endpoint, downscaled to its useful resolution."""
+    return prepare_image(image_data, MAX_SIDE.get(endpoint))[0]
+
+def prepare_image_and_mask(image_data: bytes, mask_data: bytes, endpoint: str = "gen_fill") -> Tuple[bytes, bytes]:
+    """Prepare an image for upload and resize its mask to the same dimensions."""
+    image_bytes, image_size = prepare_image(image_data, MAX_SIDE.get(endpoint))
+    if image_size == (0, 0):
+        return image_bytes, mask_data
+    mask_bytes, _ = prepare_image(mask_data, size=image_size)
+    return image_bytes, mask_bytes
+
+__all__ = ['MAX_SIDE', 'prepare_image', 'prepare_upload', 'prepare_image_and_mask', 'clear_cache']
@@ -0,0 +1,101 @@
+from typing import Any, Dict, Optional
+from collections import OrderedDict
+import os
+import re
+import threading
+import unicodedata
+from .cache import CACHE_ENABLED, DEFAULT_CACHE_DIR, ResultCache, make_cache_key
+
+# Enhancements don't go stale like result URLs, so they are kept much longer
+DEFAULT_PROMPT_CACHE_TTL = float(os.getenv("BRIA_PROMPT_CACHE_TTL", str(30 * 24 * 60 * 60)))
+DEFAULT_PROMPT_CACHE_MAX_BYTES = int(os.getenv("BRIA_PROMPT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+MEMORY_ENTRIES = int(os.getenv("BRIA_PROMPT_CACHE_ENTRIES", "1024"))
+
+PROMPT_ENHANCER_PATH = "/v1/prompt_enhancer"
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_prompt(prompt: str) -> str:
+    """Fold Unicode variants and runs of whitespace so equivalent prompts share a key."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", prompt)).strip()
+
+def prompt_cache_key(path: str, prompt: str, params: Dict[str, Any]) -> str:
+    """Cache key of an enhancement: the endpoint, the normalized prompt and the other parameters."""
+    return make_cache_key(path, {**params, "prompt": normalize_prompt(prompt)})
+
+class PromptCache:
+    """
+    In-process LRU of prompt enhancements over an on-disk ResultCache.
+
+    Lookups are served from memory when possible; disk hits are promoted to
+    the LRU so a catalog template costs one SQLite read per process.
+
+    Args:
+        disk: Persistent store shared between processes, or None for memory only
+        entries: Number of enhancements kept in memory
+    """
+
+    def __init__(self, disk: Optional[ResultCache], entries: int = MEMORY_ENTRIES):
+        self.disk = disk
+        self.entries = entries
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached enhancement of a key, or None on a miss."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        if self.disk is None:
+            return None
+        entry = self.disk.get_json(key)
+        if entry is None or "enhanced" not in entry:
+            return None
+        self._remember(key, entry["enhanced"])
+        return entry["enhanced"]
+
+    def put(self, key: str, value: Any) -> None:
+        self._remember(key, value)
+        if self.disk is not None:
+            self.disk.put_json(key, {"enhanced": value})
+
+    def clear_memory(self) -> None:
+        """Drop the in-process layer; the disk store is kept."""
+        with self._lock:
+            self._memory.clear()
+
+_prompt_cache: Optional[PromptCache] = None
+_prompt_cache_lock = threading.Lock()
+
+def get_prompt_cache() -> Optional[PromptCache]:
+    """Return the shared prompt enhancement cache, or None when BRIA_CACHE is off."""
+    global _prompt_cache
+    if not CACHE_ENABLED:
+        return None
+    if _prompt_cache is None:
+        with _prompt_cache_lock:
+            if _prompt_cache is None:
+                disk = ResultCache(
+                    os.path.join(DEFAULT_CACHE_DIR, "prompts"),
+                    max_bytes=DEFAULT_PROMPT_CACHE_MAX_BYTES,
+                    ttl=DEFAULT_PROMPT_CACHE_TTL
+                )
+                _prompt_cache = PromptCache(disk)
+    return _prompt_cache
+
+def cached_enhancement(prompt: str, **kwargs) -> Optional[Any]:
+    """Return the cached enhancement of a prompt without calling the API, or None."""
+    cache = get_prompt_cache()
+    if cache is None:
+        return None
+    return cache.get(prompt_cache_key(PROMPT_ENHANCER_PATH, prompt, kwargs))
+
+__all__ = ['PromptCache', 'normalize_prompt', 'prompt_cache_key', 'get_prompt_cache', 'cached_enhancement']
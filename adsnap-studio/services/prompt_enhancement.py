@@ -1,6 +1,16 @@
-from typing import Dict, Any, Optional
-import requests
-import json
+from typing import Dict, Any, Iterable
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from .client import post_json
+from .async_client import apost_json
+from .prompt_cache import PROMPT_ENHANCER_PATH, cached_enhancement, get_prompt_cache, prompt_cache_key
+
+def _store(prompt: str, kwargs: Dict[str, Any], result: Dict[str, Any]) -> None:
+    # Only real enhancements are cached; fallbacks to the original are retried
+    enhanced = result.get("prompt variations")
+    cache = get_prompt_cache()
+    if enhanced and cache is not None:
+        cache.put(prompt_cache_key(PROMPT_ENHANCER_PATH, prompt, kwargs), enhanced)
 
 def enhance_prompt(
     api_key: str,
@@ -9,40 +19,118 @@ def enhance_prompt(
 ) -> str:
     """
     Enhance a prompt using Bria AI's prompt enhancement service.
-    
+
+    Enhancements are cached by the normalized prompt and parameters, so
+    repeated prompts are answered without a network call.
+
     Args:
         api_key: Bria AI API key
         prompt: Original prompt to enhance
         **kwargs: Additional parameters for the API
-    
+
     Returns:
         Enhanced prompt string
     """
-    url = "https://engine.prod.bria-api.com/v1/prompt_enhancer"
-    
-    headers = {
-        'api_token': api_key,
-        'Accept': 'application/json',
-        'Content-Type': 'application/json'
-    }
-    
+    cached = cached_enhancement(prompt, **kwargs)
+    if cached is not None:
+        return cached
+
     data = {
         'prompt': prompt,
         **kwargs
     }
-    
+
     try:
-        print(f"Making request to: {url}")
-        print(f"Headers: {headers}")
-        
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text}")
-        
-        result = response.json()
+        result = post_json(PROMPT_ENHANCER_PATH, api_key, data, cache=False)
+        _store(prompt, kwargs, result)
         return result.get("prompt variations", prompt)  # Return original prompt if enhancement fails
     except Exception as e:
         print(f"Error enhancing prompt: {str(e)}")
-        return prompt  # Return original prompt on error 
\ No newline at end of file
+        return prompt  # Return original prompt on error
+
+async def enhance_prompt_async(
+    api_key: str,
+    prompt: str,
+    **kwargs
+) -> str:
+    """
+    Awaitable variant of :func:`enhance_prompt`.
+
+    Shares its cache and falls back to the original prompt on error, like
+    the sync version.
+    """
+    cached = cached_enhancement(prompt, **kwargs)
+    if cached is not None:
+        return cached
+
+    data = {
+        'prompt': prompt,
+        **kwargs
+    }
+
+    try:
+        result = await apost_json(PROMPT_ENHANCER_PATH, api_key, data, cache=False)
+        _store(prompt, kwargs, result)
+        return result.get("prompt variations", prompt)
+    except Exception as e:
+        print(f"Error enhancing prompt: {str(e)}")
+        return prompt
+
+def prefetch_enhancements(
+    api_key: str,
+    prompts: Iterable[str],
+    workers: int = 4,
+    **kwargs
+) -> Dict[str, int]:
+    """
+    Fill the cache with the enhancements of many prompts ahead of a run.
+
+    Prompts are consumed lazily and deduplicated by their normalized form;
+    the ones not cached yet are enhanced on `workers` threads, under the
+    same rate and concurrency limits as any other request.
+
+    Args:
+        api_key: Bria AI API key
+        prompts: Prompts to enhance, e.g. every prompt of a manifest
+        workers: Concurrent enhancement requests
+        **kwargs: Additional parameters for the API, part of the cache key
+
+    Returns:
+        Counts of "cached", "fetched" and "failed" prompts
+    """
+    cache = get_prompt_cache()
+    counts = {"cached": 0, "fetched": 0, "failed": 0}
+    if cache is None:
+        return counts
+
+    counts_lock = threading.Lock()
+    # Bound the queued prompts so large manifests are streamed
+    slots = threading.BoundedSemaphore(workers * 2)
+    seen = set()
+
+    def fetch(prompt: str) -> None:
+        try:
+            result = post_json(PROMPT_ENHANCER_PATH, api_key, {'prompt': prompt, **kwargs}, cache=False)
+            _store(prompt, kwargs, result)
+            outcome = "fetched" if result.get("prompt variations") else "failed"
+        except Exception as e:
+            print(f"Error enhancing prompt: {str(e)}")
+            outcome = "failed"
+        finally:
+            slots.release()
+        with counts_lock:
+            counts[outcome] += 1
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for prompt in prompts:
+            key = prompt_cache_key(PROMPT_ENHANCER_PATH, prompt, kwargs)
+            if key in seen:
+                continue
+            seen.add(key)
+            if cache.get(key) is not None:
+                counts["cached"] += 1
+                continue
+            slots.acquire()
+            executor.submit(fetch, prompt)
+
+    return counts
@@ -0,0 +1,310 @@
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+import asyncio
+import os
+import random
+import threading
+import time
+
+# Statuses that mean "slow down"; the request was not processed
+THROTTLE_STATUSES = (429, 503)
+
+DEFAULT_MAX_IN_FLIGHT = int(os.getenv("BRIA_MAX_IN_FLIGHT", "0"))
+DEFAULT_ENDPOINT_IN_FLIGHT = int(os.getenv("BRIA_MAX_IN_FLIGHT_PER_ENDPOINT", "0"))
+DEFAULT_BACKOFF_BASE = float(os.getenv("BRIA_BACKOFF_BASE", "1"))
+DEFAULT_BACKOFF_MAX = float(os.getenv("BRIA_BACKOFF_MAX", "60"))
+DEFAULT_THROTTLE_RETRIES = int(os.getenv("BRIA_THROTTLE_RETRIES", "3"))
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with an adaptive rate.
+
+    The rate is halved every time the API throttles us and climbs back to the
+    configured rate in small steps as requests succeed again.
+
+    Args:
+        rate: Tokens added per second
+        burst: Maximum number of tokens the bucket holds
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.max_rate = float(rate)
+        self.rate = self.max_rate
+        self.burst = float(burst if burst is not None else max(1, int(rate)))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def throttle(self, factor: float = 0.5) -> None:
+        """Reduce the rate after the API pushed back."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.max_rate / 16, self.rate * factor)
+
+    def recover(self) -> None:
+        """Step the rate back towards the configured one after a success."""
+        if self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+class ConcurrencyLimiter:
+    """
+    Counting semaphore usable from threads and from coroutines.
+
+    Coroutines poll for a free slot with short sleeps rather than blocking
+    the event loop.
+
+    Args:
+        limit: Maximum number of holders at a time
+    """
+
+    def __init__(self, limit: int):
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        self.limit = limit
+        self._active = 0
+        self._condition = threading.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        return self._active
+
+    def try_acquire(self) -> bool:
+        with self._condition:
+            if self._active >= self.limit:
+                return False
+            self._active += 1
+            return True
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self._active >= self.limit:
+                self._condition.wait()
+            self._active += 1
+
+    async def aacquire(self) -> None:
+        delay = 0.005
+        while not self.try_acquire():
+            await asyncio.sleep(delay)
+            delay = min(0.1, delay * 2)
+
+    def release(self) -> None:
+        with self._condition:
+            self._active -= 1
+            self._condition.notify()
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Turn a Retry-After header (seconds or HTTP date) into seconds from now."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class Governor:
+    """
+    Decides when a request made with one API key may be sent.
+
+    Combines the optional token bucket with caps on in-flight requests per
+    key and per endpoint, and a shared pause that 429/503 responses extend,
+    honouring Retry-After when the API sends it.
+
+    Args:
+        rate: Requests per second, None for no rate limit
+        burst: Burst size of the rate limit
+        max_in_flight: Concurrent requests for the key, 0 for no cap
+        endpoint_in_flight: Concurrent requests per endpoint, 0 for no cap
+        endpoint_limits: Per-path overrides of `endpoint_in_flight`
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        endpoint_in_flight: int = DEFAULT_ENDPOINT_IN_FLIGHT,
+        endpoint_limits: Optional[Dict[str, int]] = None
+    ):
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.in_flight = ConcurrencyLimiter(max_in_flight) if max_in_flight else None
+        self.endpoint_in_flight = endpoint_in_flight
+        self.endpoint_limits = dict(endpoint_limits or {})
+        self._endpoints: Dict[str, ConcurrencyLimiter] = {}
+        self._blocked_until = 0.0
+        self._throttled = 0
+        self._lock = threading.Lock()
+
+    def _limiters(self, path: str) -> List[ConcurrencyLimiter]:
+        limiters = []
+        limit = self.endpoint_limits.get(path, self.endpoint_in_flight)
+        if limit:
+            with self._lock:
+                limiter = self._endpoints.get(path)
+                if limiter is None:
+                    limiter = self._endpoints[path] = ConcurrencyLimiter(limit)
+            limiters.append(limiter)
+        # Always endpoint first, then key, so slots are taken in one order
+        if self.in_flight is not None:
+            limiters.append(self.in_flight)
+        return limiters
+
+    def pause_remaining(self) -> float:
+        """Seconds left of the current throttling pause."""
+        return max(0.0, self._blocked_until - time.monotonic())
+
+    def _admission_delay(self) -> float:
+        delay = self.pause_remaining()
+        if self.bucket is not None:
+            delay = max(delay, self.bucket.reserve())
+        return delay
+
+    @contextmanager
+    def slot(self, path: str) -> Iterator[None]:
+        """Hold a request slot for `path`, waiting for capacity, tokens and pauses."""
+        limiters = self._limiters(path)
+        acquired = []
+        try:
+            for limiter in limiters:
+                limiter.acquire()
+                acquired.append(limiter)
+            delay = self._admission_delay()
+            if delay > 0:
+                time.sleep(delay)
+            yield
+        finally:
+            for limiter in reversed(acquired):
+                limiter.release()
+
+    @asynccontextmanager
+    async def aslot(self, path: str) -> AsyncIterator[None]:
+        """Awaitable counterpart of :meth:`slot`."""
+        limiters = self._limiters(path)
+        acquired = []
+        try:
+            for limiter in limiters:
+                await limiter.aacquire()
+                acquired.append(limiter)
+            delay = self._admission_delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield
+        finally:
+            for limiter in reversed(acquired):
+                limiter.release()
+
+    def record(self, status: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Feed back the status of a response.
+
+        Returns:
+            Seconds every request with this key now waits if the response was
+            a throttle (0 for `Retry-After: 0`), None otherwise
+        """
+        if status not in THROTTLE_STATUSES:
+            if self._throttled:
+                with self._lock:
+                    self._throttled = 0
+            if self.bucket is not None:
+                self.bucket.recover()
+            return None
+
+        with self._lock:
+            self._throttled += 1
+            if retry_after is not None:
+                delay = retry_after
+            else:
+                delay = min(DEFAULT_BACKOFF_MAX, DEFAULT_BACKOFF_BASE * 2 ** (self._throttled - 1))
+            # Jitter so the waiting requests do not all come back at once
+            delay *= random.uniform(1.0, 1.2)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        if self.bucket is not None:
+            self.bucket.throttle()
+        return delay
+
+_governors: Dict[str, Governor] = {}
+_lock = threading.Lock()
+
+def get_governor(api_key: str) -> Governor:
+    """Return the governor of an API key, creating one with the default caps."""
+    governor = _governors.get(api_key)
+    if governor is None:
+        with _lock:
+            governor = _governors.setdefault(api_key, Governor())
+    return governor
+
+def set_rate_limit(api_key: str, rate: Optional[float], burst: Optional[int] = None) -> None:
+    """
+    Limit requests sent with an API key to `rate` per second.
+
+    Pass rate=None to remove the limit.
+    """
+    get_governor(api_key).bucket = TokenBucket(rate, burst) if rate is not None else None
+
+def set_concurrency_limit(
+    api_key: str,
+    max_in_flight: Optional[int] = None,
+    endpoint_in_flight: Optional[int] = None,
+    endpoint_limits: Optional[Dict[str, int]] = None
+) -> None:
+    """
+    Cap the requests an API key has in flight, overall and per endpoint.
+
+    Arguments left as None keep their current value; 0 removes a cap.
+    """
+    governor = get_governor(api_key)
+    if max_in_flight is not None:
+        governor.in_flight = ConcurrencyLimiter(max_in_flight) if max_in_flight else None
+    if endpoint_in_flight is not None or endpoint_limits is not None:
+        with governor._lock:
+            if endpoint_in_flight is not None:
+                governor.endpoint_in_flight = endpoint_in_flight
+            if endpoint_limits is not None:
+                governor.endpoint_limits = dict(endpoint_limits)
+            governor._endpoints.clear()
+
+def get_rate_limiter(api_key: str) -> Optional[TokenBucket]:
+    """Return the limiter configured for an API key, if any."""
+    governor = _governors.get(api_key)
+    return governor.bucket if governor is not None else None
+
+__all__ = [
+    'TokenBucket',
+    'ConcurrencyLimiter',
+    'Governor',
+    'THROTTLE_STATUSES',
+    'parse_retry_after',
+    'get_governor',
+    'set_rate_limit',
+    'set_concurrency_limit',
+    'get_rate_limiter'
+]
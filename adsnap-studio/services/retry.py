@@ -0,0 +1,154 @@
+from typing import Dict, Iterable, Optional
+from collections import defaultdict, deque
+import os
+import random
+import threading
+
+HEDGING_ENABLED = os.getenv("BRIA_HEDGING", "0").lower() in ("1", "true", "yes", "on")
+
+class RetryPolicy:
+    """
+    How requests to one endpoint are retried and hedged.
+
+    Bria has no idempotency keys, so a request that may already have been
+    processed (a read timeout, or a 504 from the gateway) is only retried
+    when `retry_on_timeout` is set or 504 is listed. Connection failures and
+    the statuses listed in `retry_statuses` are safe to retry. 429/503
+    throttling is handled separately by the governor.
+
+    Args:
+        max_attempts: Attempts in total, including the first one
+        retry_statuses: HTTP statuses answered with a retry
+        backoff: Seconds before the first retry
+        factor: Backoff multiplier per retry
+        max_backoff: Upper bound of a backoff delay
+        retry_on_timeout: Whether read timeouts are retried
+        hedge: Whether the endpoint may be hedged when hedging is enabled
+        hedge_after: Hedge delay in seconds until enough latencies are known
+        hedge_quantile: Latency quantile after which a hedge is sent
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        retry_statuses: Iterable[int] = (500, 502),
+        backoff: float = 1.0,
+        factor: float = 2.0,
+        max_backoff: float = 20.0,
+        retry_on_timeout: bool = False,
+        hedge: bool = False,
+        hedge_after: float = 30.0,
+        hedge_quantile: float = 0.95
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.retry_statuses = frozenset(retry_statuses)
+        self.backoff = backoff
+        self.factor = factor
+        self.max_backoff = max_backoff
+        self.retry_on_timeout = retry_on_timeout
+        self.hedge = hedge
+        self.hedge_after = hedge_after
+        self.hedge_quantile = hedge_quantile
+
+    @property
+    def hedging(self) -> bool:
+        return self.hedge and HEDGING_ENABLED
+
+    def delay(self, attempt: int) -> float:
+        """Jittered backoff before retry number `attempt` (1 for the first retry)."""
+        delay = min(self.max_backoff, self.backoff * self.factor ** (attempt - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def __repr__(self) -> str:
+        return f"RetryPolicy(max_attempts={self.max_attempts}, hedge={self.hedge})"
+
+DEFAULT_POLICY = RetryPolicy()
+
+# Keyed by path prefix; the longest matching prefix wins
+_policies: Dict[str, RetryPolicy] = {
+    "/v1/product/lifestyle_shot_by_text": RetryPolicy(max_attempts=2, hedge=True, hedge_after=40.0),
+    "/v1/product/lifestyle_shot_by_image": RetryPolicy(max_attempts=2),
+    "/v1/text-to-image/hd/": RetryPolicy(max_attempts=2, hedge=True, hedge_after=20.0),
+    "/v1/gen_fill": RetryPolicy(max_attempts=2),
+    "/v1/prompt_enhancer": RetryPolicy(max_attempts=3, retry_statuses=(500, 502, 504), backoff=0.5, retry_on_timeout=True)
+}
+_lock = threading.Lock()
+
+def set_retry_policy(path_prefix: str, policy: Optional[RetryPolicy]) -> None:
+    """Use `policy` for endpoints starting with `path_prefix`; None restores the default."""
+    with _lock:
+        if policy is None:
+            _policies.pop(path_prefix, None)
+        else:
+            _policies[path_prefix] = policy
+
+def get_retry_policy(path: str) -> RetryPolicy:
+    """Return the policy of an endpoint path."""
+    matches = [prefix for prefix in _policies if path.startswith(prefix)]
+    if not matches:
+        return DEFAULT_POLICY
+    return _policies[max(matches, key=len)]
+
+class LatencyTracker:
+    """
+    Recent request latencies of one endpoint.
+
+    Args:
+        size: Number of latencies kept
+        min_samples: Samples needed before quantiles are trusted
+    """
+
+    def __init__(self, size: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the q-quantile of recent latencies, None with too few samples."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+_latencies: Dict[str, LatencyTracker] = defaultdict(LatencyTracker)
+_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"requests": 0, "retries": 0, "hedges": 0, "hedge_wins": 0})
+_stats_lock = threading.Lock()
+
+def record_latency(path: str, seconds: float) -> None:
+    _latencies[path].add(seconds)
+
+def hedge_delay(path: str, policy: RetryPolicy) -> float:
+    """Seconds to wait for the first response before sending a hedge."""
+    observed = _latencies[path].quantile(policy.hedge_quantile)
+    return observed if observed is not None else policy.hedge_after
+
+def count(path: str, event: str) -> None:
+    """Increment one of the request counters of an endpoint."""
+    with _stats_lock:
+        _stats[path][event] += 1
+
+def get_request_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Return per-endpoint counters.
+
+    "hedge_wins" counts hedges that answered before the original request;
+    compare it with "hedges" to tune hedge_quantile.
+    """
+    with _stats_lock:
+        return {path: dict(counters) for path, counters in _stats.items()}
+
+__all__ = [
+    'RetryPolicy',
+    'LatencyTracker',
+    'DEFAULT_POLICY',
+    'set_retry_policy',
+    'get_retry_policy',
+    'record_latency',
+    'hedge_delay',
+    'get_request_stats'
+]
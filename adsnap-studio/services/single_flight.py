@@ -0,0 +1,226 @@
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+import weakref
+from .cache import DEFAULT_CACHE_DIR
+from .metrics import increment
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+SINGLE_FLIGHT_ENABLED = os.getenv("BRIA_SINGLE_FLIGHT", "1").lower() not in ("0", "false", "no", "off")
+DEFAULT_INFLIGHT_DIR = os.path.join(DEFAULT_CACHE_DIR, "inflight")
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls into one.
+
+    Within a process, callers with the same key wait for the first one and
+    receive its result (or its exception). Across processes, callers take a
+    byte-range lock on a shared lock file at an offset derived from the key,
+    so only one process calls upstream at a time. Its result is left in a
+    small JSON file that the processes which were waiting pick up instead of
+    making their own call. Without fcntl (Windows) only threads and tasks of
+    the same process are coalesced.
+
+    Args:
+        root: Directory holding the lock file and the shared results
+        result_ttl: Seconds a shared result file is kept
+    """
+
+    def __init__(self, root: str = DEFAULT_INFLIGHT_DIR, result_ttl: float = 300.0):
+        self.root = root
+        self.result_ttl = result_ttl
+        self.coalesced = 0
+        self._calls: Dict[str, _Call] = {}
+        self._async_calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+        os.makedirs(root, exist_ok=True)
+        # POSIX record locks are dropped when any descriptor of the file is
+        # closed, so the process keeps a single one open for its lifetime
+        self._fd = os.open(os.path.join(root, "locks"), os.O_RDWR | os.O_CREAT, 0o600) if fcntl else None
+
+    def _coalesce(self) -> None:
+        self.coalesced += 1
+        increment("coalesced_requests")
+
+    @staticmethod
+    def _offset(key: str) -> int:
+        return int(key[:15], 16)
+
+    def _acquire(self, key: str) -> None:
+        if self._fd is not None:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, self._offset(key))
+
+    def _release(self, key: str) -> None:
+        if self._fd is not None:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, self._offset(key))
+
+    def _result_path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.json")
+
+    def _read_result(self, key: str, since: float) -> Optional[Any]:
+        """Return the result another process finished after `since`, if any."""
+        if self._fd is None:
+            return None
+        path = self._result_path(key)
+        try:
+            if os.path.getmtime(path) < since:
+                return None
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_result(self, key: str, result: Any) -> None:
+        if self._fd is None:
+            return
+        temp_path = os.path.join(self.root, f".{key}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(result, f)
+            os.replace(temp_path, self._result_path(key))
+        except (OSError, TypeError, ValueError):
+            # Not shareable; other processes simply make their own call
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        self._sweep()
+
+    def _sweep(self) -> None:
+        now = time.time()
+        if now - self._last_sweep < 60:
+            return
+        self._last_sweep = now
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if entry.name.endswith((".json", ".tmp")):
+                    try:
+                        if now - entry.stat().st_mtime > self.result_ttl:
+                            os.remove(entry.path)
+                    except OSError:
+                        pass
+
+    def _run_exclusive(self, key: str, fn: Callable[[], Any]) -> Any:
+        started = time.time()
+        self._acquire(key)
+        try:
+            shared = self._read_result(key, started)
+            if shared is not None:
+                self._coalesce()
+                return shared
+            result = fn()
+            self._write_result(key, result)
+            return result
+        finally:
+            self._release(key)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Return fn(), sharing one execution between concurrent callers of `key`.
+
+        Args:
+            key: Hex digest identifying the call, e.g. its payload hash
+            fn: Callable performing the call; its result must be JSON to be
+                shared across processes
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self._coalesce()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run_exclusive(key, fn)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Awaitable counterpart of :meth:`do` for coroutine functions."""
+        loop = asyncio.get_running_loop()
+        calls = self._async_calls.setdefault(loop, {})
+        future = calls.get(key)
+        if future is not None:
+            self._coalesce()
+            return await asyncio.shield(future)
+
+        future = calls[key] = loop.create_future()
+        # Followers may all have gone away; don't warn about an unread error
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        try:
+            result = await self._arun_exclusive(key, fn)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            calls.pop(key, None)
+
+    async def _arun_exclusive(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        started = time.time()
+        acquiring = asyncio.ensure_future(asyncio.to_thread(self._acquire, key))
+        try:
+            await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            # The lock is still granted to the worker thread eventually
+            acquiring.add_done_callback(lambda _: self._release(key))
+            raise
+        try:
+            shared = await asyncio.to_thread(self._read_result, key, started)
+            if shared is not None:
+                self._coalesce()
+                return shared
+            result = await fn()
+            await asyncio.to_thread(self._write_result, key, result)
+            return result
+        finally:
+            self._release(key)
+
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+def get_single_flight() -> Optional[SingleFlight]:
+    """Return the shared single-flight group, or None when BRIA_SINGLE_FLIGHT is off."""
+    global _single_flight
+    if not SINGLE_FLIGHT_ENABLED:
+        return None
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight()
+    return _single_flight
+
+__all__ = ['SingleFlight', 'get_single_flight']
@@ -0,0 +1,232 @@
+"""
+Host input images once and hand URLs to chained requests.
+
+Without staging, a multi-step ad set sends the same multi-MB base64 image
+to every endpoint. With BRIA_STAGING_URL set, each normalized input is written once
+to a content-addressed store under $BRIA_CACHE_DIR/staging and passed to
+the endpoints that accept it as image_url. Result URLs returned by Bria are
+passed on as they are. Steps that need bytes read URLs through the blob
+store, so every URL is downloaded at most once.
+
+BRIA_STAGING_URL must be reachable by Bria: the built-in server
+(BRIA_STAGING_PORT) behind a tunnel or reverse proxy, or any static file
+server rooted at $BRIA_CACHE_DIR/staging/blobs.
+"""
+from typing import Any, Dict, List, Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import hashlib
+import os
+import re
+import threading
+from .cache import DEFAULT_CACHE_DIR, DiskCache
+
+DEFAULT_STAGING_TTL = float(os.getenv("BRIA_STAGING_TTL", str(24 * 60 * 60)))
+DEFAULT_STAGING_MAX_BYTES = int(os.getenv("BRIA_STAGING_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+_KEY_PATH = re.compile(r"^/([0-9a-f]{2})/([0-9a-f]{64})$")
+
+def result_urls(response: Any) -> List[str]:
+    """Collect the image URLs from the different Bria response shapes."""
+    if not isinstance(response, dict):
+        return []
+    if "result_url" in response:
+        return [response["result_url"]]
+    for key in ("result_urls", "urls"):
+        if response.get(key):
+            return list(response[key])
+
+    urls = []
+    if isinstance(response.get("result"), list):
+        for item in response["result"]:
+            if isinstance(item, dict) and "urls" in item:
+                urls.extend(item["urls"])
+            elif isinstance(item, list):
+                urls.extend(item)
+    return urls
+
+# File extension per image type, for downloads and archive entries
+IMAGE_EXTENSIONS = {"image/png": "png", "image/jpeg": "jpg", "image/webp": "webp"}
+
+def image_content_type(data: bytes) -> str:
+    """Return the MIME type of encoded image bytes from their signature."""
+    if data.startswith(b"\x89PNG"):
+        return "image/png"
+    if data.startswith(b"\xff\xd8"):
+        return "image/jpeg"
+    if data[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+class StagingArea:
+    """
+    Content-addressed store of normalized uploads, published under a base URL.
+
+    Args:
+        root: Directory of the store
+        public_url: Base URL at which Bria can fetch the files (defaults to
+            BRIA_STAGING_URL); staging is disabled when it is empty
+        max_bytes: Size budget of the store
+        ttl: Seconds a staged file stays available
+    """
+
+    def __init__(
+        self,
+        root: str,
+        public_url: Optional[str] = None,
+        max_bytes: int = DEFAULT_STAGING_MAX_BYTES,
+        ttl: Optional[float] = DEFAULT_STAGING_TTL
+    ):
+        self.disk = DiskCache(root, max_bytes=max_bytes, ttl=ttl)
+        if public_url is None:
+            public_url = os.getenv("BRIA_STAGING_URL", "")
+        self.public_url = public_url.rstrip("/")
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.public_url)
+
+    def stage(self, image_data: bytes, endpoint: str) -> Optional[str]:
+        """
+        Store the upload an endpoint would receive and return its URL.
+
+        Returns None when staging is disabled, so callers send bytes instead.
+        """
+        if not self.enabled:
+            return None
+        from .preprocess import prepare_upload
+
+        data = prepare_upload(image_data, endpoint)
+        key = hashlib.sha256(data).hexdigest()
+        if self.disk.lookup(key) is None:
+            self.disk.put(key, data)
+        return f"{self.public_url}/{key[:2]}/{key}"
+
+    def read(self, key: str) -> Optional[bytes]:
+        return self.disk.get(key)
+
+class StagedImage:
+    """
+    An input image of a chained workflow, held as bytes, a URL or both.
+
+    Endpoints that accept image_url get a URL, either the one given (e.g. a
+    Bria result) or the staged upload; the others get bytes, downloaded once
+    through the blob store when only a URL is known.
+
+    Args:
+        data: Image bytes
+        url: URL of the image, reachable by Bria
+        staging: Staging area used to publish `data` (defaults to the shared one)
+    """
+
+    def __init__(self, data: Optional[bytes] = None, url: Optional[str] = None, staging: Optional[StagingArea] = None):
+        if data is None and url is None:
+            raise ValueError("Either data or url must be provided")
+        self.data = data
+        self.url = url
+        self.staging = staging
+        self._staged: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def url_for(self, endpoint: str) -> Optional[str]:
+        """Return a URL Bria can read the image from, staging the bytes on first use."""
+        if self.url:
+            return self.url
+        with self._lock:
+            if endpoint not in self._staged:
+                staging = self.staging or get_staging_area()
+                self._staged[endpoint] = staging.stage(self.data, endpoint)
+            return self._staged[endpoint]
+
+    def get_bytes(self) -> bytes:
+        """Return the image bytes, downloading a URL-only image once."""
+        if self.data is None:
+            from .blob_store import get_blob_store
+
+            self.data = get_blob_store().get_bytes(self.url)
+        return self.data
+
+    def as_kwargs(self, endpoint: str) -> Dict[str, Any]:
+        """Return the image_data and image_url keyword arguments of a service call, one of them None."""
+        url = self.url_for(endpoint)
+        if url:
+            return {"image_data": None, "image_url": url}
+        return {"image_data": self.get_bytes(), "image_url": None}
+
+_staging_area: Optional[StagingArea] = None
+_staging_lock = threading.Lock()
+
+def get_staging_area() -> StagingArea:
+    """Return the process-wide staging area, disabled unless BRIA_STAGING_URL is set."""
+    global _staging_area
+    if _staging_area is None:
+        with _staging_lock:
+            if _staging_area is None:
+                _staging_area = StagingArea(os.path.join(DEFAULT_CACHE_DIR, "staging"))
+    return _staging_area
+
+def stage_image(image_data: bytes, endpoint: str) -> Optional[str]:
+    """Publish an upload for an endpoint and return its URL, or None when staging is off."""
+    return get_staging_area().stage(image_data, endpoint)
+
+class _StagingHandler(BaseHTTPRequestHandler):
+    def _lookup(self) -> Optional[bytes]:
+        match = _KEY_PATH.match(self.path.split("?")[0])
+        if match is None or not match.group(2).startswith(match.group(1)):
+            return None
+        return get_staging_area().read(match.group(2))
+
+    def _send(self, include_body: bool) -> None:
+        data = self._lookup()
+        if data is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", image_content_type(data))
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "public, max-age=3600, immutable")
+        self.end_headers()
+        if include_body:
+            self.wfile.write(data)
+
+    def do_GET(self):
+        self._send(True)
+
+    def do_HEAD(self):
+        self._send(False)
+
+    def log_message(self, format, *args):
+        pass
+
+_server: Optional[ThreadingHTTPServer] = None
+
+def start_staging_server(port: Optional[int] = None, host: str = "0.0.0.0") -> Optional[ThreadingHTTPServer]:
+    """
+    Serve staged files on `port` from a background thread, once per process.
+
+    Without a port, BRIA_STAGING_PORT is used; no server is started when
+    neither is set.
+    """
+    global _server
+    port = port if port is not None else int(os.getenv("BRIA_STAGING_PORT", "0"))
+    if not port:
+        return None
+    with _staging_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), _StagingHandler)
+            except OSError as e:
+                print(f"Staging server not started on port {port}: {str(e)}")
+                return None
+            threading.Thread(target=_server.serve_forever, name="bria-staging", daemon=True).start()
+    return _server
+
+__all__ = [
+    'IMAGE_EXTENSIONS',
+    'StagedImage',
+    'StagingArea',
+    'get_staging_area',
+    'image_content_type',
+    'result_urls',
+    'stage_image',
+    'start_staging_server'
+]
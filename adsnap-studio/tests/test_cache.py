@@ -0,0 +1,20 @@
+from services.cache import is_cacheable, make_cache_key
+
+def test_async_responses_are_never_cached():
+    assert not is_cacheable("/v1/product/packshot", {"sync": False})
+    assert not is_cacheable("/v1/text-to-image/hd/2.2", {"sync": False, "seed": 1}, opt_in=True)
+
+def test_seedless_generations_are_opt_in():
+    assert not is_cacheable("/v1/text-to-image/hd/2.2", {"prompt": "shoe", "sync": True})
+    assert not is_cacheable("/v1/gen_fill", {"prompt": "sky"})
+    assert is_cacheable("/v1/gen_fill", {"prompt": "sky"}, opt_in=True)
+    assert is_cacheable("/v1/text-to-image/hd/2.2", {"prompt": "shoe", "seed": 7})
+
+def test_other_requests_are_cached():
+    assert is_cacheable("/v1/product/packshot", {"background_color": "#FFFFFF"})
+    assert is_cacheable("/v1/product/lifestyle_shot_by_text", {"sync": True})
+
+def test_keys_are_scoped_to_the_api_key():
+    data = {"image_file": b"img", "background_color": "#FFFFFF"}
+    assert make_cache_key("/v1/product/packshot", data, "key-a") == make_cache_key("/v1/product/packshot", data, "key-a")
+    assert make_cache_key("/v1/product/packshot", data, "key-a") != make_cache_key("/v1/product/packshot", data, "key-b")
@@ -0,0 +1,39 @@
+import io
+import numpy as np
+from PIL import Image
+from services.preprocess import EXIF_ORIENTATION, prepare_image_and_mask
+from utils.canvas import canvas_to_mask, fit_to_canvas
+
+def _rotated_jpeg() -> bytes:
+    # Stored landscape with a red top-left corner, shown portrait (rotated 90 degrees clockwise)
+    img = Image.new("RGB", (400, 300), "white")
+    img.paste((255, 0, 0), (0, 0, 100, 100))
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION] = 6
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", exif=exif)
+    return buffer.getvalue()
+
+def _red(img: Image.Image) -> np.ndarray:
+    pixels = np.asarray(img.convert("RGB"), dtype=int)
+    return (pixels[..., 0] > 200) & (pixels[..., 1] < 80)
+
+def test_canvas_shows_the_oriented_image():
+    with Image.open(io.BytesIO(_rotated_jpeg())) as img:
+        assert fit_to_canvas(img).size == (300, 400)
+
+def test_mask_drawn_on_the_canvas_covers_the_same_pixels_of_the_upload():
+    image_data = _rotated_jpeg()
+    with Image.open(io.BytesIO(image_data)) as img:
+        background = fit_to_canvas(img)
+
+    # The user paints over the red corner they see, as st_canvas returns it
+    strokes = np.zeros((background.height, background.width, 4), dtype=np.uint8)
+    strokes[_red(background)] = 255
+    image_bytes, mask_bytes = prepare_image_and_mask(image_data, canvas_to_mask(strokes))
+
+    with Image.open(io.BytesIO(image_bytes)) as image, Image.open(io.BytesIO(mask_bytes)) as mask:
+        assert image.size == mask.size
+        red = _red(image)
+        masked = np.asarray(mask) > 127
+    assert (red & masked).sum() / red.sum() > 0.95
@@ -0,0 +1,91 @@
+import threading
+import time
+import pytest
+from workflows.dag import Step, run_dag
+
+def test_steps_run_after_their_inputs():
+    order = []
+    lock = threading.Lock()
+
+    def record(name, value):
+        def func(**inputs):
+            with lock:
+                order.append(name)
+            return value + sum(inputs.values())
+        return func
+
+    run = run_dag([
+        Step("total", record("total", 0), ["a", "b"]),
+        Step("a", record("a", 1)),
+        Step("b", record("b", 2), ["a"])
+    ])
+
+    assert order == ["a", "b", "total"]
+    assert run["results"] == {"a": 1, "b": 3, "total": 4}
+    assert set(run["timings"]) == {"a", "b", "total"}
+
+def test_independent_steps_run_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def wait_for_siblings():
+        # Deadlocks (and times out) unless all three run at once
+        barrier.wait()
+        return True
+
+    start = time.perf_counter()
+    run = run_dag([Step(name, wait_for_siblings) for name in ("a", "b", "c")])
+
+    assert run["results"] == {"a": True, "b": True, "c": True}
+    assert time.perf_counter() - start < 5
+
+def test_first_error_is_raised_and_dependents_are_skipped():
+    ran = []
+    slow_done = threading.Event()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    def slow():
+        time.sleep(0.2)
+        slow_done.set()
+        return "slow"
+
+    def dependent(**inputs):
+        ran.append("dependent")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        run_dag([
+            Step("fail", fail),
+            Step("slow", slow),
+            Step("dependent", dependent, ["fail"])
+        ])
+
+    # In-flight steps finish before the error is raised; later ones never start
+    assert slow_done.is_set()
+    assert ran == []
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError, match="unknown step"):
+        run_dag([Step("a", lambda **_: None, ["missing"])])
+    with pytest.raises(ValueError, match="Cycle"):
+        run_dag([Step("a", lambda **_: None, ["b"]), Step("b", lambda **_: None, ["a"])])
+
+def test_ad_set_steps_use_the_hd_image_url(monkeypatch):
+    from workflows import generate_ad_set as ad_set
+
+    calls = {}
+    monkeypatch.setattr(ad_set, "generate_hd_image", lambda **kwargs: {
+        "result": [{"urls": ["https://cdn.example/hd.png"], "seed": 1}]
+    })
+
+    def create_packshot(**kwargs):
+        calls["packshot"] = kwargs
+        return {"result_url": "https://cdn.example/packshot.png"}
+
+    monkeypatch.setattr(ad_set, "create_packshot", create_packshot)
+
+    result = ad_set.generate_ad_set("key", prompt="a red shoe", config={"create_packshot": True})
+
+    assert calls["packshot"]["image_url"] == "https://cdn.example/hd.png"
+    assert calls["packshot"]["image_data"] is None
+    assert result["packshot"] == {"result_url": "https://cdn.example/packshot.png"}
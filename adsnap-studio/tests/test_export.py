@@ -0,0 +1,40 @@
+import io
+import json
+import zipfile
+from concurrent.futures import Future
+from workflows.export import iter_zip
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\0" * 64
+
+class _Store:
+    """Blob store double that records which URLs were requested."""
+
+    def __init__(self, tmp_path):
+        self.tmp_path = tmp_path
+        self.requested = []
+
+    def prefetch(self, urls):
+        futures = []
+        for url in urls:
+            self.requested.append(url)
+            path = self.tmp_path / url.rsplit("/", 1)[-1]
+            path.write_bytes(PNG)
+            future = Future()
+            future.set_result(str(path))
+            futures.append(future)
+        return futures
+
+def test_downloads_stay_a_bounded_window_ahead_of_the_writer(tmp_path):
+    store = _Store(tmp_path)
+    entries = [{"name": f"image_{i}", "url": f"https://cdn.example/{i}.png"} for i in range(10)]
+
+    chunks = iter_zip(entries, store=store, prefetch=2)
+    data = next(chunks)
+    assert store.requested == [entry["url"] for entry in entries[:3]]
+
+    data += b"".join(chunks)
+    assert store.requested == [entry["url"] for entry in entries]
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        manifest = json.loads(archive.read("manifest.json"))
+        assert [image["file"] for image in manifest["images"]] == [f"image_{i}.png" for i in range(10)]
+        assert archive.read("image_9.png") == PNG
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from services import async_client, client
+from services.rate_limit import Governor
+from services.retry import RetryPolicy, get_request_stats
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        with server.lock:
+            server.requests += 1
+            delay = server.delays[min(server.requests, len(server.delays)) - 1]
+        time.sleep(delay)
+        body = json.dumps({"result_url": "https://cdn.example/1.png"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.delays = [0.05]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(client, "BASE_URL", base_url)
+    monkeypatch.setattr(async_client, "BASE_URL", base_url)
+    yield server
+    server.shutdown()
+
+def _hold_slot(governor: Governor, path: str, seconds: float) -> threading.Thread:
+    held = threading.Event()
+
+    def hold():
+        with governor.slot(path):
+            held.set()
+            time.sleep(seconds)
+
+    thread = threading.Thread(target=hold, daemon=True)
+    thread.start()
+    held.wait()
+    return thread
+
+def test_time_queued_in_the_governor_does_not_trigger_a_hedge(server):
+    path = "/v1/test/hedge-queued"
+    governor = Governor(max_in_flight=1)
+    policy = RetryPolicy(hedge=True, hedge_after=0.2)
+    blocker = _hold_slot(governor, path, 0.5)
+
+    response, _ = client._post_hedged(client.get_session("key"), path, {}, (5, 5), governor, policy)
+    blocker.join()
+
+    assert response.status_code == 200
+    assert server.requests == 1
+    assert get_request_stats().get(path, {}).get("hedges", 0) == 0
+
+def test_slow_request_is_hedged_and_the_hedge_wins(server):
+    path = "/v1/test/hedge-slow"
+    server.delays = [1.0, 0.05]
+    policy = RetryPolicy(hedge=True, hedge_after=0.2)
+
+    start = time.perf_counter()
+    response, _ = client._post_hedged(client.get_session("key"), path, {}, (5, 5), Governor(), policy)
+
+    assert response.status_code == 200
+    assert time.perf_counter() - start < 0.8
+    assert server.requests == 2
+    assert get_request_stats()[path]["hedge_wins"] == 1
+
+def test_async_hedge_clock_starts_when_the_request_is_sent(server):
+    path = "/v1/test/hedge-queued-async"
+    governor = Governor(max_in_flight=1)
+    policy = RetryPolicy(hedge=True, hedge_after=0.2)
+
+    async def run():
+        http = async_client.get_async_client()
+        try:
+            return await async_client._apost_hedged(http, path, "key", {}, governor, {}, policy)
+        finally:
+            await async_client.aclose()
+
+    blocker = _hold_slot(governor, path, 0.5)
+    response, _ = asyncio.run(run())
+    blocker.join()
+
+    assert response.status_code == 200
+    assert server.requests == 1
+    assert get_request_stats().get(path, {}).get("hedges", 0) == 0
+
+def test_gateway_timeouts_are_not_retried_by_default():
+    assert 504 not in RetryPolicy().retry_statuses
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from PIL import Image
+from utils.image_filters import FilterPipeline, apply_filters
+
+@pytest.fixture
+def noise():
+    rng = np.random.default_rng(0)
+    return Image.fromarray(rng.integers(0, 256, (300, 400, 3), dtype=np.uint8))
+
+@pytest.mark.parametrize("chain", [
+    ["sepia", "contrast", "vignette"],
+    ["sepia", ("brightness", 1.5), ("contrast", 1.3)],
+    [("saturation", 2.0), "vignette", "sepia"]
+])
+def test_fused_chain_matches_filters_applied_one_by_one(noise, chain):
+    sequential = noise
+    for spec in chain:
+        sequential = apply_filters(sequential, [spec])
+
+    fused = apply_filters(noise, chain)
+
+    # Only the rounding between steps may differ
+    difference = np.abs(np.asarray(fused, dtype=int) - np.asarray(sequential, dtype=int))
+    assert difference.max() <= 2
+
+def test_only_full_grayscale_returns_a_gray_image(noise):
+    assert FilterPipeline().add("grayscale").apply(noise).mode == "L"
+    assert FilterPipeline().add("grayscale", 1.0).add("contrast").apply(noise).mode == "L"
+    assert FilterPipeline().add("grayscale", 0.5).apply(noise).mode == "RGB"
+    assert FilterPipeline().add("grayscale").add("sepia").apply(noise).mode == "RGB"
@@ -0,0 +1,111 @@
+import threading
+import time
+import pytest
+from workflows import jobs
+from workflows.jobs import DONE, FAILED, QUEUED, RUNNING, JobQueue, WorkerPool
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.sqlite"), lease=0.3, max_attempts=2)
+
+def test_claim_takes_the_oldest_job_once(queue):
+    first = queue.submit("create_packshot", "key", image_data=b"\x89PNG", background_color="#FFFFFF")
+    second = queue.submit("add_shadow", "key", image_data=b"img")
+
+    job_id, kind, api_key, params = queue.claim("w1")
+    assert (job_id, kind, api_key) == (first, "create_packshot", "key")
+    assert params == {"image_data": b"\x89PNG", "background_color": "#FFFFFF"}
+    assert queue.status(first)["status"] == RUNNING
+
+    assert queue.claim("w2")[0] == second
+    assert queue.claim("w3") is None
+
+def test_expired_lease_hands_the_job_to_another_worker(queue):
+    job_id = queue.submit("add_shadow", "key", image_data=b"img")
+    assert queue.claim("w1")[0] == job_id
+
+    time.sleep(0.4)
+    assert queue.claim("w2")[0] == job_id
+    assert queue.status(job_id)["attempts"] == 2
+
+    # The first worker no longer holds the job, so its outcome is dropped
+    assert not queue.heartbeat(job_id, "w1")
+    assert not queue.complete(job_id, "w1", {"result_url": "stale"})
+    assert queue.status(job_id)["status"] == RUNNING
+    assert queue.complete(job_id, "w2", {"result_url": "fresh"})
+    assert queue.result(job_id) == {"result_url": "fresh"}
+    assert not queue.fail(job_id, "w2", "too late")
+
+def test_heartbeat_keeps_the_lease(queue):
+    job_id = queue.submit("add_shadow", "key", image_data=b"img")
+    queue.claim("w1")
+    for _ in range(3):
+        time.sleep(0.15)
+        assert queue.heartbeat(job_id, "w1")
+    assert queue.claim("w2") is None
+
+def test_job_abandoned_too_often_is_failed(queue):
+    job_id = queue.submit("add_shadow", "key", image_data=b"img")
+    queue.claim("w1")
+    time.sleep(0.4)
+    queue.claim("w2")
+    time.sleep(0.4)
+
+    assert queue.claim("w3") is None
+    status = queue.status(job_id)
+    assert status["status"] == FAILED
+    assert "abandoned" in status["error"]
+    queue.purge(older_than=3600)
+    assert queue.status(job_id)["status"] == FAILED
+
+def test_worker_renews_the_lease_of_a_long_job(queue, monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def slow_job(kind, api_key, params):
+        with lock:
+            calls.append(kind)
+        time.sleep(1.0)  # Over three leases
+        return {"result_url": "done"}
+
+    monkeypatch.setattr(jobs, "run_job", slow_job)
+    job_id = queue.submit("add_shadow", "key", image_data=b"img")
+    pool = WorkerPool(queue, workers=2, poll_interval=0.05).start()
+    try:
+        deadline = time.time() + 5
+        while queue.status(job_id)["status"] in (QUEUED, RUNNING) and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        pool.stop(timeout=5)
+
+    assert queue.status(job_id)["status"] == DONE
+    assert calls == ["add_shadow"]
+
+def _stored_key(queue, job_id):
+    with queue._connect() as db:
+        return db.execute("SELECT api_key FROM jobs WHERE id = ?", (job_id,)).fetchone()["api_key"]
+
+def test_settled_jobs_do_not_keep_the_api_key(queue):
+    done = queue.submit("add_shadow", "key", image_data=b"img")
+    failed = queue.submit("add_shadow", "key", image_data=b"img")
+    queue.claim("w1")
+    queue.claim("w1")
+    assert _stored_key(queue, done) == "key"
+
+    queue.complete(done, "w1", {"result_url": "done"})
+    queue.fail(failed, "w1", "boom")
+    assert _stored_key(queue, done) == ""
+    assert _stored_key(queue, failed) == ""
+
+def test_worker_pool_purges_finished_jobs(queue, monkeypatch):
+    monkeypatch.setattr(jobs, "run_job", lambda kind, api_key, params: {"result_url": "done"})
+    job_id = queue.submit("add_shadow", "key", image_data=b"img")
+    pool = WorkerPool(queue, workers=1, poll_interval=0.05, purge_interval=0.1, retention=0).start()
+    try:
+        deadline = time.time() + 5
+        while queue.status(job_id) is not None and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        pool.stop(timeout=5)
+
+    assert queue.status(job_id) is None
@@ -0,0 +1,10 @@
+from services import packshot
+
+def test_background_color_is_still_the_third_positional_argument(monkeypatch):
+    sent = {}
+    monkeypatch.setattr(packshot, "post_json", lambda path, api_key, data: sent.update(data) or {})
+
+    packshot.create_packshot("key", b"not an image", "#000000")
+
+    assert sent["background_color"] == "#000000"
+    assert "image_url" not in sent
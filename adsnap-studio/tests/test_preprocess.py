@@ -0,0 +1,33 @@
+import io
+from PIL import Image
+from services.preprocess import clear_cache, prepare_image
+
+GPS_IFD = 0x8825
+
+def _jpeg(exif=None) -> bytes:
+    img = Image.new("RGB", (400, 300), "white")
+    img.paste((255, 0, 0), (0, 0, 100, 100))
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=75, **({"exif": exif} if exif else {}))
+    return buffer.getvalue()
+
+def setup_function():
+    clear_cache()
+
+def test_in_limit_image_without_metadata_is_sent_unchanged():
+    image_data = _jpeg()
+    assert prepare_image(image_data, max_side=2000)[0] is image_data
+
+def test_in_limit_image_loses_its_metadata_but_not_its_quality():
+    exif = Image.Exif()
+    exif[0x010F] = "Camera maker"
+    exif.get_ifd(GPS_IFD)[2] = (52.0, 22.0, 7.0)
+    image_data = _jpeg(exif)
+
+    uploaded, size = prepare_image(image_data, max_side=2000)
+
+    assert size == (400, 300)
+    with Image.open(io.BytesIO(uploaded)) as img, Image.open(io.BytesIO(image_data)) as original:
+        assert not img.getexif()
+        assert "exif" not in img.info
+        assert img.quantization == original.quantization
@@ -0,0 +1,11 @@
+from services.rate_limit import Governor
+
+def test_retry_after_zero_is_still_a_throttle():
+    governor = Governor()
+    assert governor.record(429, 0.0) == 0.0
+    assert governor.record(503, 0.0) is not None
+
+def test_other_statuses_are_not_throttles():
+    governor = Governor()
+    assert governor.record(200) is None
+    assert governor.record(500) is None
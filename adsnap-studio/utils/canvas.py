@@ -0,0 +1,33 @@
+from typing import Tuple
+import io
+import numpy as np
+from PIL import Image, ImageOps
+
+# Widest drawing canvas shown next to the original image
+MAX_CANVAS_WIDTH = 800
+
+def canvas_size(image_size: Tuple[int, int], max_width: int = MAX_CANVAS_WIDTH) -> Tuple[int, int]:
+    """Return the (width, height) of the canvas for an image, keeping its aspect ratio."""
+    img_width, img_height = image_size
+    width = min(img_width, max_width)
+    return width, int(width * img_height / img_width)
+
+def fit_to_canvas(img: Image.Image, max_width: int = MAX_CANVAS_WIDTH) -> Image.Image:
+    """
+    Orient an image, resize it to its canvas size and convert it to RGB for st_canvas.
+
+    The EXIF orientation is applied as in services.preprocess, so a mask
+    drawn on the canvas lines up with the uploaded image.
+    """
+    img = ImageOps.exif_transpose(img)
+    img = img.resize(canvas_size(img.size, max_width))
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    return img
+
+def canvas_to_mask(image_data: np.ndarray) -> bytes:
+    """Turn the RGBA strokes returned by st_canvas into a grayscale PNG mask."""
+    mask_img = Image.fromarray(image_data.astype('uint8'), mode='RGBA').convert('L')
+    buffer = io.BytesIO()
+    mask_img.save(buffer, format='PNG')
+    return buffer.getvalue()
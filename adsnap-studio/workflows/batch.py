@@ -0,0 +1,230 @@
+"""
+Headless catalog runner for generate_ad_set.
+
+Streams a CSV/JSONL manifest or a directory of product images, runs one ad set
+per SKU on a bounded worker pool and appends each result to a JSONL file as
+soon as it finishes. The output file doubles as the checkpoint: SKUs already
+recorded with status "ok" are skipped when the run is restarted.
+
+    python -m workflows.batch products.csv --out results.jsonl --config ad_set.json
+
+Manifest rows need a "sku" and either an "image" path (relative to the
+manifest) or a "prompt". Any other column overrides the ad set config for
+that row. With "enhance_prompt" set, the enhancements of all prompts are
+prefetched into the prompt cache before the ad sets start.
+"""
+from typing import Dict, Any, Iterator, List, Optional, Set
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import csv
+import itertools
+import json
+import os
+import threading
+import time
+from dotenv import load_dotenv
+from services import prefetch_enhancements
+from services.rate_limit import set_concurrency_limit, set_rate_limit
+from workflows.generate_ad_set import generate_ad_set
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg"}
+
+def _parse_cell(value: str) -> Any:
+    """Turn CSV cells like "true", "2" or "[0, 15]" into JSON values."""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+def iter_manifest(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield one row per SKU from a directory, CSV or JSONL manifest.
+
+    Rows are read lazily so very large manifests are never loaded at once.
+    """
+    if os.path.isdir(path):
+        with os.scandir(path) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                stem, ext = os.path.splitext(entry.name)
+                if entry.is_file() and ext.lower() in IMAGE_EXTENSIONS:
+                    yield {"sku": stem, "image": entry.path}
+        return
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = (
+                {k: _parse_cell(v) if k not in ("sku", "image", "prompt") else v
+                 for k, v in row.items() if v}
+                for row in csv.DictReader(f)
+            )
+
+        for row in rows:
+            row = {k: v for k, v in row.items() if v is not None and v != ""}
+            if "sku" not in row:
+                raise ValueError(f"Manifest row without sku: {row}")
+            if "image" in row and not os.path.isabs(row["image"]):
+                row["image"] = os.path.join(base_dir, row["image"])
+            yield row
+
+def load_checkpoint(output_path: str) -> Set[str]:
+    """Return the SKUs already completed in a previous run."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partial line from a crash mid-write
+            if record.get("status") == "ok":
+                done.add(record["sku"])
+    return done
+
+class ResultWriter:
+    """Append JSONL records from many threads, flushing each one to disk."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+def iter_enhanced_prompts(manifest: str, config: Dict[str, Any], done: Set[str]) -> Iterator[str]:
+    """Yield the prompts of pending rows that generate_ad_set will enhance."""
+    for row in iter_manifest(manifest):
+        if row["sku"] in done or "image" in row or not row.get("prompt"):
+            continue
+        if row.get("enhance_prompt", config.get("enhance_prompt", False)):
+            yield row["prompt"]
+
+def process_row(api_key: str, row: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one ad set and return its result record."""
+    row_config = dict(config)
+    row_config.update({k: v for k, v in row.items() if k not in ("sku", "image", "prompt")})
+
+    start = time.perf_counter()
+    try:
+        image = None
+        if "image" in row:
+            with open(row["image"], "rb") as f:
+                image = f.read()
+
+        result = generate_ad_set(api_key, image=image, prompt=row.get("prompt"), config=row_config)
+        return {"sku": row["sku"], "status": "ok", "result": result,
+                "seconds": round(time.perf_counter() - start, 3)}
+    except Exception as e:
+        return {"sku": row["sku"], "status": "error", "error": str(e),
+                "seconds": round(time.perf_counter() - start, 3)}
+
+def run_batch(
+    manifest: str,
+    output_path: str,
+    api_keys: List[str],
+    config: Optional[Dict[str, Any]] = None,
+    workers: int = 4,
+    rate_limit: Optional[float] = None,
+    burst: Optional[int] = None,
+    max_in_flight: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Generate ad sets for every SKU of a manifest.
+
+    Args:
+        manifest: Directory of images, or a .csv/.jsonl manifest
+        output_path: JSONL file that receives one record per SKU
+        api_keys: API keys to spread the SKUs over, round-robin
+        config: generate_ad_set configuration applied to every row
+        workers: Number of SKUs processed concurrently
+        rate_limit: Optional requests per second allowed per API key
+        burst: Optional burst size for the rate limit
+        max_in_flight: Optional cap on concurrent requests per API key
+
+    Returns:
+        Counts of "ok", "error" and "skipped" SKUs
+    """
+    if not api_keys:
+        raise ValueError("At least one API key is required")
+    for key in api_keys:
+        if rate_limit:
+            set_rate_limit(key, rate_limit, burst)
+        if max_in_flight:
+            set_concurrency_limit(key, max_in_flight)
+
+    done = load_checkpoint(output_path)
+    prefetched = prefetch_enhancements(api_keys[0], iter_enhanced_prompts(manifest, config or {}, done), workers)
+    if prefetched["fetched"] or prefetched["failed"]:
+        print(f"Prompts: {prefetched['cached']} cached, {prefetched['fetched']} enhanced, "
+              f"{prefetched['failed']} failed")
+
+    counts = {"ok": 0, "error": 0, "skipped": 0}
+    keys = itertools.cycle(api_keys)
+    counts_lock = threading.Lock()
+    writer = ResultWriter(output_path)
+    # Bound the number of queued rows so the manifest is streamed, not loaded
+    slots = threading.BoundedSemaphore(workers * 2)
+
+    def handle(api_key: str, row: Dict[str, Any]) -> None:
+        try:
+            record = process_row(api_key, row, config or {})
+            writer.write(record)
+            with counts_lock:
+                counts[record["status"]] += 1
+            print(f"[{record['status']}] {record['sku']} ({record['seconds']}s)")
+        finally:
+            slots.release()
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for row in iter_manifest(manifest):
+                if row["sku"] in done:
+                    counts["skipped"] += 1
+                    continue
+                slots.acquire()
+                executor.submit(handle, next(keys), row)
+    finally:
+        writer.close()
+
+    return counts
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate ad sets for a catalog of SKUs.")
+    parser.add_argument("manifest", help="Directory of images, or a .csv/.jsonl manifest")
+    parser.add_argument("--out", required=True, help="JSONL results file (also the checkpoint)")
+    parser.add_argument("--config", help="JSON file with the generate_ad_set config")
+    parser.add_argument("--workers", type=int, default=4, help="SKUs processed concurrently")
+    parser.add_argument("--rate", type=float, help="Requests per second per API key")
+    parser.add_argument("--burst", type=int, help="Burst size for --rate")
+    parser.add_argument("--max-in-flight", type=int, help="Concurrent requests per API key")
+    parser.add_argument("--api-key", action="append", dest="api_keys",
+                        help="API key (repeatable); defaults to BRIA_API_KEYS or BRIA_API_KEY")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    api_keys = args.api_keys
+    if not api_keys:
+        api_keys = [k for k in os.getenv("BRIA_API_KEYS", os.getenv("BRIA_API_KEY", "")).split(",") if k]
+
+    config = {}
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            config = json.load(f)
+
+    counts = run_batch(args.manifest, args.out, api_keys, config,
+                       workers=args.workers, rate_limit=args.rate, burst=args.burst,
+                       max_in_flight=args.max_in_flight)
+    print(f"Done: {counts['ok']} ok, {counts['error']} failed, {counts['skipped']} already done")
+
+if __name__ == "__main__":
+    main()
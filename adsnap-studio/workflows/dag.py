@@ -0,0 +1,104 @@
+from typing import Dict, Any, Callable, List, Optional
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import time
+
+class Step:
+    """
+    A unit of work in a workflow graph.
+
+    Args:
+        name: Unique step name, also the key of its result
+        func: Callable invoked with the results of its inputs as keyword arguments
+        inputs: Names of the steps whose results this step needs
+    """
+
+    def __init__(self, name: str, func: Callable[..., Any], inputs: Optional[List[str]] = None):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs or [])
+
+    def __repr__(self) -> str:
+        return f"Step({self.name!r}, inputs={self.inputs!r})"
+
+def _check_graph(steps: List[Step]) -> None:
+    names = [step.name for step in steps]
+    if len(set(names)) != len(names):
+        raise ValueError("Step names must be unique")
+    for step in steps:
+        for dependency in step.inputs:
+            if dependency not in names:
+                raise ValueError(f"Step '{step.name}' depends on unknown step '{dependency}'")
+
+    # Kahn's algorithm: anything left over is part of a cycle
+    remaining = {step.name: set(step.inputs) for step in steps}
+    while True:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            break
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    if remaining:
+        raise ValueError(f"Cycle detected between steps: {sorted(remaining)}")
+
+def run_dag(
+    steps: List[Step],
+    max_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Run steps concurrently, starting each one as soon as its inputs are done.
+
+    Args:
+        steps: Steps to run
+        max_workers: Thread pool size (defaults to one thread per step)
+
+    Returns:
+        Dict with "results" (step name -> return value) and "timings"
+        (step name -> seconds, plus "total" for the whole graph)
+
+    Raises:
+        The first exception raised by a step, after in-flight steps finish.
+        Steps that have not started yet are not run.
+    """
+    _check_graph(steps)
+
+    results: Dict[str, Any] = {}
+    timings: Dict[str, float] = {}
+    pending = {step.name: step for step in steps}
+    running = {}
+    error = None
+
+    def timed(step: Step, kwargs: Dict[str, Any]):
+        start = time.perf_counter()
+        try:
+            return step.func(**kwargs)
+        finally:
+            timings[step.name] = round(time.perf_counter() - start, 3)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers or max(1, len(steps))) as executor:
+        while pending or running:
+            if error is None:
+                for name, step in list(pending.items()):
+                    if all(dependency in results for dependency in step.inputs):
+                        kwargs = {dependency: results[dependency] for dependency in step.inputs}
+                        running[executor.submit(timed, step, kwargs)] = name
+                        del pending[name]
+            elif not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    if error is None:
+                        error = e
+
+    if error is not None:
+        raise error
+
+    timings["total"] = round(time.perf_counter() - started, 3)
+    return {"results": results, "timings": timings}
@@ -0,0 +1,287 @@
+"""
+Export an ad set, or any list of result images, as one ZIP archive.
+
+The archive is produced as a stream: every image is copied from the blob
+store in chunks, stored without recompression (it is already PNG or JPEG),
+and a manifest.json describing each file comes last. Memory use stays at
+one chunk however large the set is.
+
+    python -m workflows.export results.jsonl --out ad_sets.zip --sku SKU-1 --sku SKU-2
+
+Exports built by the app are written under $BRIA_CACHE_DIR/exports and
+streamed to the browser by a small server (BRIA_EXPORT_PORT) instead of
+going through a Streamlit download button, which holds its data in memory.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import time
+import uuid
+import zipfile
+from services.cache import DEFAULT_CACHE_DIR, DiskCache
+from services.staging import IMAGE_EXTENSIONS, image_content_type, result_urls
+
+CHUNK_SIZE = 256 * 1024
+DEFAULT_EXPORT_TTL = float(os.getenv("BRIA_EXPORT_TTL", str(24 * 60 * 60)))
+DEFAULT_EXPORT_MAX_BYTES = int(os.getenv("BRIA_EXPORT_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+# Images downloaded ahead of the one being written to an archive
+DEFAULT_EXPORT_PREFETCH = int(os.getenv("BRIA_EXPORT_PREFETCH", "8"))
+# Largest archive offered through a Streamlit download button when there is no export server
+INLINE_EXPORT_MAX_BYTES = int(os.getenv("BRIA_EXPORT_INLINE_MAX_BYTES", str(100 * 1024 * 1024)))
+# Ad set steps in the order they appear in the archive
+AD_SET_STEPS = ("hd_image", "packshot", "shadow", "lifestyle")
+
+_TOKEN_PATH = re.compile(r"^/exports/([0-9a-f]{32})\.zip$")
+
+def ad_set_images(result: Dict[str, Any], prefix: str = "") -> List[Dict[str, Any]]:
+    """
+    List the images of a generate_ad_set result as archive entries.
+
+    Each entry has the archive "name" (without extension), the "step" and
+    the "url"; lifestyle variants also carry their "scene_description".
+    Failed variants are listed with their "error" and no URL.
+    """
+    entries = []
+    for step in AD_SET_STEPS:
+        value = result.get(step)
+        if value is None:
+            continue
+        if isinstance(value, list):
+            for record in value:
+                if record is None:
+                    continue
+                scene = {"step": step, "scene_description": record.get("scene_description")}
+                folder = f"{prefix}{step}/scene_{record['index'] + 1}"
+                if "error" in record:
+                    entries.append({**scene, "name": folder, "error": record["error"]})
+                    continue
+                for n, url in enumerate(result_urls(record.get("result")), 1):
+                    entries.append({**scene, "name": f"{folder}/{n}", "url": url})
+        else:
+            for n, url in enumerate(result_urls(value), 1):
+                entries.append({"step": step, "name": f"{prefix}{step}/{n}", "url": url})
+    return entries
+
+def url_images(urls: Iterable[str], folder: str = "images") -> List[Dict[str, Any]]:
+    """List result URLs, e.g. a session's generated images, as archive entries."""
+    return [{"step": folder, "name": f"{folder}/{n}", "url": url} for n, url in enumerate(urls, 1)]
+
+class _Sink(io.RawIOBase):
+    """Write-only stream the ZIP writer fills and the generator drains."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def iter_zip(
+    entries: List[Dict[str, Any]],
+    manifest: Optional[Dict[str, Any]] = None,
+    store: Optional[Any] = None,
+    prefetch: int = DEFAULT_EXPORT_PREFETCH
+) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive of the entries' images followed by manifest.json.
+
+    Images are downloaded concurrently into the blob store, at most
+    `prefetch` ahead of the one being copied into the archive, so a large
+    export neither floods the download pool nor evicts its own images from
+    the store before they are read. Images that cannot be downloaded are
+    listed under "failed" in the manifest.
+
+    Args:
+        entries: Archive entries from ad_set_images or url_images
+        manifest: Extra fields of manifest.json (e.g. the SKU or timings)
+        store: Blob store to read images from (defaults to the shared one)
+        prefetch: Images downloaded ahead of the one being written
+    """
+    if store is None:
+        from services.blob_store import get_blob_store
+
+        store = get_blob_store()
+    urls = [entry["url"] for entry in entries if entry.get("url")]
+    downloads: Dict[str, Future] = {}
+    started = written = 0
+
+    images, failed = [], []
+    sink = _Sink()
+    archive = zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED)
+    for entry in entries:
+        details = {k: v for k, v in entry.items() if k != "name" and v is not None}
+        if not entry.get("url"):
+            failed.append(details)
+            continue
+        # Keep the window of downloads ahead of this image filled
+        while started < len(urls) and started <= written + prefetch:
+            if urls[started] not in downloads:
+                downloads[urls[started]] = store.prefetch([urls[started]])[0]
+            started += 1
+        written += 1
+        try:
+            path = downloads[entry["url"]].result()
+            src = open(path, "rb")
+        except Exception as e:
+            failed.append({**details, "error": str(e)})
+            continue
+
+        with src:
+            head = src.read(CHUNK_SIZE)
+            name = f"{entry['name']}.{IMAGE_EXTENSIONS.get(image_content_type(head), 'bin')}"
+            info = zipfile.ZipInfo(name, time.localtime()[:6])
+            digest = hashlib.sha256()
+            size = 0
+            with archive.open(info, "w") as dst:
+                chunk = head
+                while chunk:
+                    dst.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+                    yield sink.drain()
+                    chunk = src.read(CHUNK_SIZE)
+        images.append({"file": name, **details, "bytes": size, "sha256": digest.hexdigest()})
+
+    archive.writestr("manifest.json", json.dumps({
+        **(manifest or {}),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "images": images,
+        "failed": failed
+    }, indent=2, default=str))
+    archive.close()
+    yield sink.drain()
+
+def write_zip(entries: List[Dict[str, Any]], path: str, manifest: Optional[Dict[str, Any]] = None) -> str:
+    """Stream the archive of the entries to a file and return its path."""
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            for chunk in iter_zip(entries, manifest):
+                f.write(chunk)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return path
+
+_exports: Optional[DiskCache] = None
+_exports_lock = threading.Lock()
+
+def get_export_store() -> DiskCache:
+    """Return the store of archives built by the app, expired after BRIA_EXPORT_TTL."""
+    global _exports
+    if _exports is None:
+        with _exports_lock:
+            if _exports is None:
+                _exports = DiskCache(os.path.join(DEFAULT_CACHE_DIR, "exports"),
+                                     max_bytes=DEFAULT_EXPORT_MAX_BYTES, ttl=DEFAULT_EXPORT_TTL)
+    return _exports
+
+def create_export(entries: List[Dict[str, Any]], manifest: Optional[Dict[str, Any]] = None) -> str:
+    """Build an archive in the export store and return its token."""
+    store = get_export_store()
+    token = uuid.uuid4().hex
+    temp_path = store.temp_path(token)
+    try:
+        with open(temp_path, "wb") as f:
+            for chunk in iter_zip(entries, manifest):
+                f.write(chunk)
+        store.commit(token, temp_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return token
+
+def export_path(token: str) -> Optional[str]:
+    """Return the archive file of an export, or None once it expired."""
+    return get_export_store().lookup(token)
+
+def export_url(token: str) -> Optional[str]:
+    """Return the browser URL of an export, or None without an export server."""
+    port = os.getenv("BRIA_EXPORT_PORT")
+    base = os.getenv("BRIA_EXPORT_URL", f"http://localhost:{port}" if port else "").rstrip("/")
+    return f"{base}/exports/{token}.zip" if base else None
+
+class _ExportHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        match = _TOKEN_PATH.match(self.path.split("?")[0])
+        path = export_path(match.group(1)) if match else None
+        if path is None:
+            self.send_error(404)
+            return
+        with open(path, "rb") as f:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/zip")
+            self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+            self.send_header("Content-Disposition", 'attachment; filename="adsnap_export.zip"')
+            self.end_headers()
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                self.wfile.write(chunk)
+
+    def log_message(self, format, *args):
+        pass
+
+_server: Optional[ThreadingHTTPServer] = None
+
+def start_export_server(port: Optional[int] = None, host: str = "0.0.0.0") -> Optional[ThreadingHTTPServer]:
+    """
+    Serve exports on `port` from a background thread, once per process.
+
+    Without a port, BRIA_EXPORT_PORT is used; no server is started when
+    neither is set.
+    """
+    global _server
+    port = port if port is not None else int(os.getenv("BRIA_EXPORT_PORT", "0"))
+    if not port:
+        return None
+    with _exports_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), _ExportHandler)
+            except OSError as e:
+                print(f"Export server not started on port {port}: {str(e)}")
+                return None
+            threading.Thread(target=_server.serve_forever, name="bria-export", daemon=True).start()
+    return _server
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Export ad sets from a batch results file as one ZIP.")
+    parser.add_argument("results", help="JSONL results file written by workflows.batch")
+    parser.add_argument("--out", required=True, help="ZIP file to write")
+    parser.add_argument("--sku", action="append", dest="skus", help="SKU to export (repeatable); defaults to all")
+    args = parser.parse_args(argv)
+
+    # The last successful record of a SKU wins, as in the batch checkpoint
+    results: Dict[str, Dict[str, Any]] = {}
+    with open(args.results, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partial line from a crash mid-write
+            if record.get("status") == "ok" and (not args.skus or record["sku"] in args.skus):
+                results[record["sku"]] = record["result"]
+
+    entries = []
+    for sku, result in results.items():
+        entries.extend(ad_set_images(result, prefix=f"{sku}/"))
+    write_zip(entries, args.out, manifest={"skus": list(results)})
+    print(f"Exported {len(entries)} images of {len(results)} SKUs to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -1,63 +1,121 @@
 from typing import Dict, Any, Optional
 from services import (
     lifestyle_shot_by_text,
+    lifestyle_shots_by_text,
     add_shadow,
     create_packshot,
+    enhance_prompt,
     generate_hd_image
 )
+from services.staging import StagedImage, result_urls
+from workflows.dag import Step, run_dag
 
 def generate_ad_set(
     api_key: str,
     image: Optional[bytes] = None,
     prompt: Optional[str] = None,
-    config: Dict[str, Any] = None
+    config: Dict[str, Any] = None,
+    max_workers: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Generate a set of product ads based on configuration.
+
+    Packshot, shadow and lifestyle steps only depend on the source image, so
+    they run concurrently; when the source is generated from a prompt they
+    wait on the HD image step only. Per-step durations in seconds are
+    returned under "timings". The source image is uploaded at most once
+    per endpoint, or referenced by URL when staging is enabled or it comes
+    from the HD image step. A "scene_descriptions" list in the config
+    turns the lifestyle step into one concurrent request per scene; its
+    result is then the list of per-scene records, in config order.
     """
     if not config:
         config = {}
-    
-    result = {}
-    
+
+    steps = []
+    source_inputs = []
+
     # Generate HD image if prompt provided
     if prompt and not image:
-        hd_response = generate_hd_image(
-            api_key=api_key,
-            prompt=prompt,
-            num_results=config.get("num_results", 1),
-            aspect_ratio=config.get("aspect_ratio", "1:1"),
-            sync=config.get("sync", True)
-        )
-        result["hd_image"] = hd_response
-        image = hd_response.get("result_url")
-    
+        def hd_image():
+            text = enhance_prompt(api_key, prompt) if config.get("enhance_prompt", False) else prompt
+            return generate_hd_image(
+                api_key=api_key,
+                prompt=text,
+                num_results=config.get("num_results", 1),
+                aspect_ratio=config.get("aspect_ratio", "1:1"),
+                sync=config.get("sync", True)
+            )
+        steps.append(Step("hd_image", hd_image))
+        source_inputs = ["hd_image"]
+
+    uploaded = StagedImage(data=image) if image else None
+
+    def source(hd_image: Optional[Dict[str, Any]] = None) -> Optional[StagedImage]:
+        if hd_image is not None:
+            # Later steps read the generated image straight from Bria's URL
+            urls = result_urls(hd_image)
+            return StagedImage(url=urls[0]) if urls else None
+        return uploaded
+
     # Create packshot if requested
-    if config.get("create_packshot", False) and image:
-        packshot_response = create_packshot(
-            api_key=api_key,
-            image_data=image,
-            background_color=config.get("background_color", "#FFFFFF")
-        )
-        result["packshot"] = packshot_response
-    
+    if config.get("create_packshot", False):
+        def packshot(**inputs):
+            source_image = source(**inputs)
+            if not source_image:
+                return None
+            return create_packshot(
+                api_key=api_key,
+                **source_image.as_kwargs("packshot"),
+                background_color=config.get("background_color", "#FFFFFF")
+            )
+        steps.append(Step("packshot", packshot, source_inputs))
+
     # Add shadow if requested
-    if config.get("add_shadow", False) and image:
-        shadow_response = add_shadow(
-            api_key=api_key,
-            image_data=image,
-            shadow_type=config.get("shadow_type", "natural")
-        )
-        result["shadow"] = shadow_response
-    
+    if config.get("add_shadow", False):
+        def shadow(**inputs):
+            source_image = source(**inputs)
+            if not source_image:
+                return None
+            return add_shadow(
+                api_key=api_key,
+                **source_image.as_kwargs("shadow"),
+                shadow_type=config.get("shadow_type", "natural")
+            )
+        steps.append(Step("shadow", shadow, source_inputs))
+
     # Create lifestyle shot if requested
-    if config.get("lifestyle_shot", False) and image:
-        lifestyle_response = lifestyle_shot_by_text(
-            api_key=api_key,
-            image_data=image,
-            scene_description=config.get("scene_description", ""),
-            num_results=config.get("num_results", 1)
-        )
-        result["lifestyle"] = lifestyle_response
-    
-    return result 
\ No newline at end of file
+    if config.get("lifestyle_shot", False):
+        def lifestyle(**inputs):
+            source_image = source(**inputs)
+            if not source_image:
+                return None
+            scenes = config.get("scene_descriptions")
+            if scenes:
+                # A/B variants: all scenes at once, listed in config order
+                variants = [None] * len(scenes)
+                for record in lifestyle_shots_by_text(
+                    api_key=api_key,
+                    **source_image.as_kwargs("lifestyle"),
+                    scene_descriptions=scenes,
+                    num_results=config.get("num_results", 1)
+                ):
+                    variants[record["index"]] = record
+                return variants
+            return lifestyle_shot_by_text(
+                api_key=api_key,
+                **source_image.as_kwargs("lifestyle"),
+                scene_description=config.get("scene_description", ""),
+                num_results=config.get("num_results", 1)
+            )
+        steps.append(Step("lifestyle", lifestyle, source_inputs))
+
+    run = run_dag(steps, max_workers=max_workers)
+
+    result = {
+        name: response
+        for name, response in run["results"].items()
+        if response is not None
+    }
+    result["timings"] = run["timings"]
+    return result
@@ -0,0 +1,428 @@
+"""
+Persistent job queue for Bria calls, decoupled from the Streamlit script.
+
+Jobs are stored in a local SQLite database and executed by a pool of worker
+threads, either inside the Streamlit server (BRIA_JOB_WORKERS > 0) or in one
+or more separate worker processes pointed at the same database:
+
+    python -m workflows.jobs --workers 8
+
+A job survives reruns and dropped websockets; the UI only keeps its id.
+Workers renew the lease of their running jobs while the service call is in
+progress; jobs whose worker died are picked up again once it expires. The
+API key is only kept until a job settles, and every worker pool purges old
+jobs periodically.
+"""
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from contextlib import contextmanager
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dotenv import load_dotenv
+import services
+from services.cache import DEFAULT_CACHE_DIR
+from services.metrics import start_metrics_server
+from services.staging import stage_image, start_staging_server
+
+DEFAULT_JOB_DB = os.getenv("BRIA_JOB_DB", os.path.join(DEFAULT_CACHE_DIR, "jobs.sqlite"))
+DEFAULT_JOB_LEASE = float(os.getenv("BRIA_JOB_LEASE", "300"))
+DEFAULT_JOB_MAX_ATTEMPTS = int(os.getenv("BRIA_JOB_MAX_ATTEMPTS", "3"))
+DEFAULT_JOB_RETENTION = float(os.getenv("BRIA_JOB_RETENTION", str(24 * 60 * 60)))
+DEFAULT_JOB_PURGE_INTERVAL = float(os.getenv("BRIA_JOB_PURGE_INTERVAL", "60"))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Job kinds a worker can run, named after the service functions; every
+# handler takes the API key as `api_key`. They are looked up when a job runs
+# so the Streamlit script can queue jobs without importing the services.
+JOB_HANDLERS = (
+    "generate_hd_image",
+    "create_packshot",
+    "add_shadow",
+    "lifestyle_shot_by_text",
+    "lifestyle_shot_by_image",
+    "generative_fill",
+    "erase_foreground",
+    "enhance_prompt"
+)
+
+# Job kinds that accept image_url, and the endpoint their upload is prepared for
+STAGED_INPUTS = {
+    "create_packshot": "packshot",
+    "add_shadow": "shadow",
+    "lifestyle_shot_by_text": "lifestyle",
+    "lifestyle_shot_by_image": "lifestyle",
+    "erase_foreground": "erase_foreground"
+}
+
+class JobQueue:
+    """
+    SQLite-backed queue with submit/status/result APIs.
+
+    Binary parameters (image and mask bytes) are stored in a side table, the
+    rest of the parameters as JSON. Safe to share between threads and between
+    processes using the same database file.
+
+    Args:
+        path: SQLite database file
+        lease: Seconds a job may go without a heartbeat before it is handed out again
+        max_attempts: Times a job is started before it is marked failed
+    """
+
+    def __init__(self, path: str = DEFAULT_JOB_DB, lease: float = DEFAULT_JOB_LEASE, max_attempts: int = DEFAULT_JOB_MAX_ATTEMPTS):
+        self.path = path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY,"
+                " kind TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " api_key TEXT NOT NULL,"
+                " params TEXT NOT NULL,"
+                " meta TEXT,"
+                " result TEXT,"
+                " error TEXT,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " worker TEXT,"
+                " created REAL NOT NULL,"
+                " started REAL,"
+                " finished REAL)"
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS job_files ("
+                " job_id TEXT NOT NULL,"
+                " name TEXT NOT NULL,"
+                " data BLOB NOT NULL,"
+                " PRIMARY KEY (job_id, name))"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # BEGIN IMMEDIATE takes the write lock upfront so two workers never
+        # claim the same job
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+    def submit(self, kind: str, api_key: str, meta: Optional[Dict[str, Any]] = None, **params) -> str:
+        """
+        Queue a job and return its id.
+
+        Args:
+            kind: Name of the service to call, one of JOB_HANDLERS
+            api_key: Bria AI API key the job runs with
+            meta: Optional JSON data kept with the job for the caller
+            **params: Keyword arguments for the service
+        """
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        files = {k: bytes(v) for k, v in params.items() if isinstance(v, (bytes, bytearray, memoryview))}
+        values = {k: v for k, v in params.items() if k not in files}
+        job_id = uuid.uuid4().hex
+        with self._transaction() as db:
+            db.execute(
+                "INSERT INTO jobs (id, kind, status, api_key, params, meta, created) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, api_key, json.dumps(values),
+                 json.dumps(meta) if meta is not None else None, time.time())
+            )
+            db.executemany(
+                "INSERT INTO job_files (job_id, name, data) VALUES (?, ?, ?)",
+                [(job_id, name, sqlite3.Binary(data)) for name, data in files.items()]
+            )
+        return job_id
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the state of a job, or None if it is unknown."""
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT id, kind, status, meta, error, attempts, created, started, finished FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        status = dict(row)
+        status["meta"] = json.loads(row["meta"]) if row["meta"] else None
+        return status
+
+    def result(self, job_id: str) -> Any:
+        """Return the result of a finished job, or None while it is not done."""
+        with self._connect() as db:
+            row = db.execute("SELECT status, result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None or row["status"] != DONE:
+            return None
+        return json.loads(row["result"])
+
+    def claim(self, worker: str) -> Optional[Tuple[str, str, str, Dict[str, Any]]]:
+        """
+        Take the oldest runnable job for a worker.
+
+        Returns:
+            Tuple of (job id, kind, api key, params), or None if there is no work
+        """
+        now = time.time()
+        with self._transaction() as db:
+            # Fail jobs that keep taking their worker down with them
+            db.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished = ?, api_key = '' "
+                "WHERE status = ? AND started < ? AND attempts >= ?",
+                (FAILED, "Job abandoned by its worker too many times", now, RUNNING, now - self.lease, self.max_attempts)
+            )
+            row = db.execute(
+                "SELECT id, kind, api_key, params FROM jobs "
+                "WHERE status = ? OR (status = ? AND started < ?) "
+                "ORDER BY created LIMIT 1",
+                (QUEUED, RUNNING, now - self.lease)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET status = ?, worker = ?, started = ?, attempts = attempts + 1 WHERE id = ?",
+                (RUNNING, worker, now, row["id"])
+            )
+            params = json.loads(row["params"])
+            for name, data in db.execute("SELECT name, data FROM job_files WHERE job_id = ?", (row["id"],)):
+                params[name] = bytes(data)
+        return row["id"], row["kind"], row["api_key"], params
+
+    def heartbeat(self, job_id: str, worker: str) -> bool:
+        """Renew a worker's lease on a running job; False once the job was handed to another worker."""
+        with self._transaction() as db:
+            return db.execute(
+                "UPDATE jobs SET started = ? WHERE id = ? AND worker = ? AND status = ?",
+                (time.time(), job_id, worker, RUNNING)
+            ).rowcount == 1
+
+    def _finish(self, job_id: str, worker: str, status: str, column: str, value: str) -> bool:
+        with self._transaction() as db:
+            # Only the worker holding the lease may settle the job; the API
+            # key isn't needed any more, so it isn't kept on disk either
+            updated = db.execute(
+                f"UPDATE jobs SET status = ?, {column} = ?, finished = ?, api_key = '' "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (status, value, time.time(), job_id, worker, RUNNING)
+            ).rowcount == 1
+            if updated:
+                db.execute("DELETE FROM job_files WHERE job_id = ?", (job_id,))
+        return updated
+
+    def complete(self, job_id: str, worker: str, result: Any) -> bool:
+        """Store the result of a job; False if the worker no longer holds it."""
+        return self._finish(job_id, worker, DONE, "result", json.dumps(result))
+
+    def fail(self, job_id: str, worker: str, error: str) -> bool:
+        """Mark a job failed; False if the worker no longer holds it."""
+        return self._finish(job_id, worker, FAILED, "error", error)
+
+    def purge(self, older_than: float = DEFAULT_JOB_RETENTION) -> int:
+        """Delete finished jobs older than `older_than` seconds; returns how many."""
+        cutoff = time.time() - older_than
+        with self._transaction() as db:
+            deleted = db.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished < ?",
+                (DONE, FAILED, cutoff)
+            ).rowcount
+            # Keys of jobs settled before they were cleared on settling
+            db.execute(
+                "UPDATE jobs SET api_key = '' WHERE status IN (?, ?) AND api_key != ''",
+                (DONE, FAILED)
+            )
+            # Inputs of jobs given up on in claim() are left behind until now
+            db.execute(
+                "DELETE FROM job_files WHERE job_id NOT IN (SELECT id FROM jobs WHERE status IN (?, ?))",
+                (QUEUED, RUNNING)
+            )
+        return deleted
+
+def run_job(kind: str, api_key: str, params: Dict[str, Any]) -> Any:
+    """
+    Execute one job in the current thread.
+
+    With staging enabled, the image of a job that accepts image_url is
+    published once and sent by URL, so repeated edits of the same upload
+    stop re-sending its bytes.
+    """
+    handler: Callable[..., Any] = getattr(services, kind)
+    endpoint = STAGED_INPUTS.get(kind)
+    if endpoint and params.get("image_data") and not params.get("image_url") and not params.get("original_quality"):
+        url = stage_image(params["image_data"], endpoint)
+        if url:
+            params = dict(params, image_data=None, image_url=url)
+    return handler(api_key=api_key, **params)
+
+class WorkerPool:
+    """
+    Threads that claim jobs from a queue and run them until stopped.
+
+    Args:
+        queue: Queue to take jobs from
+        workers: Number of jobs run concurrently
+        poll_interval: Seconds an idle worker waits before looking again
+        heartbeat_interval: Seconds between lease renewals of a running job
+            (defaults to a third of the queue's lease)
+        purge_interval: Seconds between purges of finished jobs, 0 to never purge
+        retention: Seconds finished jobs are kept before they are purged
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        workers: int = 4,
+        poll_interval: float = 0.5,
+        heartbeat_interval: Optional[float] = None,
+        purge_interval: float = DEFAULT_JOB_PURGE_INTERVAL,
+        retention: float = DEFAULT_JOB_RETENTION
+    ):
+        self.queue = queue
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval or queue.lease / 3
+        self.purge_interval = purge_interval
+        self.retention = retention
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._name = f"{socket.gethostname()}:{os.getpid()}"
+
+    def start(self) -> "WorkerPool":
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, args=(f"{self._name}:{index}",),
+                                      name=f"bria-job-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if self.purge_interval > 0:
+            thread = threading.Thread(target=self._purge, name="bria-job-purge", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _purge(self) -> None:
+        while not self._stop.wait(self.purge_interval):
+            try:
+                self.queue.purge(self.retention)
+            except sqlite3.Error as e:
+                print(f"Job purge failed: {str(e)}")
+
+    @contextmanager
+    def _heartbeat(self, job_id: str, worker: str) -> Iterator[None]:
+        # A single service call may outlast the lease (timeouts, retries,
+        # throttle pauses), so the lease is renewed until the job returns
+        done = threading.Event()
+
+        def beat() -> None:
+            while not done.wait(self.heartbeat_interval):
+                try:
+                    if not self.queue.heartbeat(job_id, worker):
+                        print(f"Job {job_id} lost its lease to another worker")
+                        return
+                except sqlite3.Error as e:
+                    print(f"Job heartbeat failed: {str(e)}")
+
+        thread = threading.Thread(target=beat, name=f"{threading.current_thread().name}-heartbeat", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    def _work(self, worker: str) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self.queue.claim(worker)
+            except sqlite3.Error as e:
+                print(f"Job queue unavailable: {str(e)}")
+                job = None
+            if job is None:
+                self._stop.wait(self.poll_interval)
+                continue
+
+            job_id, kind, api_key, params = job
+            try:
+                with self._heartbeat(job_id, worker):
+                    result = run_job(kind, api_key, params)
+            except Exception as e:
+                settled = self.queue.fail(job_id, worker, str(e))
+                print(f"Job {job_id} ({kind}) failed: {str(e)}")
+            else:
+                settled = self.queue.complete(job_id, worker, result)
+            if not settled:
+                print(f"Job {job_id} ({kind}) was handed to another worker; its outcome here is dropped")
+
+_queue: Optional[JobQueue] = None
+_pool: Optional[WorkerPool] = None
+_lock = threading.Lock()
+
+def get_job_queue() -> JobQueue:
+    """Return the queue shared by this process."""
+    global _queue
+    if _queue is None:
+        with _lock:
+            if _queue is None:
+                _queue = JobQueue()
+    return _queue
+
+def start_workers(workers: int) -> Optional[WorkerPool]:
+    """Start the in-process worker pool once; 0 leaves the jobs to worker processes."""
+    global _pool
+    if workers <= 0:
+        return None
+    queue = get_job_queue()
+    with _lock:
+        if _pool is None:
+            _pool = WorkerPool(queue, workers).start()
+    return _pool
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run Bria jobs queued by AdSnap Studio.")
+    parser.add_argument("--workers", type=int, default=4, help="Jobs run concurrently")
+    parser.add_argument("--db", default=DEFAULT_JOB_DB, help="Job database shared with the app")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Serve Prometheus metrics on this port")
+    parser.add_argument("--staging-port", type=int, default=None, help="Serve staged input images on this port")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    start_metrics_server(args.metrics_port)
+    start_staging_server(args.staging_port)
+    queue = JobQueue(args.db)
+    pool = WorkerPool(queue, args.workers).start()
+    print(f"Running {args.workers} workers on {args.db}")
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        pool.stop()
+
+if __name__ == "__main__":
+    main()